@@ -0,0 +1,144 @@
+"""
+Structured action logging for the applications views.
+
+``log_action`` builds one record per call and hands it to the ``applications.actions``
+logger. JSON encoding is deferred until a handler formats the record, and with
+``APPLICATIONS_LOG_ASYNC`` enabled that happens on a background listener thread:
+the request thread only enqueues. The listener forwards records to the root
+logger's handlers, so deployments keep their existing logging configuration.
+
+``outcome="start"`` events are sampled with ``APPLICATIONS_LOG_START_SAMPLE_RATE``;
+every other outcome is always logged.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger("applications.actions")
+
+# Single pass: values json cannot encode are written as str(value).
+_encoder = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+class ActionRecord:
+    """Log message that serializes its fields only when it is formatted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def __str__(self):
+        return _encoder.encode(self.data)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record as-is.
+
+    The stock ``prepare()`` formats the message on the calling thread, which is
+    the work we want to move off the request path. Records are built fresh by
+    ``log_action`` and never touched again, so handing them over unformatted is safe.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class _RootForwarder(logging.Handler):
+    """Listener-side handler that delivers records to the root logger's handlers."""
+
+    def emit(self, record):
+        logging.getLogger().handle(record)
+
+
+_listener = None
+_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(records, _RootForwarder())
+        _listener.start()
+        logger.addHandler(DeferredQueueHandler(records))
+        # The forwarder already delivers to the root handlers.
+        logger.propagate = False
+
+
+def stop_listener():
+    """Flush queued records and stop the background writer (registered with atexit)."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        for handler in list(logger.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                logger.removeHandler(handler)
+        logger.propagate = True
+
+
+def _reset_after_fork():
+    global _listener, _lock
+    # The listener thread does not survive fork(); drop its handler and restart lazily.
+    _listener = None
+    _lock = threading.Lock()
+    for handler in list(logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+atexit.register(stop_listener)
+
+
+def log_action(action, user_id, app_id=None, outcome="success", extra=None, start_time=None):
+    """
+    Log an action as a structured JSON record.
+
+    Args:
+        action (str): The action being performed (create, attach, transition, etc.)
+        user_id (str): The ID of the user performing the action
+        app_id (str, optional): The ID of the application being acted upon
+        outcome (str): The outcome of the action (success, error, etc.)
+        extra (dict, optional): Additional information to include in the log
+        start_time (float, optional): The start time of the action in seconds
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    if outcome == "start":
+        rate = settings.APPLICATIONS_LOG_START_SAMPLE_RATE
+        if rate < 1.0 and random.random() >= rate:
+            return
+
+    log_data = {
+        "action": action,
+        "user_id": str(user_id),
+        "outcome": outcome,
+    }
+    if app_id:
+        log_data["app_id"] = str(app_id)
+    if extra:
+        log_data.update(extra)
+    if start_time:
+        log_data["elapsed_ms"] = int((time.time() - start_time) * 1000)
+
+    if settings.APPLICATIONS_LOG_ASYNC and _listener is None:
+        _start_listener()
+    logger.info("%s", ActionRecord(log_data))
@@ -0,0 +1,143 @@
+"""
+``Idempotency-Key`` support for unsafe application endpoints.
+
+When a client retries a POST with the same ``Idempotency-Key`` header, it gets the
+first attempt's response replayed. The work is not repeated: no second Catalog
+lookup, snapshot insert or duplicate draft. Keys are scoped to the authenticated
+user and bound to the request fingerprint (method, path and body). Reusing a key
+for a different request is rejected with 422.
+
+A retry that arrives while the first attempt is still running waits for it, for
+up to ``IDEMPOTENCY_WAIT_TIMEOUT`` seconds, and then replays its response.
+Responses below 500 are kept for ``IDEMPOTENCY_TTL`` seconds. On a 5xx or an
+exception the key is released, so the next retry runs the request again.
+"""
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+HEADER = "Idempotency-Key"
+META_KEY = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+
+def _error(message, code):
+    return Response({"error": {"message": message, "code": code}}, status=code)
+
+
+def _fingerprint(request) -> str:
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    digest.update(request.body or b"")
+    return digest.hexdigest()
+
+
+def _replay(record: IdempotencyRecord) -> Response:
+    response = Response(record.response_body, status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _claim(user_id: str, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+    """
+    Create the in-progress record for (user_id, key), or take over one that has
+    expired or whose lease ran out (the request holding it crashed).
+
+    Returns:
+        The claimed record, or None if another request holds the key
+    """
+    now = timezone.now()
+    fields = {
+        "fingerprint": fingerprint,
+        "state": IdempotencyRecord.IN_PROGRESS,
+        "locked_until": now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+        "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_TTL),
+    }
+    try:
+        with transaction.atomic():
+            return IdempotencyRecord.objects.create(user_id=user_id, key=key, **fields)
+    except IntegrityError:
+        pass
+
+    # Conditional UPDATE: of several retries racing for a stale key, only one wins.
+    taken = IdempotencyRecord.objects.filter(
+        Q(expires_at__lte=now) | Q(state=IdempotencyRecord.IN_PROGRESS, locked_until__lte=now),
+        user_id=user_id,
+        key=key,
+    ).update(status_code=None, response_body=None, created_at=now, **fields)
+    if taken:
+        return IdempotencyRecord.objects.get(user_id=user_id, key=key)
+    return None
+
+
+def _owned(record: IdempotencyRecord):
+    # Matches only while our lease is current, so a request that overran its lease
+    # never overwrites or releases a record another request has taken over.
+    return IdempotencyRecord.objects.filter(pk=record.pk, locked_until=record.locked_until)
+
+
+def idempotent(view):
+    """
+    Decorate a ViewSet action so that requests carrying an ``Idempotency-Key``
+    header run at most once per user and key. Requests without the header are
+    passed through unchanged.
+    """
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        # Read META rather than request.headers: headers is cached on first access and
+        # submit_application adds X-Role to META before delegating to transition.
+        key = request.META.get(META_KEY)
+        # Nested calls (submit -> transition) run under the outer request's key.
+        if not key or getattr(request, "_idempotency_claimed", False) or not request.user.is_authenticated:
+            return view(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.", status.HTTP_400_BAD_REQUEST)
+
+        user_id = str(request.user.pk)
+        fingerprint = _fingerprint(request)
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            record = _claim(user_id, key, fingerprint)
+            if record is not None:
+                break
+            existing = IdempotencyRecord.objects.filter(user_id=user_id, key=key).first()
+            if existing is None:
+                continue  # released in the meantime; claim again
+            if existing.fingerprint != fingerprint:
+                return _error(f"{HEADER} was already used for a different request.",
+                              status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if existing.state == IdempotencyRecord.COMPLETED:
+                return _replay(existing)
+            if time.monotonic() >= deadline:
+                return _error(f"A request with this {HEADER} is still in progress.", status.HTTP_409_CONFLICT)
+            time.sleep(POLL_INTERVAL)
+
+        request._idempotency_claimed = True
+        try:
+            response = view(self, request, *args, **kwargs)
+        except Exception:
+            _owned(record).delete()
+            raise
+
+        if response.status_code >= 500 or not hasattr(response, "data"):
+            _owned(record).delete()
+        else:
+            _owned(record).update(
+                state=IdempotencyRecord.COMPLETED,
+                status_code=response.status_code,
+                response_body=response.data,
+            )
+        return response
+
+    return wrapper
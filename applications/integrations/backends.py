@@ -0,0 +1,147 @@
+"""
+Pluggable backends for the Catalog and Documents integrations.
+
+``settings.APPLICATIONS_INTEGRATION_BACKEND`` names the backend class:
+
+- ``HttpBackend`` (default) calls the services over HTTP, for split deployments.
+- ``LocalBackend`` answers the same calls straight from the ORM when the catalog
+  and documents apps run in the same process, saving the loopback round trip.
+
+Both return the same shapes and raise the same exceptions as the public
+functions in ``integrations.catalog`` and ``integrations.documents``.
+"""
+import uuid
+from concurrent.futures import Future
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from core.utils.uuid_helpers import is_valid_uuid
+from . import catalog, documents
+from .http import upstream_executor
+
+
+class HttpBackend:
+    """Talk to the Catalog and Documents services over HTTP."""
+
+    # Calls only do network I/O, so they may run on the upstream thread pool.
+    supports_concurrency = True
+
+    def get_program_required_documents(self, program_id: str) -> list[dict]:
+        return catalog._fetch_program_required_documents(program_id)
+
+    def resolve_student_required_documents(self, student_id: str) -> list[dict]:
+        return catalog._fetch_student_required_documents(student_id)
+
+    def get_student_document(self, doc_id: str) -> dict:
+        return documents._fetch_student_document(doc_id)
+
+    def get_student_documents(self, doc_ids: list[str]) -> dict:
+        return documents._fetch_student_documents(doc_ids)
+
+
+class LocalBackend:
+    """Answer integration calls from the co-deployed catalog and documents apps."""
+
+    # ORM calls must stay on the request thread (connections are per thread).
+    supports_concurrency = False
+
+    def get_program_required_documents(self, program_id: str) -> list[dict]:
+        from catalog.models import Program
+        from documents.models import ProgramDocument
+
+        if not is_valid_uuid(program_id) or not Program.objects.filter(id=program_id).exists():
+            raise catalog.CatalogNotFound("program not found")
+
+        rows = ProgramDocument.objects.filter(
+            program_id=program_id,
+            is_active=True,
+            document_type__is_active=True,
+        ).values_list("document_type_id", "is_mandatory")
+        # ProgramDocument has no item counts: one document, required when mandatory.
+        return [
+            {
+                "doc_type_id": str(doc_type_id),
+                "is_mandatory": is_mandatory,
+                "min_items": 1 if is_mandatory else 0,
+                "max_items": 1,
+            }
+            for doc_type_id, is_mandatory in rows
+        ]
+
+    def resolve_student_required_documents(self, student_id: str) -> list[dict]:
+        # No student-level rules are stored in this deployment; same as a resolver 404.
+        return []
+
+    def get_student_document(self, doc_id: str) -> dict:
+        from documents.models import UserDocument
+
+        if not is_valid_uuid(doc_id):
+            raise documents.InvalidDocumentIdError(f"Invalid document ID format: {doc_id}")
+
+        row = (
+            UserDocument.objects.filter(id=doc_id, is_active=True)
+            .values("id", "user_id", "document_type_id")
+            .first()
+        )
+        if row is None:
+            raise documents.StudentDocumentNotFound(f"Student document not found: {doc_id}")
+        return self._document_payload(row)
+
+    def get_student_documents(self, doc_ids: list[str]) -> dict:
+        from documents.models import UserDocument
+
+        invalid = [doc_id for doc_id in doc_ids if not is_valid_uuid(doc_id)]
+        if invalid:
+            raise documents.InvalidDocumentIdError(f"Invalid document ID format: {', '.join(invalid)}")
+
+        found = {}
+        size = settings.DOCUMENTS_BATCH_MAX
+        for start in range(0, len(doc_ids), size):
+            rows = UserDocument.objects.filter(id__in=doc_ids[start:start + size], is_active=True).values(
+                "id", "user_id", "document_type_id"
+            )
+            found.update((str(row["id"]), self._document_payload(row)) for row in rows)
+        return {doc_id: found.get(str(uuid.UUID(doc_id))) for doc_id in doc_ids}
+
+    @staticmethod
+    def _document_payload(row: dict) -> dict:
+        # Uploads are not scanned in-process, so an active document is reported clean.
+        return {
+            "id": str(row["id"]),
+            "user_id": str(row["user_id"]),
+            "doc_type_id": str(row["document_type_id"]),
+            "status": "clean",
+        }
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Return the configured integration backend instance."""
+    return import_string(settings.APPLICATIONS_INTEGRATION_BACKEND)()
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    if setting == "APPLICATIONS_INTEGRATION_BACKEND":
+        get_backend.cache_clear()
+
+
+def submit(fn, *args) -> Future:
+    """
+    Run ``fn(*args)`` on the upstream thread pool when the backend allows it,
+    otherwise inline. Either way the caller gets a Future whose result() returns
+    the value or re-raises the exception.
+    """
+    if get_backend().supports_concurrency:
+        return upstream_executor().submit(fn, *args)
+
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
@@ -0,0 +1,129 @@
+"""
+In-process TTL cache for Catalog policy lookups.
+
+Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds the old
+value is still served while a single background refresh reloads it
+(stale-while-revalidate); after that the next caller reloads synchronously. The
+cache is bounded and evicts least-recently-used keys.
+
+Each process keeps its own copy. Writes to ``documents.ProgramDocument`` in this
+process invalidate the affected program (see applications.signals); changes made
+elsewhere are picked up when the TTL runs out.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_key(value) -> str:
+    """Canonical string form for UUID-like keys (hyphenated, lower-case)."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (ValueError, AttributeError, TypeError):
+        return str(value)
+
+
+class PolicyCache:
+    """Bounded LRU cache with TTL and stale-while-revalidate semantics."""
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0.0,
+                 refresher: Callable[[Callable[[], None]], None] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # Runs a background refresh; defaults to a throwaway thread.
+        self._refresher = refresher
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._refreshing = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], List[dict]]) -> List[dict]:
+        """
+        Return the cached value for ``key``, loading it with ``loader`` when missing
+        or expired. Exceptions raised by ``loader`` propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return loader()
+
+        now = time.monotonic()
+        refresh_generation = None
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generations.get(key, 0)
+            if entry is not None:
+                value, loaded_at = entry
+                age = now - loaded_at
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    if age >= self.ttl and key not in self._refreshing:
+                        self._refreshing.add(key)
+                        refresh_generation = generation
+                    entry = _copy(value)
+                else:
+                    entry = None
+
+        if entry is not None:
+            if refresh_generation is not None:
+                self._schedule_refresh(key, loader, refresh_generation)
+            return entry
+
+        value = loader()
+        self._store(key, value, generation)
+        return _copy(value)
+
+    def invalidate(self, key: Hashable):
+        """Drop ``key`` and discard any refresh that is already in flight for it."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._refreshing.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, value, generation):
+        with self._lock:
+            # A newer invalidation wins over a load that started before it.
+            if self._generations.get(key, 0) != generation:
+                return
+            self._entries[key] = (_copy(value), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._generations.pop(evicted, None)
+
+    def _schedule_refresh(self, key, loader, generation):
+        def refresh():
+            try:
+                self._store(key, loader(), generation)
+            except Exception as e:
+                # Keep serving the stale value; the next expiry retries.
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        if self._refresher is not None:
+            self._refresher(refresh)
+        else:
+            threading.Thread(target=refresh, daemon=True).start()
+
+
+def _copy(value: List[dict]) -> List[dict]:
+    # Callers get their own list/dicts so they can never mutate the cached entry.
+    return [dict(item) for item in value]
@@ -1,6 +1,8 @@
-import httpx
 from django.conf import settings
 
+from .cache import PolicyCache, normalize_key
+from .http import client_for
+
 class CatalogError(Exception):
     """Generic Catalog failure (5xx, 4xx other than 404)."""
     pass
@@ -9,13 +11,44 @@ class CatalogNotFound(CatalogError):
     """Program (or route) not found in catalog"""
     pass
 
-def _client() -> httpx.Client:
+def _client():
     """
-    A short-lived client per call. for high-throughput, you could promote a module-level, but this keeps it simple and safe
+    Borrow the pooled, keep-alive Catalog client (see integrations.http).
+    Used as a context manager; leaving the block does not close the client.
     """
-    return httpx.Client(timeout=settings.HTTP_CLIENT_TIMEOUT)
+    return client_for("catalog")
+
+# Program policy is shared by every student applying to the program, so it is
+# cached per process (LRU + TTL + stale-while-revalidate, see integrations.cache).
+program_policy_cache = PolicyCache(
+    max_size=settings.CATALOG_POLICY_CACHE_SIZE,
+    ttl=settings.CATALOG_POLICY_CACHE_TTL,
+    stale_ttl=settings.CATALOG_POLICY_CACHE_STALE_TTL,
+    refresher=lambda refresh: _backends().submit(refresh),
+)
+
+def _backends():
+    # Imported lazily: the backends module imports this one.
+    from . import backends
+    return backends
+
+def invalidate_program_required_documents(program_id) -> None:
+    """Forget the cached policy for a program (e.g. after its ProgramDocuments change)."""
+    program_policy_cache.invalidate(normalize_key(program_id))
 
 def get_program_required_documents(program_id: str) -> list[dict]:
+    """
+    Program-specific required docs, served from the policy cache when possible.
+    The configured integration backend answers misses (see integrations.backends);
+    shape and errors are those of _fetch_program_required_documents. Failures are
+    never cached.
+    """
+    return program_policy_cache.get_or_load(
+        normalize_key(program_id),
+        lambda: _backends().get_backend().get_program_required_documents(program_id),
+    )
+
+def _fetch_program_required_documents(program_id: str) -> list[dict]:
     """
     Ask Catalog for program-specific required docs.
     Expected 200 JSON:
@@ -37,6 +70,13 @@ def get_program_required_documents(program_id: str) -> list[dict]:
     return list(r.json())
 
 def resolve_student_required_documents(student_id: str) -> list[dict]:
+    """
+    Student-level baseline requirements from the configured integration backend.
+    See _fetch_student_required_documents for the shape and errors.
+    """
+    return _backends().get_backend().resolve_student_required_documents(student_id)
+
+def _fetch_student_required_documents(student_id: str) -> list[dict]:
     """
     Ask Catalog for student-level baseline requirements (if any).
     Expected 200 JSON shape same as above.
@@ -1,7 +1,11 @@
+from typing import Optional
+
 import httpx
 from django.conf import settings
 from core.utils.uuid_helpers import is_valid_uuid
 
+from .http import client_for, upstream_executor
+
 class DocumentsError(Exception):
     """Base exception for document service errors."""
     pass
@@ -14,13 +18,27 @@ class InvalidDocumentIdError(DocumentsError):
     """Exception raised when an invalid document ID is provided."""
     pass
 
-def _client() -> httpx.Client:
-    """Create a new HTTP client with timeout setting."""
-    return httpx.Client(timeout=settings.HTTP_CLIENT_TIMEOUT)
+def _client():
+    """Borrow the pooled, keep-alive Documents client (see integrations.http)."""
+    return client_for("documents")
+
+def _auth_headers() -> dict:
+    """Service credential accepted by the Documents endpoints (DOCUMENTS_SERVICE_TOKEN)."""
+    token = settings.DOCUMENTS_SERVICE_TOKEN
+    return {"Authorization": f"Service {token}"} if token else {}
 
 def get_student_document(doc_id: str) -> dict:
     """
-    Retrieve a student document by ID.
+    Retrieve a student document by ID from the configured integration backend.
+    See _fetch_student_document for the shape and errors.
+    """
+    # Imported lazily: the backends module imports this one.
+    from .backends import get_backend
+    return get_backend().get_student_document(doc_id)
+
+def _fetch_student_document(doc_id: str) -> dict:
+    """
+    Retrieve a student document by ID from the Documents service.
     
     Args:
         doc_id: UUID string of the document
@@ -42,7 +60,7 @@ def get_student_document(doc_id: str) -> dict:
     
     try:
         with _client() as c:
-            r = c.get(url)
+            r = c.get(url, headers=_auth_headers())
             
         if r.status_code == 404:
             raise StudentDocumentNotFound(f"Student document not found: {doc_id}")
@@ -56,3 +74,89 @@ def get_student_document(doc_id: str) -> dict:
         raise DocumentsError(f"Network error when contacting documents service: {str(e)}")
     except httpx.TimeoutException:
         raise DocumentsError("Timeout while contacting documents service")
+
+def get_student_documents(doc_ids: list[str]) -> dict[str, Optional[dict]]:
+    """
+    Retrieve several student documents in one round trip from the configured
+    integration backend. See _fetch_student_documents for the shape and errors.
+    """
+    from .backends import get_backend
+    return get_backend().get_student_documents(doc_ids)
+
+def _fetch_student_documents(doc_ids: list[str]) -> dict[str, Optional[dict]]:
+    """
+    Retrieve several student documents from the Documents service batch endpoint.
+    
+    Ids are de-duplicated and sent in chunks of DOCUMENTS_BATCH_MAX; when there is
+    more than one chunk, up to DOCUMENTS_BATCH_CONCURRENCY chunks are in flight at
+    a time on the upstream thread pool. A Documents service that has no batch
+    endpoint yet is asked for each id separately.
+    
+    Args:
+        doc_ids: UUID strings of the documents
+        
+    Returns:
+        dict: Maps each requested id to its document (same shape as
+            get_student_document) or to None when it was not found
+            
+    Raises:
+        InvalidDocumentIdError: If any id is not a valid UUID
+        DocumentsError: For HTTP or network errors on any chunk
+    """
+    invalid = [doc_id for doc_id in doc_ids if not is_valid_uuid(doc_id)]
+    if invalid:
+        raise InvalidDocumentIdError(f"Invalid document ID format: {', '.join(invalid)}")
+        
+    unique_ids = list(dict.fromkeys(doc_ids))
+    size = settings.DOCUMENTS_BATCH_MAX
+    chunks = [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+    
+    found = {}
+    if len(chunks) == 1:
+        found.update(_fetch_student_documents_chunk(chunks[0]))
+    else:
+        executor = upstream_executor()
+        window = max(1, settings.DOCUMENTS_BATCH_CONCURRENCY)
+        for start in range(0, len(chunks), window):
+            futures = [executor.submit(_fetch_student_documents_chunk, chunk) for chunk in chunks[start:start + window]]
+            for future in futures:
+                found.update(future.result())
+                
+    return {doc_id: found.get(doc_id) for doc_id in doc_ids}
+
+def _fetch_student_documents_chunk(doc_ids: list[str]) -> dict[str, dict]:
+    """POST one chunk to the batch endpoint; returns only the documents that were found."""
+    url = f"{settings.DOCUMENTS_BASE_URL}/student-documents/batch/"
+    
+    try:
+        with _client() as c:
+            r = c.post(url, json={"ids": doc_ids}, headers=_auth_headers())
+            
+        if r.status_code in (404, 405):
+            # A Documents service without the batch endpoint (missing ids are
+            # reported in the body, never as a 404): look the ids up one by one.
+            return _fetch_student_documents_one_by_one(doc_ids)
+            
+        if r.is_error:
+            raise DocumentsError(f"Documents service error {r.status_code}: {r.text[:200]}")
+            
+        return {
+            str(item["id"]): dict(item)
+            for item in r.json().get("results", [])
+            if not item.get("not_found")
+        }
+        
+    except httpx.RequestError as e:
+        raise DocumentsError(f"Network error when contacting documents service: {str(e)}")
+    except httpx.TimeoutException:
+        raise DocumentsError("Timeout while contacting documents service")
+
+def _fetch_student_documents_one_by_one(doc_ids: list[str]) -> dict[str, dict]:
+    """Fallback for _fetch_student_documents_chunk: one GET per id."""
+    found = {}
+    for doc_id in doc_ids:
+        try:
+            found[doc_id] = _fetch_student_document(doc_id)
+        except StudentDocumentNotFound:
+            pass
+    return found
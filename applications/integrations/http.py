@@ -0,0 +1,188 @@
+"""
+Shared, pooled HTTP clients for the upstream integrations (Catalog, Documents).
+
+Each named upstream gets one long-lived ``httpx.Client`` per process so keep-alive
+connections are reused across requests instead of paying a TCP/TLS handshake on
+every call. Clients are dropped in forked children (gunicorn pre-fork workers) and
+rebuilt lazily, so a pool is never shared between processes.
+"""
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HTTP2_AVAILABLE = False
+
+
+class ClientRegistry:
+    """
+    Process-local registry of pooled HTTP clients keyed by upstream name.
+
+    Use ``lease(name)`` as a context manager around each call: it hands out the
+    shared client without closing it on exit and tracks in-flight requests so
+    ``stats()`` can report pool saturation.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._peak_in_flight: Dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def _ensure_process(self):
+        # Sockets inherited over fork() belong to the parent; never reuse them.
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _build_client(self) -> httpx.Client:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+        )
+        return httpx.Client(
+            timeout=settings.HTTP_CLIENT_TIMEOUT,
+            limits=limits,
+            http2=settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE,
+        )
+
+    def get(self, name: str) -> httpx.Client:
+        """Return the shared client for ``name``, creating it on first use."""
+        self._ensure_process()
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None or client.is_closed:
+                    client = self._build_client()
+                    self._clients[name] = client
+                    self._in_flight.setdefault(name, 0)
+                    self._peak_in_flight.setdefault(name, 0)
+        return client
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[httpx.Client]:
+        """Borrow the shared client for one call; the client stays open afterwards."""
+        client = self.get(name)
+        with self._lock:
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            if self._in_flight[name] > self._peak_in_flight.get(name, 0):
+                self._peak_in_flight[name] = self._in_flight[name]
+            if self._in_flight[name] >= settings.HTTP_POOL_MAX_CONNECTIONS:
+                logger.warning(f"HTTP pool for {name} is saturated ({self._in_flight[name]} in flight)")
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Report pool usage per upstream.
+
+        Returns:
+            Dict mapping upstream name to:
+                {"max_connections", "open_connections", "idle_connections",
+                 "in_flight", "peak_in_flight", "saturation", "http2"}
+        """
+        self._ensure_process()
+        max_connections = settings.HTTP_POOL_MAX_CONNECTIONS
+        result = {}
+        with self._lock:
+            for name, client in self._clients.items():
+                # httpcore exposes the live connections on the transport's pool
+                pool = getattr(getattr(client, "_transport", None), "_pool", None)
+                connections = list(getattr(pool, "connections", []) or [])
+                in_flight = self._in_flight.get(name, 0)
+                result[name] = {
+                    "max_connections": max_connections,
+                    "open_connections": len(connections),
+                    "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+                    "in_flight": in_flight,
+                    "peak_in_flight": self._peak_in_flight.get(name, 0),
+                    "saturation": round(in_flight / max_connections, 3) if max_connections else 0.0,
+                    "http2": settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE,
+                }
+        return result
+
+    def close_all(self):
+        """Close every pooled client. Safe to call more than once."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+
+
+registry = ClientRegistry()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def upstream_executor() -> ThreadPoolExecutor:
+    """
+    Bounded thread pool for running independent upstream calls concurrently.
+    Only use it for HTTP work: Django DB connections are per thread and would
+    leak from pool threads.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.HTTP_UPSTREAM_MAX_WORKERS,
+                    thread_name_prefix="upstream",
+                )
+    return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    registry._reset()
+    # Worker threads do not survive fork(); start a fresh pool on demand.
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def client_for(name: str):
+    """Context manager yielding the shared client for ``name``."""
+    return registry.lease(name)
+
+
+def pool_stats() -> Dict[str, dict]:
+    """Pool saturation metrics for every upstream client in this process."""
+    return registry.stats()
+
+
+def close_clients():
+    """Shutdown hook: close all pooled clients (also registered with atexit)."""
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    registry.close_all()
+
+
+atexit.register(close_clients)
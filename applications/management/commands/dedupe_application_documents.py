@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from applications.models import ApplicationDocument
+
+
+class Command(BaseCommand):
+    help = ('Deletes repeated links of the same student document to one application, keeping the '
+            'oldest. Run before migrating to the uq_app_doc_student_doc constraint.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Links deleted per statement (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many links would be deleted')
+
+    def handle(self, *args, **options):
+        # Only id, application_id, student_document_id and created_at are touched,
+        # so this also runs on a schema that predates the slot column.
+        duplicates = list(
+            ApplicationDocument.objects.annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=[F('application_id'), F('student_document_id')],
+                    order_by=[F('created_at').asc(), F('id').asc()],
+                )
+            )
+            .filter(position__gt=1)
+            .values_list('pk', 'application_id')
+        )
+        application_ids = sorted({str(application_id) for _, application_id in duplicates})
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Would delete {len(duplicates)} duplicate links on {len(application_ids)} applications."
+            ))
+            return
+
+        # Raw deletes: the post_delete counter hook reads columns that may not exist yet.
+        table = connection.ops.quote_name(ApplicationDocument._meta.db_table)
+        ids = [ApplicationDocument._meta.pk.get_db_prep_value(pk, connection) for pk, _ in duplicates]
+        size = options['batch_size']
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(ids), size):
+                chunk = ids[start:start + size]
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {len(duplicates)} duplicate links on {len(application_ids)} applications."
+        ))
+        if application_ids:
+            self.stdout.write(
+                'Once migrated, run recompute_document_counters for these applications: '
+                + ' '.join(application_ids)
+            )
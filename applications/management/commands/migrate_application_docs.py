@@ -0,0 +1,91 @@
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.models import ApplicationDocument
+from applications.services.document_sync import sync_application_documents
+
+
+def sync_chunk(triples):
+    """Worker entry point: mirror one chunk of (app_id, doc_type_id, student_document_id)."""
+    return sync_application_documents(triples, batch_size=len(triples) or 1)
+
+
+class Command(BaseCommand):
+    help = ('Copies applications.ApplicationDocument links into documents.ApplicationDocument '
+            'in keyset-ordered chunks, resuming from a checkpoint file.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Links read and written per chunk (default: 1000)')
+        parser.add_argument('--checkpoint', default='migrate_application_docs.checkpoint.json',
+                            help='File recording the last migrated link (default: %(default)s)')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore the checkpoint and start from the first link')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes syncing chunks in parallel (default: 1)')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--chunk-size and --workers must be positive')
+        self.checkpoint_path = options['checkpoint']
+        state = {'last_pk': None, 'synced': 0, 'created': 0, 'skipped': 0}
+        if not options['restart'] and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                state.update(json.load(f))
+            self.stdout.write(f"Resuming after link {state['last_pk']}")
+
+        if options['workers'] == 1:
+            for last_pk, triples in self.chunks(state['last_pk'], options['chunk_size']):
+                self.advance(state, last_pk, sync_chunk(triples))
+        else:
+            self.run_parallel(state, options['chunk_size'], options['workers'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Migrated {state['synced']} links ({state['created']} new), skipped {state['skipped']} unresolved."
+        ))
+
+    def chunks(self, last_pk, chunk_size):
+        """Yield (last_pk, triples) per chunk, ordered by primary key."""
+        queryset = ApplicationDocument.objects.order_by('pk').values_list(
+            'pk', 'application_id', 'doc_type_id', 'student_document_id'
+        )
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch[:chunk_size])
+            if not rows:
+                return
+            last_pk = str(rows[-1][0])
+            yield last_pk, [row[1:] for row in rows]
+
+    def run_parallel(self, state, chunk_size, workers):
+        # Chunks are submitted in order and the checkpoint only moves past a chunk once
+        # every earlier one finished, so a crash repeats at most the in-flight chunks
+        # (which is harmless: the sync skips rows that already exist).
+        # Spawned (not forked) workers set Django up themselves and open their own
+        # database connections instead of sharing the parent's socket.
+        pending = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                 initializer=django.setup) as pool:
+            for last_pk, triples in self.chunks(state['last_pk'], chunk_size):
+                pending.append((last_pk, pool.submit(sync_chunk, [tuple(map(str, t)) for t in triples])))
+                while len(pending) >= workers * 2 or (pending and pending[0][1].done()):
+                    done_pk, future = pending.pop(0)
+                    self.advance(state, done_pk, future.result())
+            for done_pk, future in pending:
+                self.advance(state, done_pk, future.result())
+
+    def advance(self, state, last_pk, counts):
+        for key, value in counts.items():
+            state[key] += value
+        state['last_pk'] = last_pk
+        # Write-then-rename, so a crash never leaves a truncated checkpoint.
+        tmp_path = f"{self.checkpoint_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
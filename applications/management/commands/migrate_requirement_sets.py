@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from applications.models import Application, ApplicationRequiredDocument
+from applications.services.requirements import get_or_create_requirement_sets, requirement_digest
+
+ITEM_FIELDS = ('doc_type_id', 'is_mandatory', 'min_items', 'max_items', 'source', 'source_required_document_id')
+
+
+class Command(BaseCommand):
+    help = ('Moves per-application ApplicationRequiredDocument snapshots onto shared, '
+            'content-addressed requirement sets.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Applications converted per transaction (default: 500)')
+        parser.add_argument('--keep-rows', action='store_true',
+                            help='Keep the legacy rows after linking the set (they are no longer read)')
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.filter(requirement_set__isnull=True).order_by('pk')
+        converted = deleted = 0
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            ids = list(batch.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted += self.convert(ids, options['keep_rows'])
+            converted += len(ids)
+            last_pk = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Linked {converted} applications to requirement sets, deleted {deleted} legacy rows.'
+        ))
+
+    def convert(self, ids, keep_rows):
+        # Lock the batch and re-check it, so an application linked meanwhile is skipped.
+        ids = list(Application.objects.select_for_update().filter(
+            pk__in=ids, requirement_set__isnull=True
+        ).values_list('pk', flat=True))
+        required = defaultdict(list)
+        for row in ApplicationRequiredDocument.objects.filter(application_id__in=ids).values('application_id', *ITEM_FIELDS):
+            required[row.pop('application_id')].append(row)
+
+        sets = get_or_create_requirement_sets(required[app_id] for app_id in ids)
+        by_set = defaultdict(list)
+        for app_id in ids:
+            by_set[sets[requirement_digest(required[app_id])].pk].append(app_id)
+        for set_id, app_ids in by_set.items():
+            Application.objects.filter(pk__in=app_ids).update(requirement_set_id=set_id)
+
+        if keep_rows:
+            return 0
+        deleted, _ = ApplicationRequiredDocument.objects.filter(application_id__in=ids).delete()
+        return deleted
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from applications.services.status_stats import rebuild_status_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the per program/intake/status application counts from the applications table.'
+
+    def handle(self, *args, **options):
+        fixed = rebuild_status_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt application status stats, {fixed} rows changed.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from applications.models import Application
+from applications.services.completeness import recompute_counters
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized mandatory-document counters on applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('application_ids', nargs='*',
+                            help='Only these applications (default: all)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Applications recounted per query (default: 500)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Application.objects.order_by('pk')
+        if options['application_ids']:
+            queryset = queryset.filter(pk__in=options['application_ids'])
+
+        checked = fixed = 0
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            ids = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            fixed += recompute_counters(ids)
+            checked += len(ids)
+            last_pk = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} applications, fixed {fixed}.'))
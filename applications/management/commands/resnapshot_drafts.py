@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.integrations.catalog import CatalogError
+from applications.services.resnapshot import CHUNK_SIZE, resnapshot_drafts
+
+
+class Command(BaseCommand):
+    help = ('Re-snapshots the required documents of Draft applications after the '
+            'requirements of the given programs changed in Catalog.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('program_ids', nargs='+', help='Programs whose requirements changed')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help=f'Drafts handled per transaction (default: {CHUNK_SIZE})')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how many drafts would change without writing')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        for program_id in options['program_ids']:
+            try:
+                counts = resnapshot_drafts(program_id, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            except CatalogError as e:
+                raise CommandError(f"Could not fetch requirements of program {program_id}: {e}")
+            verb = 'would change' if options['dry_run'] else 'changed'
+            self.stdout.write(self.style.SUCCESS(
+                f"Program {program_id}: checked {counts['checked']} drafts, {verb} {counts['changed']}, "
+                f"skipped {counts['skipped']} (student rules unavailable)."
+            ))
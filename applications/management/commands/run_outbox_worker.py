@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from applications.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Delivers pending outbox messages to their configured handlers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+                            help=f'Messages claimed per batch (default: {settings.OUTBOX_BATCH_SIZE})')
+        parser.add_argument('--idle-sleep', type=float, default=1.0,
+                            help='Seconds to wait when no message is due (default: 1)')
+        parser.add_argument('--once', action='store_true',
+                            help='Process due messages until none is left, then exit')
+
+    def handle(self, *args, **options):
+        delivered = failed = 0
+        try:
+            while True:
+                ok, errors = process_batch(options['batch_size'])
+                delivered += ok
+                failed += errors
+                if ok or errors:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['idle_sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Delivered {delivered} outbox messages, {failed} failed.'))
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 import uuid
 from django.utils import timezone
@@ -13,6 +14,53 @@ class Status(models.TextChoices):
     WITHDRAWN = "Withdrawn", "Withdrawn"
     
     
+class CurrentTransactionId(models.Func):
+    """
+    Id of the transaction evaluating it (``pg_current_xact_id()``, PostgreSQL 13+).
+    Other databases have no such id and get 0.
+    """
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return "0", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return "pg_current_xact_id()::text::bigint", []
+
+
+class RequirementSet(models.Model):
+    """
+    Immutable, shared snapshot of merged document requirements.
+    
+    Identified by ``digest``, the SHA-256 of its canonical items (see
+    services.requirements), so applications whose requirements merge to the same
+    list reference one set instead of copying it.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    digest = models.CharField(max_length=64, unique=True)
+    item_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    def __str__(self):
+        return f"RequirementSet {self.digest[:12]} ({self.item_count} items)"
+
+
+class RequirementSetItem(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requirement_set = models.ForeignKey(RequirementSet, on_delete=models.CASCADE, related_name="items")
+    doc_type_id = models.UUIDField()
+    is_mandatory = models.BooleanField(default=True)
+    min_items = models.PositiveIntegerField(default=1)
+    max_items = models.PositiveIntegerField(default=1)
+    source = models.CharField(max_length=16)
+    source_required_document_id = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["requirement_set", "doc_type_id"], name="uq_reqset_item_doctype")
+        ]
+
+
 class Application(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student_id = models.UUIDField(
@@ -35,6 +83,15 @@ class Application(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained counts of mandatory document types whose attachments do / do not yet
+    # reach min_items (see services.completeness); repair with recompute_document_counters.
+    mandatory_docs_satisfied = models.PositiveSmallIntegerField(default=0)
+    mandatory_docs_missing = models.PositiveSmallIntegerField(default=0, db_index=True)
+    # Shared requirement snapshot; NULL for applications still using per-application
+    # ApplicationRequiredDocument rows (migrate with migrate_requirement_sets).
+    requirement_set = models.ForeignKey(
+        RequirementSet, null=True, blank=True, on_delete=models.PROTECT, related_name="applications"
+    )
     
     class Meta:
         indexes = [
@@ -44,6 +101,10 @@ class Application(models.Model):
             # Compound indexes for common query patterns
             models.Index(fields=["student_id", "status"]),
             models.Index(fields=["program_id", "status"]),
+            # Keyset pagination of a student's applications, newest first
+            models.Index(fields=["student_id", "-created_at", "-id"], name="app_student_created_idx"),
+            # Staff review queue: oldest first within a status
+            models.Index(fields=["status", "created_at", "id"], name="app_status_created_idx"),
         ]
         ordering = ["-created_at"]
         
@@ -77,6 +138,12 @@ class Application(models.Model):
         ]
 
 class ApplicationRequiredDocument(models.Model):
+    """
+    Legacy per-application requirement snapshot.
+    
+    New applications reference a RequirementSet instead; read requirements through
+    services.requirements, which handles both.
+    """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name = "required_docs")
     doc_type_id = models.UUIDField()
@@ -112,9 +179,17 @@ class ApplicationDocument(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="documents")
     doc_type_id = models.UUIDField()
     student_document_id = models.UUIDField()
+    # 1..max_items position within (application, doc_type_id). The unique constraint
+    # below makes the database reject an attach beyond max_items even when two
+    # requests race. Null on links created before slots existed.
+    slot = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["application", "doc_type_id", "slot"], name="uq_app_doc_slot"),
+            models.UniqueConstraint(fields=["application", "student_document_id"], name="uq_app_doc_student_doc"),
+        ]
         indexes = [
             models.Index(fields=["application"]),
             models.Index(fields=["doc_type_id"]),
@@ -129,7 +204,95 @@ class ApplicationsEvent(models.Model):
     to_status = models.CharField(max_length=32, null=True, blank=True)
     note = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(default = timezone.now, editable=False)
+    # Transaction that inserted the row. The event stream delivers rows in this
+    # order, so one whose transaction commits late is not skipped.
+    txid = models.BigIntegerField(db_default=CurrentTransactionId(), editable=False)
     
     class Meta:
-        indexes = [models.Index(fields=["application"])]
-        ordering = ["created_at"]
\ No newline at end of file
+        indexes = [
+            models.Index(fields=["application"]),
+            # Keyset pagination of an application's timeline
+            models.Index(fields=["application", "created_at", "id"], name="app_event_created_idx"),
+            # Event stream order (see services.event_stream)
+            models.Index(fields=["application", "txid", "created_at", "id"], name="app_event_txid_idx"),
+        ]
+        ordering = ["created_at"]
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Stored outcome of a POST sent with an ``Idempotency-Key`` header.
+    
+    One row per (user_id, key). While the first request runs the row is
+    ``in_progress`` and holds a short lease; once it finishes, the response is
+    stored and replayed to retries until ``expires_at``.
+    """
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    STATE_CHOICES = [(IN_PROGRESS, "In progress"), (COMPLETED, "Completed")]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_id = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64, help_text="SHA-256 of method, path and body")
+    state = models.CharField(max_length=16, choices=STATE_CHOICES, default=IN_PROGRESS)
+    locked_until = models.DateTimeField(help_text="In-progress lease; a crashed request's key is reclaimed after it")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_id", "key"], name="uq_idempotency_user_key")
+        ]
+
+
+class ApplicationStatusStat(models.Model):
+    """
+    Number of applications per (program_id, intake_id, status).
+    
+    Adjusted in the same transaction as every create and status change (see
+    services.status_stats), so dashboards read a handful of rows instead of
+    grouping the whole Application table. Rebuild with ``rebuild_status_stats``.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    program_id = models.UUIDField()
+    intake_id = models.UUIDField()
+    status = models.CharField(max_length=32, choices=Status.choices)
+    # Signed: rows written outside the maintained paths can leave it behind until a rebuild.
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["program_id", "intake_id", "status"], name="uq_status_stat_key")
+        ]
+
+
+class OutboxMessage(models.Model):
+    """
+    Side effect to run after an application change commits (see applications.outbox).
+    
+    Written in the same transaction as the ApplicationsEvent it describes and
+    delivered at least once by the ``run_outbox_worker`` command. A message is
+    deleted once its handler succeeds; after ``OUTBOX_MAX_ATTEMPTS`` failures it is
+    kept as ``failed`` for inspection.
+    """
+    PENDING = "pending"
+    FAILED = "failed"
+    STATE_CHOICES = [(PENDING, "Pending"), (FAILED, "Failed")]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    topic = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    state = models.CharField(max_length=16, choices=STATE_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not delivered before this time (retry backoff or worker lease)")
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            # Worker claim: due pending messages, oldest first
+            models.Index(fields=["state", "available_at"], name="outbox_due_idx"),
+        ]
@@ -0,0 +1,143 @@
+"""
+Transactional outbox for work that follows an application change.
+
+``enqueue`` writes an ``OutboxMessage`` inside the caller's transaction, so the
+message exists exactly when the change it describes committed. The
+``run_outbox_worker`` command delivers messages to the handler configured for
+their topic in ``OUTBOX_HANDLERS`` (topic -> dotted path of a callable taking the
+message). Every ApplicationsEvent is offered as topic ``application.<event_type>``;
+topics without a handler are not written at all.
+
+Workers claim due messages with ``SELECT ... FOR UPDATE SKIP LOCKED`` and push
+their ``available_at`` forward by ``OUTBOX_LEASE_SECONDS`` before running
+handlers outside the claim transaction, so several workers share the load and a
+crashed worker's messages come back after the lease. Delivery is at least once:
+handlers must tolerate repeats. A failed message is retried with exponential
+backoff, and after ``OUTBOX_MAX_ATTEMPTS`` attempts it is marked ``failed``.
+"""
+import logging
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+_handlers: Dict[str, Callable] = {}
+
+
+def event_topic(event_type: str) -> str:
+    return f"application.{event_type}"
+
+
+def event_message(event, student_id) -> Tuple[str, dict]:
+    """(topic, payload) describing an ApplicationsEvent."""
+    return event_topic(event.event_type), {
+        "event_id": str(event.id),
+        "application_id": str(event.application_id),
+        "student_id": str(student_id),
+        "event_type": event.event_type,
+        "from_status": event.from_status,
+        "to_status": event.to_status,
+        "actor_id": str(event.actor_id),
+        "created_at": event.created_at,
+    }
+
+
+def get_handler(topic: str):
+    """Handler configured for topic, or None."""
+    path = settings.OUTBOX_HANDLERS.get(topic)
+    if path is None:
+        return None
+    if path not in _handlers:
+        _handlers[path] = import_string(path)
+    return _handlers[path]
+
+
+def enqueue(topic: str, payload: dict) -> None:
+    """Queue one message; call inside the transaction that made the change."""
+    enqueue_many([(topic, payload)])
+
+
+def enqueue_many(messages: Iterable[Tuple[str, dict]]) -> None:
+    """Queue several messages with one insert, skipping topics without a handler."""
+    rows = [
+        OutboxMessage(topic=topic, payload=payload)
+        for topic, payload in messages
+        if topic in settings.OUTBOX_HANDLERS
+    ]
+    if rows:
+        OutboxMessage.objects.bulk_create(rows)
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before the next try after ``attempts`` failures."""
+    seconds = settings.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_BACKOFF_MAX))
+
+
+def claim_batch(batch_size: int) -> List[OutboxMessage]:
+    """
+    Lease up to batch_size due messages to this worker.
+
+    Rows locked by another worker's claim are skipped rather than waited for.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(state=OutboxMessage.PENDING, available_at__lte=now)
+            .order_by("available_at")[:batch_size]
+        )
+        if messages:
+            lease_until = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(available_at=lease_until)
+            for message in messages:
+                message.available_at = lease_until
+    return messages
+
+
+def deliver(message: OutboxMessage) -> bool:
+    """
+    Run the message's handler and record the outcome.
+
+    Returns:
+        True if the handler succeeded (the message is deleted)
+    """
+    # Matches only while our lease is current, so a worker that overran its lease
+    # never touches a message another worker has claimed since.
+    owned = OutboxMessage.objects.filter(pk=message.pk, available_at=message.available_at)
+    handler = get_handler(message.topic)
+    try:
+        if handler is None:
+            raise LookupError(f"No outbox handler configured for {message.topic}")
+        handler(message)
+    except Exception as e:
+        attempts = message.attempts + 1
+        if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            logger.error("Outbox message %s (%s) failed permanently: %s", message.pk, message.topic, e)
+            owned.update(state=OutboxMessage.FAILED, attempts=attempts, last_error=repr(e))
+        else:
+            logger.warning("Outbox message %s (%s) failed, attempt %d: %s", message.pk, message.topic, attempts, e)
+            owned.update(attempts=attempts, last_error=repr(e), available_at=timezone.now() + backoff(attempts))
+        return False
+
+    owned.delete()
+    return True
+
+
+def process_batch(batch_size: int = None) -> Tuple[int, int]:
+    """
+    Claim and deliver one batch.
+
+    Returns:
+        Tuple of (delivered, failed)
+    """
+    messages = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    delivered = sum(1 for message in messages if deliver(message))
+    return delivered, len(messages) - delivered
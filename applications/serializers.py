@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Application, ApplicationsEvent
+from .models import Application, ApplicationsEvent, Status
 from core.utils.serializer_fields import UUIDRelatedField
 from core.mixins.uuid_serializer import UUIDSerializerMixin
 
@@ -36,7 +37,9 @@ class ApplicationSerializer(UUIDSerializerMixin, serializers.ModelSerializer):
     
     class Meta:
         model = Application
-        fields = ("id", "student_id", "program_id", "intake_id", "status", "created_at", "updated_at")
+        fields = ("id", "student_id", "program_id", "intake_id", "status", "created_at", "updated_at",
+                  "mandatory_docs_satisfied", "mandatory_docs_missing")
+        read_only_fields = ("mandatory_docs_satisfied", "mandatory_docs_missing")
 
 
 class ApplicationTransitionSerializer(serializers.Serializer):
@@ -45,6 +48,44 @@ class ApplicationTransitionSerializer(serializers.Serializer):
     note = serializers.CharField(required=False, allow_blank=True)
 
 
+class BulkTransitionSerializer(serializers.Serializer):
+    """Serializer for staff bulk status transitions"""
+    application_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.APPLICATIONS_BULK_TRANSITION_MAX,
+    )
+    transition_type = serializers.CharField(required=True)
+    note = serializers.CharField(required=False, allow_blank=True)
+
+
+class StaffQueueQuerySerializer(serializers.Serializer):
+    """Query parameters for the staff review queue"""
+    status = serializers.MultipleChoiceField(
+        choices=Status.choices,
+        required=False,
+        help_text="Statuses to include (repeatable); defaults to Submitted and UnderReview",
+    )
+    program_id = serializers.UUIDField(required=False)
+    intake_id = serializers.UUIDField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    ready = serializers.BooleanField(
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text="Only applications with (true) or without (false) all mandatory documents",
+    )
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=200, default=50)
+
+
+class StatusStatsQuerySerializer(serializers.Serializer):
+    """Query parameters for the application status statistics"""
+    program_id = serializers.UUIDField(required=False)
+    intake_id = serializers.UUIDField(required=False)
+
+
 class EventSerializer(UUIDSerializerMixin, serializers.ModelSerializer):
     """Serializer for ApplicationsEvent model"""
     actor_id = UUIDRelatedField(
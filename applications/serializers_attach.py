@@ -1,5 +1,4 @@
-from rest_framework import serializers
-
+from django.conf import settings
 from rest_framework import serializers
 from core.utils.serializer_fields import UUIDRelatedField
 
@@ -14,3 +13,12 @@ class AttachDocumentIn(serializers.Serializer):
         related_model="StudentDocument",
         service_name="documents"
     )
+
+
+class AttachDocumentBatchIn(serializers.Serializer):
+    documents = AttachDocumentIn(
+        many=True,
+        allow_empty=False,
+        max_length=settings.APPLICATIONS_BATCH_ATTACH_MAX,
+        help_text="Documents to attach, as {doc_type_id, student_document_id} pairs",
+    )
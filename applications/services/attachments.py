@@ -0,0 +1,209 @@
+"""
+Attaching student documents to an application.
+
+Every link takes a numbered slot (1..max_items) within its (application,
+doc_type_id), and the database enforces one link per slot and one link per
+student document. The pre-checks here reject the common cases cheaply before the
+Documents service is called. The constraints stay authoritative when requests race.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+
+from ..integrations.documents import get_student_documents
+from ..models import Application, ApplicationDocument, ApplicationsEvent
+from .completeness import apply_attachment_changes, lock_application
+from .document_sync import enqueue_document_sync
+from .requirements import required_documents_for_app
+
+
+class AttachmentConflict(Exception):
+    """An attach was rejected by the current attachments (possibly a concurrent one)."""
+
+    def __init__(self, error: str, **data):
+        super().__init__(error)
+        self.error = error
+        self.data = data
+
+
+class SlotState:
+    """Attachments already present for one (application, doc_type_id)."""
+
+    def __init__(self):
+        self.document_ids = set()
+        self.slots = set()
+        self.count = 0
+
+    def add(self, student_document_id, slot: Optional[int]):
+        self.document_ids.add(str(student_document_id))
+        if slot is not None:
+            self.slots.add(slot)
+        self.count += 1
+
+    def next_slot(self, max_items: int) -> Optional[int]:
+        """Lowest free slot, or None when max_items is reached."""
+        if self.count >= max_items:
+            return None
+        return min(set(range(1, max_items + 1)) - self.slots, default=None)
+
+
+def load_slot_states(app: Application, doc_type_ids: Iterable[str]) -> Dict[str, SlotState]:
+    """Current attachments per doc type in one query (an empty state for untouched types)."""
+    states = {str(doc_type_id): SlotState() for doc_type_id in doc_type_ids}
+    rows = ApplicationDocument.objects.filter(application=app, doc_type_id__in=list(states)).values_list(
+        "doc_type_id", "student_document_id", "slot"
+    )
+    for doc_type_id, student_document_id, slot in rows:
+        states.setdefault(str(doc_type_id), SlotState()).add(student_document_id, slot)
+    return states
+
+
+def insert_link(app: Application, required, doc_type_id: str,
+                student_document_id: str, state: SlotState, actor_id: str) -> ApplicationDocument:
+    """
+    Insert one link in the lowest free slot, together with its doc_attached event,
+    the application's completeness counter update and the queued document sync.
+
+    If a concurrent attach takes the slot first, the state is re-read and the next
+    free slot is tried.
+
+    Raises:
+        AttachmentConflict: "already_attached", or "max_items_reached" with
+            max_items and current_count
+    """
+    max_items = required.max_items
+    while True:
+        slot = state.next_slot(max_items)
+        if slot is None:
+            raise AttachmentConflict("max_items_reached", max_items=max_items, current_count=state.count)
+        try:
+            with transaction.atomic():
+                lock_application(app.id)
+                link = ApplicationDocument.objects.create(
+                    application=app,
+                    doc_type_id=doc_type_id,
+                    student_document_id=student_document_id,
+                    slot=slot,
+                )
+                ApplicationsEvent.objects.create(
+                    application=app,
+                    actor_id=actor_id,
+                    event_type="doc_attached",
+                    note=f"Attached {student_document_id} to type {doc_type_id}.",
+                )
+                apply_attachment_changes(app.id, {doc_type_id: required}, {doc_type_id: 1})
+                enqueue_document_sync(app.id, [(doc_type_id, student_document_id)])
+            return link
+        except IntegrityError:
+            fresh = load_slot_states(app, [doc_type_id])[str(doc_type_id)]
+            if str(student_document_id) in fresh.document_ids:
+                raise AttachmentConflict("already_attached")
+            if slot not in fresh.slots:
+                raise
+            state = fresh
+
+
+def attach_documents(app: Application, student_id: str, items: Iterable[dict]) -> Tuple[List[dict], List[dict]]:
+    """
+    Validate and attach several documents with a fixed number of queries.
+
+    Each item is checked with the same rules as the single attach endpoint: the
+    doc type must be in the snapshot, max_items must not be exceeded (counting
+    earlier items in the same batch), and the student document must exist, belong
+    to the student, be clean and match the doc type. Valid items are inserted with
+    one bulk_create and a single ``docs_attached`` event; invalid ones are reported.
+
+    Args:
+        app: The application, already checked to belong to student_id
+        student_id: UUID string of the acting student
+        items: Dicts with doc_type_id and student_document_id
+
+    Returns:
+        Tuple of (attached, rejected). Attached entries carry the link id; rejected
+        entries carry the item index, its ids and an ``error`` code.
+
+    Raises:
+        DocumentsError: If the Documents service cannot be reached
+        AttachmentConflict: "concurrent_attach" if another request attached to
+            the same slots in the meantime
+    """
+    items = [
+        {"doc_type_id": str(item["doc_type_id"]), "student_document_id": str(item["student_document_id"])}
+        for item in items
+    ]
+    doc_type_ids = {item["doc_type_id"] for item in items}
+
+    required = {
+        str(req.doc_type_id): req
+        for req in required_documents_for_app(app, doc_type_ids).only(
+            "doc_type_id", "is_mandatory", "min_items", "max_items"
+        )
+    }
+    max_items = {doc_type_id: req.max_items for doc_type_id, req in required.items()}
+    states = load_slot_states(app, doc_type_ids)
+
+    # Only documents that can still be attached are worth an upstream lookup.
+    candidates = [
+        item for item in items
+        if item["doc_type_id"] in max_items
+        and item["student_document_id"] not in states[item["doc_type_id"]].document_ids
+    ]
+    documents = get_student_documents(list(dict.fromkeys(item["student_document_id"] for item in candidates)))
+
+    accepted, rejected, seen = [], [], set()
+
+    def reject(index, item, error, **data):
+        rejected.append({"index": index, **item, "error": error, **data})
+
+    for index, item in enumerate(items):
+        doc_type_id, student_document_id = item["doc_type_id"], item["student_document_id"]
+        sd = documents.get(student_document_id)
+
+        if student_document_id in seen:
+            reject(index, item, "duplicate_in_request")
+        elif doc_type_id not in max_items:
+            reject(index, item, "doc_type_not_required")
+        elif student_document_id in states[doc_type_id].document_ids:
+            reject(index, item, "already_attached")
+        elif states[doc_type_id].next_slot(max_items[doc_type_id]) is None:
+            reject(index, item, "max_items_reached",
+                   max_items=max_items[doc_type_id], current_count=states[doc_type_id].count)
+        elif sd is None:
+            reject(index, item, "document_not_found")
+        elif str(sd.get("user_id")) != str(student_id):
+            reject(index, item, "document_not_owned")
+        elif sd.get("status") != "clean":
+            reject(index, item, "document_not_clean", status=sd.get("status"))
+        elif str(sd.get("doc_type_id")) != doc_type_id:
+            reject(index, item, "doc_type_mismatch", document_type=str(sd.get("doc_type_id")))
+        else:
+            seen.add(student_document_id)
+            slot = states[doc_type_id].next_slot(max_items[doc_type_id])
+            states[doc_type_id].add(student_document_id, slot)
+            accepted.append((item, slot))
+
+    if not accepted:
+        return [], rejected
+
+    try:
+        with transaction.atomic():
+            lock_application(app.id)
+            links = ApplicationDocument.objects.bulk_create([
+                ApplicationDocument(application=app, slot=slot, **item) for item, slot in accepted
+            ])
+            ApplicationsEvent.objects.create(
+                application=app,
+                actor_id=student_id,
+                event_type="docs_attached",
+                note=f"Attached {len(links)} documents: "
+                     + ", ".join(f"{item['student_document_id']} to type {item['doc_type_id']}" for item, _ in accepted),
+            )
+            apply_attachment_changes(app.id, required, Counter(item["doc_type_id"] for item, _ in accepted))
+            enqueue_document_sync(app.id, [(item["doc_type_id"], item["student_document_id"]) for item, _ in accepted])
+    except IntegrityError:
+        # A concurrent attach took one of the slots or documents; nothing was written.
+        raise AttachmentConflict("concurrent_attach")
+
+    attached = [{"id": str(link.id), **item} for link, (item, _) in zip(links, accepted)]
+    return attached, rejected
@@ -1,17 +1,171 @@
 """
 Utility functions to help with document management across the applications and documents apps.
+
+Links attached in the applications app are mirrored one way into
+``documents.ApplicationDocument``. ``sync_application_documents`` does that for
+many (application, doc_type, student_document) triples with a fixed number of
+queries per batch. Attaches queue the triples on the ``DOCUMENT_SYNC_TOPIC``
+outbox topic, so the sync runs in ``run_outbox_worker`` rather than in the request.
 """
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+from applications.outbox import enqueue
 
 logger = logging.getLogger(__name__)
 
+DOCUMENT_SYNC_TOPIC = "documents.sync"
+SYNC_BATCH_SIZE = 500
+
+Triple = Tuple[Any, Any, Any]
+
+
+def enqueue_document_sync(app_id, links: Iterable[Tuple[Any, Any]]) -> None:
+    """
+    Queue newly attached links for syncing; call inside the attach transaction.
+
+    Args:
+        app_id: UUID of the application
+        links: (doc_type_id, student_document_id) pairs
+    """
+    links = [[str(doc_type_id), str(student_document_id)] for doc_type_id, student_document_id in links]
+    if links:
+        enqueue(DOCUMENT_SYNC_TOPIC, {"application_id": str(app_id), "links": links})
+
+
+def handle_document_sync(message) -> None:
+    """Outbox handler for DOCUMENT_SYNC_TOPIC; errors propagate so the message is retried."""
+    app_id = message.payload["application_id"]
+    sync_application_documents(
+        (app_id, doc_type_id, student_document_id)
+        for doc_type_id, student_document_id in message.payload["links"]
+    )
+
+
+def sync_application_documents(triples: Iterable[Triple], batch_size: int = SYNC_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Mirror (app_id, doc_type_id, student_document_id) triples into documents.ApplicationDocument.
+
+    Per batch: the applications, document types, user documents and programs are
+    resolved with one query each. Missing ProgramDocuments are bulk-inserted and
+    read back, and missing ApplicationDocuments are bulk-inserted after one
+    existence check. Conflicting inserts from a concurrent sync are ignored, so
+    repeating a sync is harmless.
+
+    Args:
+        triples: (app_id, doc_type_id, student_document_id) values
+        batch_size: Triples resolved per round of queries
+
+    Returns:
+        Dict with counts: synced (now mirrored), created (inserted by this call)
+        and skipped (application, document type, user document or program not found)
+    """
+    totals = {"synced": 0, "created": 0, "skipped": 0}
+    batch: List[Triple] = []
+    for triple in triples:
+        batch.append(tuple(str(value) for value in triple))
+        if len(batch) >= batch_size:
+            _add(totals, _sync_batch(batch))
+            batch = []
+    if batch:
+        _add(totals, _sync_batch(batch))
+    return totals
+
+
+def _add(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+    for key, value in counts.items():
+        totals[key] += value
+
+
+def _sync_batch(triples: List[Triple]) -> Dict[str, int]:
+    # Import here to avoid circular imports
+    from django.db import transaction
+    from applications.integrations.catalog import invalidate_program_required_documents
+    from applications.models import Application
+    from catalog.models import Program
+    from documents.models import UserDocument, DocumentType, ProgramDocument, ApplicationDocument as DocsApplicationDocument
+
+    triples = list(dict.fromkeys(triples))
+    apps = Application.objects.only("id", "program_id").in_bulk({app_id for app_id, _, _ in triples})
+    doc_types = DocumentType.objects.only("id").in_bulk({doc_type_id for _, doc_type_id, _ in triples})
+    user_docs = UserDocument.objects.only("id").in_bulk({sd_id for _, _, sd_id in triples})
+    programs = set(
+        str(program_id) for program_id in Program.all_objects.filter(
+            id__in={app.program_id for app in apps.values()}
+        ).values_list("id", flat=True)
+    )
+    # in_bulk keys are UUIDs; look them up by string
+    apps = {str(key): app for key, app in apps.items()}
+    doc_types = {str(key) for key in doc_types}
+    user_docs = {str(key) for key in user_docs}
+
+    resolved = []
+    for app_id, doc_type_id, sd_id in triples:
+        app = apps.get(app_id)
+        if app is None or doc_type_id not in doc_types or sd_id not in user_docs or str(app.program_id) not in programs:
+            logger.warning(f"Could not sync ApplicationDocument: app {app_id}, doc type {doc_type_id}, doc {sd_id} not found")
+            continue
+        resolved.append((str(app.program_id), doc_type_id, sd_id))
+    skipped = len(triples) - len(resolved)
+    if not resolved:
+        return {"synced": 0, "created": 0, "skipped": skipped}
+
+    with transaction.atomic():
+        program_keys = {(program_id, doc_type_id) for program_id, doc_type_id, _ in resolved}
+        ProgramDocument.objects.bulk_create(
+            [ProgramDocument(program_id=program_id, document_type_id=doc_type_id, is_mandatory=True)
+             for program_id, doc_type_id in program_keys],
+            ignore_conflicts=True,
+        )
+        # bulk_create sends no post_save, so invalidate_program_policy does not run:
+        # drop the cached policies here, after commit like the signal does.
+        affected = sorted({program_id for program_id, _ in program_keys})
+
+        def invalidate_policies():
+            for program_id in affected:
+                invalidate_program_required_documents(program_id)
+
+        transaction.on_commit(invalidate_policies)
+        program_docs = {
+            (str(program_id), str(doc_type_id)): str(pd_id)
+            for pd_id, program_id, doc_type_id in ProgramDocument.objects.filter(
+                program_id__in={key[0] for key in program_keys},
+                document_type_id__in={key[1] for key in program_keys},
+            ).values_list("id", "program_id", "document_type_id")
+        }
+
+        pairs = {
+            (sd_id, program_docs[(program_id, doc_type_id)])
+            for program_id, doc_type_id, sd_id in resolved
+        }
+        existing = {
+            (str(sd_id), str(pd_id))
+            for sd_id, pd_id in DocsApplicationDocument.objects.filter(
+                user_document_id__in={sd_id for sd_id, _ in pairs},
+                program_document_id__in={pd_id for _, pd_id in pairs},
+            ).values_list("user_document_id", "program_document_id")
+        }
+        missing = pairs - existing
+        if missing:
+            DocsApplicationDocument.objects.bulk_create(
+                [
+                    # We assume it's verified if it's attached to an application
+                    DocsApplicationDocument(user_document_id=sd_id, program_document_id=pd_id, is_verified=True)
+                    for sd_id, pd_id in missing
+                ],
+                ignore_conflicts=True,
+            )
+    logger.info(f"Synced {len(resolved)} application documents, {len(missing)} new")
+    return {"synced": len(resolved), "created": len(missing), "skipped": skipped}
+
+
 def sync_application_document(app_id, doc_type_id, student_document_id) -> bool:
     """
     Synchronizes an ApplicationDocument created in the applications app
     with the ApplicationDocument model in the documents app.
     
-    This is a one-way sync: from applications to documents.
+    This is a one-way sync: from applications to documents. Prefer
+    sync_application_documents (or enqueue_document_sync) for more than one link.
     
     Args:
         app_id: UUID of the application
@@ -22,46 +176,7 @@ def sync_application_document(app_id, doc_type_id, student_document_id) -> bool:
         bool: True if sync was successful, False otherwise
     """
     try:
-        # Import here to avoid circular imports
-        from applications.models import Application
-        from documents.models import UserDocument, DocumentType, ProgramDocument, ApplicationDocument as DocsApplicationDocument
-        
-        # Get the application
-        app = Application.objects.get(id=app_id)
-        
-        # Get required objects from documents app
-        try:
-            doc_type = DocumentType.objects.get(id=doc_type_id)
-            user_doc = UserDocument.objects.get(id=student_document_id)
-            
-            # Find or create the program document
-            program_doc, created = ProgramDocument.objects.get_or_create(
-                program_id=app.program_id,
-                document_type=doc_type,
-                defaults={'is_mandatory': True}
-            )
-            
-            # Check if a document already exists
-            existing = DocsApplicationDocument.objects.filter(
-                user_document=user_doc,
-                program_document=program_doc
-            ).first()
-            
-            if not existing:
-                # Create a new record in documents app
-                DocsApplicationDocument.objects.create(
-                    user_document=user_doc,
-                    program_document=program_doc,
-                    is_verified=True  # We assume it's verified if it's attached to an application
-                )
-                logger.info(f"Created documents.ApplicationDocument for app {app_id}, doc {student_document_id}")
-            
-            return True
-            
-        except (DocumentType.DoesNotExist, UserDocument.DoesNotExist) as e:
-            logger.warning(f"Could not sync ApplicationDocument: {e}")
-            return False
-            
+        return sync_application_documents([(app_id, doc_type_id, student_document_id)])["synced"] == 1
     except Exception as e:
         logger.error(f"Error syncing ApplicationDocument: {e}")
         return False
@@ -77,13 +192,34 @@ def get_document_counts_by_type(application_id) -> Dict[str, int]:
     Returns:
         Dict mapping document type IDs to counts
     """
-    from applications.models import ApplicationDocument
+    return get_document_counts_by_type_for_applications([application_id]).get(str(application_id), {})
+
+
+def get_document_counts_by_type_for_applications(application_ids: Iterable) -> Dict[str, Dict[str, int]]:
+    """
+    Get per-type document counts for many applications in one grouped query.
     
-    counts = {}
-    docs = ApplicationDocument.objects.filter(application_id=application_id)
+    Args:
+        application_ids: UUIDs of the applications
+        
+    Returns:
+        Dict mapping application IDs to {document type ID: count}; every requested
+        application is present, with an empty dict if nothing is attached
+    """
+    from django.db.models import Count
+    from applications.models import ApplicationDocument
     
-    for doc in docs:
-        doc_type_id = str(doc.doc_type_id)
-        counts[doc_type_id] = counts.get(doc_type_id, 0) + 1
+    application_ids = [str(application_id) for application_id in application_ids]
+    counts = {application_id: {} for application_id in application_ids}
+    if not application_ids:
+        return counts
     
+    rows = (
+        ApplicationDocument.objects.filter(application_id__in=application_ids)
+        .order_by()
+        .values("application_id", "doc_type_id")
+        .annotate(count=Count("id"))
+    )
+    for row in rows:
+        counts[str(row["application_id"])][str(row["doc_type_id"])] = row["count"]
     return counts
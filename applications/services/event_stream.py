@@ -0,0 +1,380 @@
+"""
+Server-Sent Events stream of a student's application events.
+
+The stream reads ``ApplicationsEvent`` rows in (txid, created_at, id) order, where
+``txid`` is the id of the inserting transaction. Each SSE ``id`` is that position,
+so a client that reconnects with ``Last-Event-ID`` resumes right after the last
+event it received.
+
+Timestamps cannot be the order: ``created_at`` is set before commit (a bulk
+transition stamps all its events at the start), so a transaction that commits
+late would add rows behind a cursor that already moved past them. A sequence has
+the same problem. Instead a read only delivers rows whose transaction id is below
+the xmin of the current snapshot (``_watermark``): every such transaction has
+ended, and any transaction still running, or started later, gets a larger id.
+Rows at or above the watermark are held back and re-read every
+``APPLICATIONS_STREAM_POLL_INTERVAL`` seconds, but for no longer than
+``APPLICATIONS_STREAM_MAX_HOLD_BACK`` seconds after their ``created_at`` (on the
+database clock): a long transaction elsewhere (a re-snapshot run, an open admin
+session) must not stall every stream. Only an event whose own transaction runs
+longer than that can then land behind a cursor; the timeline still has it. On
+other databases every ``txid`` is 0, so the order is (created_at, id) and nothing
+is held back (development only).
+
+Under ASGI (see docs/AZURE_DEPLOYMENT_GUIDE.md) the stream is an async generator:
+while it waits it holds no worker thread and no database connection. Each read
+borrows a connection and gives it back. On PostgreSQL one LISTEN connection per
+process (``_Listener``) receives every NOTIFY on ``CHANNEL`` (see
+``notify_student_events``) and wakes only the streams of the student in the
+payload. Other databases fall back to polling every
+``APPLICATIONS_STREAM_POLL_INTERVAL`` seconds. Streams end after
+``APPLICATIONS_STREAM_MAX_SECONDS``, and EventSource clients reconnect on their own.
+
+Under WSGI a long-lived stream would pin a sync worker, so ``pending_messages``
+answers with the events already there and ends the response; EventSource then
+polls by reconnecting every ``RETRY_MS``.
+"""
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+import weakref
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import takewhile
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Now
+from rest_framework.renderers import JSONRenderer
+
+from core.utils.keyset import InvalidCursor
+from ..models import ApplicationsEvent
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "application_events"
+PAGE_SIZE = 100
+# Tells EventSource how long to wait before reconnecting (milliseconds).
+RETRY_MS = 3000
+# Pause before the shared listener reconnects after losing its connection.
+LISTEN_RECONNECT_SECONDS = 1
+
+
+class EventStreamRenderer(JSONRenderer):
+    """
+    Lets ``Accept: text/event-stream`` pass content negotiation. The stream itself
+    is a StreamingHttpResponse; error responses are still rendered as JSON.
+    """
+    media_type = "text/event-stream"
+    format = "sse"
+
+
+def notify_student_events(student_ids: Iterable) -> None:
+    """
+    Wake the streams of these students once the current transaction commits.
+
+    NOTIFY is transactional on PostgreSQL: it is delivered on commit and dropped
+    on rollback. Other databases have no listeners, so this does nothing there.
+    """
+    if connection.vendor != "postgresql":
+        return
+    payloads = sorted({str(student_id) for student_id in student_ids})
+    if payloads:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload", [CHANNEL, payloads])
+
+
+def encode_position(txid: int, created_at: datetime, pk) -> str:
+    """Encode a (txid, created_at, id) stream position as an opaque SSE id."""
+    raw = json.dumps([txid, created_at.isoformat(), str(pk)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_position(cursor: str) -> Tuple[int, datetime, uuid.UUID]:
+    """
+    Decode a position produced by encode_position.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        txid, created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(txid), datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _watermark():
+    """Every transaction with a smaller id has ended (committed or rolled back)."""
+    if connection.vendor == "postgresql":
+        return RawSQL("pg_snapshot_xmin(pg_current_snapshot())::text::bigint", [])
+    return Value(2 ** 63 - 1)
+
+
+def _settled() -> Q:
+    """Rows the stream may deliver: below the watermark, or held back long enough."""
+    max_hold_back = timedelta(seconds=settings.APPLICATIONS_STREAM_MAX_HOLD_BACK)
+    return Q(txid__lt=_watermark()) | Q(created_at__lt=Now() - max_hold_back)
+
+
+def _events(student_id):
+    return ApplicationsEvent.objects.filter(application__student_id=student_id).values(
+        "id", "txid", "application_id", "event_type", "from_status", "to_status", "note", "created_at", "actor_id"
+    )
+
+
+def latest_cursor(student_id) -> Optional[str]:
+    """Position of the student's newest delivered event, so a fresh stream only sends new ones."""
+    latest = (
+        ApplicationsEvent.objects.filter(_settled(), application__student_id=student_id)
+        .order_by("-txid", "-created_at", "-id")
+        .values_list("txid", "created_at", "id")
+        .first()
+    )
+    return encode_position(*latest) if latest else None
+
+
+def format_event(row: dict) -> str:
+    """One SSE message; the id is the row's stream position."""
+    data = {
+        "application_id": str(row["application_id"]),
+        "event_type": row["event_type"],
+        "from_status": row["from_status"],
+        "to_status": row["to_status"],
+        "note": row["note"],
+        "created_at": row["created_at"],
+        "actor_id": str(row["actor_id"]),
+    }
+    return (
+        f"id: {encode_position(row['txid'], row['created_at'], row['id'])}\n"
+        f"event: application_event\n"
+        f"data: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+    )
+
+
+def _preamble(cursor: Optional[str]) -> List[str]:
+    # An id-only message sets the client's Last-Event-ID without dispatching an
+    # event, so a stream that ends before any event still resumes from here.
+    return [f"retry: {RETRY_MS}\n\n"] + ([f"id: {cursor}\n\n"] if cursor else [])
+
+
+def _read(events, cursor):
+    """
+    Next page of delivered events after cursor.
+
+    Returns:
+        Tuple of (rows, cursor, held_back); held_back is True when later rows
+        exist whose transaction may still be running
+    """
+    if cursor:
+        txid, created_at, pk = decode_position(cursor)
+        events = events.filter(
+            Q(txid__gt=txid)
+            | Q(txid=txid, created_at__gt=created_at)
+            | Q(txid=txid, created_at=created_at, id__gt=pk)
+        )
+    # The watermark is taken in the same statement, so it matches what it sees.
+    page = list(
+        events.annotate(settled=ExpressionWrapper(_settled(), output_field=BooleanField()))
+        .order_by("txid", "created_at", "id")[:PAGE_SIZE]
+    )
+    rows = list(takewhile(lambda row: row["settled"], page))
+    if rows:
+        last = rows[-1]
+        cursor = encode_position(last["txid"], last["created_at"], last["id"])
+    return rows, cursor, len(rows) < len(page)
+
+
+def _read_and_release(events, cursor):
+    try:
+        return _read(events, cursor)
+    finally:
+        # A waiting stream must not keep a connection (persistent or not) to itself.
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def pending_messages(student_id, cursor: Optional[str]) -> List[str]:
+    """
+    The SSE messages for events already stored after ``cursor``, for servers
+    that cannot hold a stream open (WSGI).
+
+    Raises:
+        InvalidCursor: If cursor is malformed
+    """
+    if cursor:
+        decode_position(cursor)
+    messages = _preamble(cursor)
+    events = _events(student_id)
+    while True:
+        rows, cursor, _ = _read(events, cursor)
+        messages.extend(format_event(row) for row in rows)
+        if len(rows) < PAGE_SIZE:
+            return messages
+
+
+class _Listener:
+    """
+    One LISTEN connection per process, shared by every open stream.
+
+    Streams subscribe with their student id and get an ``asyncio.Event`` that is
+    set when a NOTIFY for that student arrives. The connection is opened with the
+    first subscriber and closed once none is left.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+        self.task: Optional[asyncio.Task] = None
+
+    def subscribe(self, student_id) -> asyncio.Event:
+        event = asyncio.Event()
+        self.subscribers[str(student_id)].add(event)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        return event
+
+    def unsubscribe(self, student_id, event: asyncio.Event) -> None:
+        waiting = self.subscribers.get(str(student_id))
+        if waiting is not None:
+            waiting.discard(event)
+            if not waiting:
+                del self.subscribers[str(student_id)]
+
+    def dispatch(self, payload: str) -> None:
+        for event in self.subscribers.get(payload, ()):
+            event.set()
+
+    def wake_all(self) -> None:
+        for waiting in self.subscribers.values():
+            for event in waiting:
+                event.set()
+
+    async def _run(self) -> None:
+        import psycopg
+
+        params = connections["default"].get_connection_params()
+        # Django's cursor class is for sync connections.
+        params.pop("cursor_factory", None)
+        while self.subscribers:
+            try:
+                async with await psycopg.AsyncConnection.connect(**params, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    # NOTIFYs sent while we were not listening are lost: let every
+                    # stream re-read once.
+                    self.wake_all()
+                    while self.subscribers:
+                        async for notify in conn.notifies(timeout=settings.APPLICATIONS_STREAM_HEARTBEAT):
+                            self.dispatch(notify.payload)
+            except psycopg.Error as e:
+                logger.warning(f"Event stream listener lost its connection: {e}")
+                await asyncio.sleep(LISTEN_RECONNECT_SECONDS)
+
+
+_listeners: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Listener]" = weakref.WeakKeyDictionary()
+
+
+def _listener() -> _Listener:
+    loop = asyncio.get_running_loop()
+    if loop not in _listeners:
+        _listeners[loop] = _Listener()
+    return _listeners[loop]
+
+
+class _PollWaiter:
+    """Waits a fixed interval; used where LISTEN/NOTIFY is not available."""
+
+    async def wait(self, timeout: float) -> None:
+        await asyncio.sleep(max(0, min(timeout, settings.APPLICATIONS_STREAM_POLL_INTERVAL)))
+
+    def close(self) -> None:
+        pass
+
+
+class _ListenWaiter:
+    """Waits for the shared listener to see a NOTIFY carrying the student's id."""
+
+    def __init__(self, student_id):
+        self.student_id = str(student_id)
+        self.listener = _listener()
+        self.event = self.listener.subscribe(self.student_id)
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        # Cleared before the next read, so a NOTIFY during that read wakes us again.
+        self.event.clear()
+
+    def close(self) -> None:
+        self.listener.unsubscribe(self.student_id, self.event)
+
+
+def _waiter(student_id):
+    if connection.vendor == "postgresql":
+        return _ListenWaiter(student_id)
+    return _PollWaiter()
+
+
+def stream_events(student_id, cursor: Optional[str]) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for the student's events after ``cursor``, for ASGI servers.
+
+    Args:
+        student_id: UUID of the student whose applications are streamed
+        cursor: Last-Event-ID sent by the client, or the latest cursor to start from now
+
+    Sends a keep-alive comment when nothing happened for
+    ``APPLICATIONS_STREAM_HEARTBEAT`` seconds, so proxies keep the connection open.
+
+    Raises:
+        InvalidCursor: If cursor is malformed (raised before the first message)
+    """
+    if cursor:
+        # Validate before the response starts streaming.
+        decode_position(cursor)
+    deadline = time.monotonic() + settings.APPLICATIONS_STREAM_MAX_SECONDS
+    return _generate(student_id, _events(student_id), cursor, deadline)
+
+
+async def _generate(student_id, events, cursor, deadline) -> AsyncIterator[str]:
+    for message in _preamble(cursor):
+        yield message
+    read = sync_to_async(_read_and_release)
+    # Subscribe before the first read, so an event committed in between still wakes us.
+    waiter = _waiter(student_id)
+    try:
+        rows, cursor, held_back = await read(events, cursor)
+        last_sent = time.monotonic()
+        while True:
+            for row in rows:
+                yield format_event(row)
+            if rows:
+                last_sent = time.monotonic()
+                if len(rows) == PAGE_SIZE:
+                    rows, cursor, held_back = await read(events, cursor)
+                    continue
+
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            if now - last_sent >= settings.APPLICATIONS_STREAM_HEARTBEAT:
+                yield ": keep-alive\n\n"
+                last_sent = now
+            timeout = min(deadline - now, settings.APPLICATIONS_STREAM_HEARTBEAT)
+            if held_back:
+                # No NOTIFY comes when the transaction holding them back ends.
+                timeout = min(timeout, settings.APPLICATIONS_STREAM_POLL_INTERVAL)
+            await waiter.wait(timeout)
+            rows, cursor, held_back = await read(events, cursor)
+    finally:
+        waiter.close()
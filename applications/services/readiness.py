@@ -0,0 +1,57 @@
+"""
+Submission readiness checks for applications.
+"""
+from typing import Dict, List
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def get_missing_documents(application_id) -> List[Dict]:
+    """
+    Find mandatory document types that do not yet have enough attachments.
+    
+    Runs a single query: the snapshot rows (shared requirement set or legacy
+    per-application rows, combined with UNION ALL) are joined against a grouped
+    count of attached documents per doc_type_id.
+    
+    Args:
+        application_id: UUID of the application
+        
+    Returns:
+        List of {"doc_type_id": "<uuid>", "required": int, "attached": int}
+    """
+    from applications.models import ApplicationDocument
+    from applications.services.requirements import required_document_querysets
+
+    attached = (
+        ApplicationDocument.objects
+        .filter(application_id=application_id, doc_type_id=OuterRef("doc_type_id"))
+        .order_by()
+        .values("doc_type_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    legacy, shared = (
+        required.filter(is_mandatory=True)
+        .annotate(attached=Coalesce(Subquery(attached, output_field=IntegerField()), Value(0)))
+        .filter(attached__lt=F("min_items"))
+        .order_by()
+        .values_list("doc_type_id", "min_items", "attached")
+        for required in required_document_querysets([application_id])
+    )
+    return [
+        {"doc_type_id": str(doc_type_id), "required": min_items, "attached": attached_count}
+        for doc_type_id, min_items, attached_count in legacy.union(shared, all=True)
+    ]
+
+
+def get_submission_readiness(application_id) -> Dict:
+    """
+    Summarize whether an application can be submitted.
+    
+    Returns:
+        {"ready": bool, "missing_documents": [...]} with entries as in get_missing_documents
+    """
+    missing = get_missing_documents(application_id)
+    return {"ready": not missing, "missing_documents": missing}
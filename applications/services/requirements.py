@@ -0,0 +1,160 @@
+"""
+Required-document snapshots of applications.
+
+New applications reference a content-addressed ``RequirementSet``: the merged
+requirements are hashed, and every application with the same requirements shares
+one set. Older applications still own ``ApplicationRequiredDocument`` rows until
+``migrate_requirement_sets`` converts them. The readers here serve both kinds,
+returning rows with doc_type_id, is_mandatory, min_items, max_items and source.
+"""
+import hashlib
+import json
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from ..models import Application, ApplicationRequiredDocument, RequirementSet, RequirementSetItem
+
+def canonical_items(required: Iterable[Mapping]) -> List[dict]:
+    """Requirement dicts normalized and sorted, as hashed by requirement_digest."""
+    items = [
+        {
+            "doc_type_id": str(item["doc_type_id"]),
+            "is_mandatory": bool(item["is_mandatory"]),
+            "min_items": int(item["min_items"]),
+            "max_items": int(item["max_items"]),
+            "source": item["source"],
+            "source_required_document_id": (
+                str(item["source_required_document_id"]) if item.get("source_required_document_id") else None
+            ),
+        }
+        for item in required
+    ]
+    return sorted(items, key=lambda item: item["doc_type_id"])
+
+
+def requirement_digest(required: Iterable[Mapping]) -> str:
+    """SHA-256 of the canonical items: equal requirements give equal digests."""
+    payload = json.dumps(canonical_items(required), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_or_create_requirement_sets(requirements: Iterable[List[Mapping]]) -> Dict[str, RequirementSet]:
+    """
+    Find or create the sets for several requirement lists.
+
+    One query finds the existing sets; missing ones are created together with
+    their items. If another request created some of them concurrently, those are
+    read back and the rest are created again.
+
+    Returns:
+        digest -> RequirementSet
+    """
+    by_digest = {}
+    for required in requirements:
+        by_digest.setdefault(requirement_digest(required), canonical_items(required))
+    sets = {rs.digest: rs for rs in RequirementSet.objects.filter(digest__in=list(by_digest))}
+
+    missing = [digest for digest in by_digest if digest not in sets]
+    while missing:
+        try:
+            with transaction.atomic():
+                created = RequirementSet.objects.bulk_create([
+                    RequirementSet(digest=digest, item_count=len(by_digest[digest])) for digest in missing
+                ])
+                RequirementSetItem.objects.bulk_create([
+                    RequirementSetItem(requirement_set=rs, **item)
+                    for rs in created
+                    for item in by_digest[rs.digest]
+                ])
+            sets.update({rs.digest: rs for rs in created})
+            missing = []
+        except IntegrityError:
+            # Another request inserted some of the digests first; sets are immutable,
+            # so theirs are as good as ours. The savepoint rolled back all of our
+            # inserts, so read theirs back and create whatever is still missing.
+            found = {rs.digest: rs for rs in RequirementSet.objects.filter(digest__in=missing)}
+            if not found:
+                raise
+            sets.update(found)
+            missing = [digest for digest in missing if digest not in sets]
+    return sets
+
+
+def get_or_create_requirement_set(required: List[Mapping]) -> RequirementSet:
+    """The shared set for one merged requirement list (one lookup, or an insert)."""
+    return get_or_create_requirement_sets([required])[requirement_digest(required)]
+
+
+def required_documents_for_app(app: Application, doc_type_ids: Optional[Iterable] = None):
+    """
+    The application's requirement rows as a queryset (one query when evaluated).
+
+    Args:
+        app: The application (only id and requirement_set_id are used)
+        doc_type_ids: Optionally restrict to these doc types
+    """
+    if app.requirement_set_id is not None:
+        rows = RequirementSetItem.objects.filter(requirement_set_id=app.requirement_set_id)
+    else:
+        rows = ApplicationRequiredDocument.objects.filter(application_id=app.id)
+    if doc_type_ids is not None:
+        rows = rows.filter(doc_type_id__in=[str(doc_type_id) for doc_type_id in doc_type_ids])
+    return rows
+
+
+def get_required_document(app: Application, doc_type_id):
+    """
+    One requirement row of the application.
+
+    Raises:
+        ObjectDoesNotExist: If the doc type is not required
+    """
+    if app.requirement_set_id is not None:
+        return RequirementSetItem.objects.get(requirement_set_id=app.requirement_set_id, doc_type_id=doc_type_id)
+    return ApplicationRequiredDocument.objects.get(application=app, doc_type_id=doc_type_id)
+
+
+def required_document_querysets(application_ids: Iterable):
+    """
+    The requirement rows of many applications, as one queryset per storage kind.
+
+    Both querysets expose ``application_id``, so callers can filter, annotate and
+    group them the same way. Legacy rows left behind on an application that has a
+    set are excluded.
+
+    Returns:
+        Tuple of (legacy ApplicationRequiredDocument rows, RequirementSetItem rows)
+    """
+    application_ids = [str(application_id) for application_id in application_ids]
+    legacy = ApplicationRequiredDocument.objects.filter(
+        application_id__in=application_ids, application__requirement_set__isnull=True
+    )
+    shared = RequirementSetItem.objects.filter(
+        requirement_set__applications__id__in=application_ids
+    ).annotate(application_id=F("requirement_set__applications__id"))
+    return legacy, shared
+
+
+def required_documents(application_ids: Iterable, doc_type_ids: Optional[Iterable] = None,
+                       mandatory_only: bool = False) -> Dict[str, List]:
+    """
+    Requirement rows of many applications in two queries (one per storage kind).
+
+    Returns:
+        application_id (str) -> rows; every requested application is present
+    """
+    application_ids = [str(application_id) for application_id in application_ids]
+    result = {application_id: [] for application_id in application_ids}
+    if not application_ids:
+        return result
+
+    for rows in required_document_querysets(application_ids):
+        if doc_type_ids is not None:
+            rows = rows.filter(doc_type_id__in=[str(doc_type_id) for doc_type_id in doc_type_ids])
+        if mandatory_only:
+            rows = rows.filter(is_mandatory=True)
+        for row in rows:
+            result[str(row.application_id)].append(row)
+    return result
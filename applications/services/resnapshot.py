@@ -0,0 +1,183 @@
+"""
+Re-snapshot the required documents of Draft applications after a program's
+requirements change in Catalog.
+
+The program policy is fetched once, student rules once per distinct student,
+and ``merge_required_docs`` runs once per distinct student-rule list. Drafts are
+then processed in primary-key chunks, one short transaction each. Changed drafts
+are pointed at the shared requirement set for their new requirements (legacy
+per-application rows are deleted), get one ``requirements_updated`` event each,
+and have their completeness counters recomputed. Attachments are never removed:
+links to a doc type that is no longer required simply stop counting.
+"""
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..integrations.backends import submit as submit_upstream
+from ..integrations.catalog import (
+    CatalogError, get_program_required_documents, invalidate_program_required_documents,
+    resolve_student_required_documents,
+)
+from ..models import Application, ApplicationRequiredDocument, ApplicationsEvent, Status
+from ..outbox import enqueue_many, event_message
+from .completeness import recompute_counters
+from .event_stream import notify_student_events
+from .requirements import canonical_items, get_or_create_requirement_sets, required_documents, requirement_digest
+from .snapshot import merge_required_docs
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+# System actor recorded on re-snapshot events.
+SYSTEM_ACTOR_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def describe_changes(before: List[dict], after: List[dict]) -> str:
+    """Short summary of how a requirement list changed, for the event note."""
+    old = {item["doc_type_id"]: item for item in before}
+    new = {item["doc_type_id"]: item for item in after}
+    added = sorted(new.keys() - old.keys())
+    removed = sorted(old.keys() - new.keys())
+    changed = sorted(doc_type_id for doc_type_id in old.keys() & new.keys() if old[doc_type_id] != new[doc_type_id])
+    parts = [
+        f"{label} {', '.join(ids)}"
+        for label, ids in (("added", added), ("removed", removed), ("changed", changed))
+        if ids
+    ]
+    return f"Required documents re-snapshotted: {'; '.join(parts)}."
+
+
+class _StudentRules:
+    """Student-rule lookups memoized for the whole run, fetched concurrently per chunk."""
+
+    def __init__(self):
+        self.rules: Dict[str, Optional[list]] = {}
+
+    def load(self, student_ids: Iterable[str]) -> None:
+        pending = [student_id for student_id in dict.fromkeys(student_ids) if student_id not in self.rules]
+        # At most one lookup per upstream pool thread in flight at a time.
+        window = max(1, settings.HTTP_UPSTREAM_MAX_WORKERS)
+        for start in range(0, len(pending), window):
+            futures = {
+                student_id: submit_upstream(resolve_student_required_documents, student_id)
+                for student_id in pending[start:start + window]
+            }
+            for student_id, future in futures.items():
+                try:
+                    self.rules[student_id] = future.result()
+                except CatalogError as e:
+                    # Unlike create, do not fall back to no rules: that would drop
+                    # requirements from a snapshot that has them. Retry on the next run.
+                    logger.warning(f"Skipping drafts of student {student_id}: {e}")
+                    self.rules[student_id] = None
+
+
+def resnapshot_drafts(program_id, chunk_size: int = CHUNK_SIZE, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Bring every Draft application of a program in line with its current requirements.
+
+    Args:
+        program_id: UUID of the program whose requirements changed
+        chunk_size: Drafts handled per transaction
+        dry_run: Compute the changes without writing anything
+
+    Returns:
+        Dict with counts: checked, changed, skipped (student rules unavailable)
+
+    Raises:
+        CatalogNotFound, CatalogError: If the program policy cannot be fetched
+    """
+    program_id = str(program_id)
+    invalidate_program_required_documents(program_id)
+    program_reqs = get_program_required_documents(program_id)
+
+    students = _StudentRules()
+    merged_by_rules: Dict[str, list] = {}
+    totals = {"checked": 0, "changed": 0, "skipped": 0}
+
+    queryset = Application.objects.filter(program_id=program_id, status=Status.DRAFT).order_by("pk")
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        drafts = list(batch.values_list("pk", "student_id")[:chunk_size])
+        if not drafts:
+            break
+        last_pk = drafts[-1][0]
+        totals["checked"] += len(drafts)
+
+        students.load(str(student_id) for _, student_id in drafts)
+        targets = {}
+        for app_id, student_id in drafts:
+            rules = students.rules[str(student_id)]
+            if rules is None:
+                totals["skipped"] += 1
+                continue
+            key = json.dumps(rules, sort_keys=True, default=str)
+            if key not in merged_by_rules:
+                merged_by_rules[key] = merge_required_docs(program_reqs, rules)
+            targets[str(app_id)] = merged_by_rules[key]
+
+        current = required_documents(targets)
+        before = {
+            app_id: canonical_items(
+                {field: getattr(row, field) for field in (
+                    "doc_type_id", "is_mandatory", "min_items", "max_items", "source", "source_required_document_id"
+                )}
+                for row in rows
+            )
+            for app_id, rows in current.items()
+        }
+        changed = {
+            app_id: merged for app_id, merged in targets.items()
+            if requirement_digest(before[app_id]) != requirement_digest(merged)
+        }
+        totals["changed"] += len(changed)
+        if changed and not dry_run:
+            _apply(changed, before)
+
+    return totals
+
+
+def _apply(changed: Dict[str, list], before: Dict[str, List[dict]]) -> None:
+    now = timezone.now()
+    with transaction.atomic():
+        # Only applications still in Draft once locked are touched.
+        locked = {
+            str(app_id): student_id
+            for app_id, student_id in Application.objects.select_for_update()
+            .filter(pk__in=list(changed), status=Status.DRAFT)
+            .order_by("pk")
+            .values_list("pk", "student_id")
+        }
+        if not locked:
+            return
+        sets = get_or_create_requirement_sets(changed[app_id] for app_id in locked)
+
+        by_set = defaultdict(list)
+        for app_id in locked:
+            by_set[sets[requirement_digest(changed[app_id])].pk].append(app_id)
+        for set_id, app_ids in by_set.items():
+            Application.objects.filter(pk__in=app_ids).update(requirement_set_id=set_id, updated_at=now)
+        ApplicationRequiredDocument.objects.filter(application_id__in=list(locked)).delete()
+
+        events = ApplicationsEvent.objects.bulk_create([
+            ApplicationsEvent(
+                application_id=app_id,
+                actor_id=SYSTEM_ACTOR_ID,
+                event_type="requirements_updated",
+                note=describe_changes(before[app_id], canonical_items(changed[app_id])),
+                created_at=now,
+            )
+            for app_id in locked
+        ])
+        # bulk_create sends no post_save, so queue the outbox messages and wake the
+        # event streams here.
+        enqueue_many(event_message(event, locked[str(event.application_id)]) for event in events)
+        notify_student_events(locked.values())
+        recompute_counters(list(locked))
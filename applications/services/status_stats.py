@@ -0,0 +1,141 @@
+"""
+Application counts per (program_id, intake_id, status).
+
+``ApplicationStatusStat`` holds one row per key. ``apply_status_changes`` adjusts
+it with a single upsert inside the caller's transaction, so the counts commit or
+roll back together with the create or transition that changed them. Rows that
+drift (applications written or deleted outside these paths) are repaired by the
+``rebuild_status_stats`` management command.
+"""
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from ..models import Application, ApplicationStatusStat
+
+StatKey = Tuple[str, str, str]
+
+
+def status_key(program_id, intake_id, status) -> StatKey:
+    return (str(program_id), str(intake_id), str(status))
+
+
+def apply_status_changes(changes: Dict[StatKey, int]) -> None:
+    """
+    Add each delta to its (program_id, intake_id, status) row, creating missing rows.
+
+    One ``INSERT ... ON CONFLICT DO UPDATE`` statement for all keys. Keys are
+    written in sorted order so concurrent transactions lock rows in the same order.
+
+    Args:
+        changes: (program_id, intake_id, status) -> number of applications added
+            (negative when they left the status)
+    """
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+
+    meta = ApplicationStatusStat._meta
+    fields = [meta.get_field(name) for name in ("id", "program_id", "intake_id", "status", "count")]
+    table = connection.ops.quote_name(meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    conflict = ", ".join(connection.ops.quote_name(field.column) for field in fields[1:4])
+    count_column = connection.ops.quote_name(fields[4].column)
+
+    rows, params = [], []
+    for key in sorted(changes):
+        values = (uuid.uuid4(), *key, changes[key])
+        rows.append("(" + ", ".join(["%s"] * len(fields)) + ")")
+        params.extend(field.get_db_prep_value(value, connection) for field, value in zip(fields, values))
+
+    # Supported by both PostgreSQL and SQLite (3.24+).
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES {', '.join(rows)} "
+        f"ON CONFLICT ({conflict}) DO UPDATE SET {count_column} = {table}.{count_column} + EXCLUDED.{count_column}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def record_created(application: Application) -> None:
+    """Count a new application in its status (call inside the create transaction)."""
+    apply_status_changes({
+        status_key(application.program_id, application.intake_id, application.status): 1
+    })
+
+
+def record_transitions(rows: Iterable[Tuple[object, object, str]], to_status: str) -> None:
+    """
+    Move applications between status rows (call inside the transition transaction).
+
+    Args:
+        rows: (program_id, intake_id, from_status) per transitioned application
+        to_status: The status they moved to
+    """
+    changes = Counter()
+    for program_id, intake_id, from_status in rows:
+        changes[status_key(program_id, intake_id, from_status)] -= 1
+        changes[status_key(program_id, intake_id, to_status)] += 1
+    apply_status_changes(changes)
+
+
+def compute_status_stats() -> Dict[StatKey, int]:
+    """Count applications per key from scratch (one GROUP BY over Application)."""
+    return {
+        status_key(row["program_id"], row["intake_id"], row["status"]): row["n"]
+        for row in Application.objects.order_by().values("program_id", "intake_id", "status").annotate(n=Count("id"))
+    }
+
+
+def _lock_stats() -> list:
+    """
+    Lock the stats table against concurrent adjustments and return its rows.
+
+    On PostgreSQL a SHARE ROW EXCLUSIVE table lock waits for transactions that
+    already adjusted counts and blocks new adjustments, including inserts of new
+    keys, until the caller commits. Elsewhere the existing rows are locked.
+    """
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(ApplicationStatusStat._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+    return list(ApplicationStatusStat.objects.select_for_update())
+
+
+def rebuild_status_stats() -> int:
+    """
+    Rewrite the stats table from the Application table.
+
+    Runs in one transaction: stale rows are corrected, missing rows created and
+    rows for keys without applications removed. The table is locked before the
+    applications are counted, so a create or transition that commits meanwhile
+    is either in the count or applies its change after the rebuild.
+
+    Returns:
+        Number of rows that were wrong, missing or obsolete
+    """
+    with transaction.atomic():
+        stats = _lock_stats()
+        expected = compute_status_stats()
+        stale, obsolete = [], []
+        for stat in stats:
+            key = status_key(stat.program_id, stat.intake_id, stat.status)
+            count = expected.pop(key, 0)
+            if count == 0:
+                obsolete.append(stat.pk)
+            elif stat.count != count:
+                stat.count = count
+                stale.append(stat)
+        if stale:
+            ApplicationStatusStat.objects.bulk_update(stale, ["count"])
+        if obsolete:
+            ApplicationStatusStat.objects.filter(pk__in=obsolete).delete()
+        if expected:
+            ApplicationStatusStat.objects.bulk_create([
+                ApplicationStatusStat(program_id=program_id, intake_id=intake_id, status=app_status, count=count)
+                for (program_id, intake_id, app_status), count in expected.items()
+            ])
+    return len(stale) + len(obsolete) + len(expected)
@@ -0,0 +1,167 @@
+"""
+Application status transitions.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from applications.models import Application, ApplicationsEvent, Status
+from applications.outbox import enqueue_many, event_message
+from applications.services.event_stream import notify_student_events
+from applications.services.status_stats import record_transitions
+
+logger = logging.getLogger(__name__)
+
+# Define transition rules
+TRANSITION_RULES = {
+    'submit': {
+        'allowed_from_statuses': [Status.DRAFT],
+        'to_status': Status.SUBMITTED,
+        'allowed_roles': ['student'],
+    },
+    'start_review': {
+        'allowed_from_statuses': [Status.SUBMITTED],
+        'to_status': Status.UNDER_REVIEW,
+        'allowed_roles': ['staff'],
+    },
+    'offer': {
+        'allowed_from_statuses': [Status.UNDER_REVIEW],
+        'to_status': Status.OFFER,
+        'allowed_roles': ['staff'],
+    },
+    'reject': {
+        'allowed_from_statuses': [Status.UNDER_REVIEW, Status.OFFER],
+        'to_status': Status.REJECTED,
+        'allowed_roles': ['staff'],
+    },
+    'withdraw': {
+        'allowed_from_statuses': [Status.DRAFT, Status.SUBMITTED, Status.UNDER_REVIEW, Status.OFFER],
+        'to_status': Status.WITHDRAWN,
+        'allowed_roles': ['student'],
+    },
+    'accept_offer': {
+        'allowed_from_statuses': [Status.OFFER],
+        'to_status': Status.ACCEPTED,
+        'allowed_roles': ['student'],
+    },
+}
+
+
+class TransitionConflict(Exception):
+    """The application's status changed after it was read; nothing was written."""
+    pass
+
+
+def apply_transition(app: Application, transition_type: str, actor_id, note: Optional[str] = None) -> ApplicationsEvent:
+    """
+    Move an application to the rule's target status with a compare-and-swap.
+    
+    Issues ``UPDATE ... WHERE id = <id> AND status = <app.status>`` touching only
+    status and updated_at, and inserts the status_changed event and the status
+    stats adjustment in the same short transaction. ``app.status`` must be the status the caller validated against
+    the rule; ``app`` is updated in memory on success.
+    
+    Raises:
+        TransitionConflict: If the row no longer has the expected status
+    """
+    rule = TRANSITION_RULES[transition_type]
+    old_status = app.status
+    to_status = rule['to_status']
+    now = timezone.now()
+
+    with transaction.atomic():
+        updated = Application.objects.filter(
+            pk=app.pk,
+            status=old_status,
+            status__in=rule['allowed_from_statuses'],
+        ).update(status=to_status, updated_at=now)
+        if not updated:
+            raise TransitionConflict(f"Application {app.pk} is no longer {old_status}")
+
+        event = ApplicationsEvent.objects.create(
+            application=app,
+            actor_id=actor_id,
+            event_type="status_changed",
+            from_status=old_status,
+            to_status=to_status,
+            note=note if note is not None else f"Status changed from {old_status} to {to_status} via {transition_type}",
+        )
+        record_transitions([(app.program_id, app.intake_id, old_status)], to_status)
+
+    app.status = to_status
+    app.updated_at = now
+    return event
+
+
+def apply_bulk_transition(application_ids: Iterable, transition_type: str, actor_id,
+                          note: Optional[str] = None) -> List[Dict]:
+    """
+    Apply one transition to many applications with set-based writes.
+    
+    In one short transaction: lock the matching rows (a single SELECT ... FOR
+    UPDATE), move every eligible row with a single UPDATE, bulk-insert the
+    status_changed events with their outbox messages and adjust the status stats
+    with one upsert. Callers are responsible for role checks.
+    
+    Args:
+        application_ids: UUIDs of the applications (duplicates are ignored)
+        transition_type: A key of TRANSITION_RULES
+        actor_id: UUID recorded on the events
+        note: Optional note for every event
+        
+    Returns:
+        One outcome per distinct id, in input order:
+            {"id": "<uuid>", "outcome": "transitioned", "from_status": ..., "to_status": ...}
+            {"id": "<uuid>", "outcome": "invalid_status", "current_status": ...}
+            {"id": "<uuid>", "outcome": "not_found"}
+    """
+    rule = TRANSITION_RULES[transition_type]
+    to_status = rule['to_status']
+    allowed = set(rule['allowed_from_statuses'])
+    ids = list(dict.fromkeys(str(app_id) for app_id in application_ids))
+    now = timezone.now()
+
+    with transaction.atomic():
+        locked = {
+            str(app_id): (student_id, program_id, intake_id, app_status)
+            for app_id, student_id, program_id, intake_id, app_status in Application.objects.select_for_update()
+            .filter(pk__in=ids)
+            .order_by("pk")
+            .values_list("id", "student_id", "program_id", "intake_id", "status")
+        }
+        current = {app_id: row[3] for app_id, row in locked.items()}
+        eligible = [app_id for app_id in ids if current.get(app_id) in allowed]
+        if eligible:
+            Application.objects.filter(pk__in=eligible, status__in=allowed).update(
+                status=to_status, updated_at=now
+            )
+            events = ApplicationsEvent.objects.bulk_create([
+                ApplicationsEvent(
+                    application_id=app_id,
+                    actor_id=actor_id,
+                    event_type="status_changed",
+                    from_status=current[app_id],
+                    to_status=to_status,
+                    note=note if note is not None else f"Status changed from {current[app_id]} to {to_status} via {transition_type}",
+                    created_at=now,
+                )
+                for app_id in eligible
+            ])
+            enqueue_many(event_message(event, locked[str(event.application_id)][0]) for event in events)
+            record_transitions([locked[app_id][1:] for app_id in eligible], to_status)
+            # bulk_create sends no post_save, so queue the outbox messages and wake
+            # the event streams here.
+            notify_student_events(locked[app_id][0] for app_id in eligible)
+
+    results = []
+    for app_id in ids:
+        if app_id not in current:
+            results.append({"id": app_id, "outcome": "not_found"})
+        elif current[app_id] in allowed:
+            results.append({"id": app_id, "outcome": "transitioned",
+                            "from_status": current[app_id], "to_status": to_status})
+        else:
+            results.append({"id": app_id, "outcome": "invalid_status", "current_status": current[app_id]})
+    return results
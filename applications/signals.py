@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from documents.models import ProgramDocument
+from .integrations.catalog import invalidate_program_required_documents
+from .models import ApplicationDocument, ApplicationsEvent
+
+
+@receiver(post_save, sender=ProgramDocument)
+@receiver(post_delete, sender=ProgramDocument)
+def invalidate_program_policy(sender, instance, **kwargs):
+    """Drop the cached required-documents policy once a program's documents change"""
+    program_id = instance.program_id
+    # After commit, so a concurrent reload cannot re-cache the pre-change rows
+    transaction.on_commit(lambda: invalidate_program_required_documents(program_id))
+
+
+@receiver(post_delete, sender=ApplicationDocument)
+def update_completeness_on_detach(sender, instance, **kwargs):
+    """Keep the application's completeness counters in step when a link is removed"""
+    from .services.completeness import apply_attachment_changes, lock_application
+    from .services.requirements import required_documents
+
+    doc_type_id = str(instance.doc_type_id)
+    with transaction.atomic():
+        lock_application(instance.application_id)
+        required = required_documents([instance.application_id], [doc_type_id])[str(instance.application_id)]
+        if required:
+            apply_attachment_changes(instance.application_id, {doc_type_id: required[0]}, {doc_type_id: -1})
+
+
+@receiver(post_save, sender=ApplicationsEvent)
+def notify_event_stream(sender, instance, created, **kwargs):
+    """Wake the student's open event streams when the event commits"""
+    from .services.event_stream import notify_student_events
+
+    # Checked here too, so other databases skip the application lookup.
+    if created and connection.vendor == "postgresql":
+        notify_student_events([instance.application.student_id])
+
+
+@receiver(post_save, sender=ApplicationsEvent)
+def enqueue_event_outbox(sender, instance, created, **kwargs):
+    """Queue the event's outbox message in the transaction that created it"""
+    from .outbox import enqueue, event_message, event_topic
+
+    if created and event_topic(instance.event_type) in settings.OUTBOX_HANDLERS:
+        enqueue(*event_message(instance, instance.application.student_id))
@@ -6,6 +6,24 @@ from rest_framework.test import APIClient
 from applications.models import Application, Status
 
 
+@pytest.fixture(autouse=True)
+def clear_policy_cache():
+    """Start every test with an empty Catalog policy cache."""
+    from applications.integrations.catalog import program_policy_cache
+    program_policy_cache.clear()
+    yield
+    program_policy_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def sync_action_log(settings):
+    """Write action logs on the test thread so caplog sees them."""
+    from applications.action_log import stop_listener
+    settings.APPLICATIONS_LOG_ASYNC = False
+    yield
+    stop_listener()
+
+
 @pytest.fixture
 def api_client():
     """Return an API client for testing."""
@@ -62,6 +80,8 @@ def authenticated_api_client(api_client, monkeypatch, mock_current_user_id):
         id = 1
         pk = 1  # Add this for UserRateThrottle that uses request.user.pk
         is_authenticated = True
+        is_staff = False
+        is_superuser = False
         
     mock_user = MockUser()
     
@@ -80,3 +100,56 @@ def authenticated_api_client(api_client, monkeypatch, mock_current_user_id):
     
     # Return the authenticated client
     return api_client
+
+@pytest.fixture
+def staff_api_client(authenticated_api_client):
+    """Return the authenticated API client, logged in as a staff user."""
+    staff_id = uuid.uuid4()
+
+    class MockStaffUser:
+        id = staff_id
+        pk = staff_id
+        is_authenticated = True
+        is_staff = True
+        is_superuser = False
+        
+    authenticated_api_client.force_authenticate(user=MockStaffUser())
+    return authenticated_api_client
+
+
+@pytest.fixture
+def staff_user_client(api_client, db):
+    """Return an API client logged in as a real staff User with no Student row."""
+    from django.contrib.auth import get_user_model
+    
+    user = get_user_model().objects.create_user(email="staff@example.com", password="x", is_staff=True)
+    api_client.force_authenticate(user=user)
+    api_client.user = user
+    return api_client
+
+
+@pytest.fixture
+def world(db):
+    """
+    A program, a student User with three documents (one per document type) and a
+    Draft application of that student to the program.
+    
+    Returns:
+        Tuple of (application, program, document types, user documents)
+    """
+    import datetime
+    from django.contrib.auth import get_user_model
+    from catalog.models import Institution, Program
+    from documents.models import DocumentType, UserDocument
+    
+    institution = Institution.objects.create(official_name="Uni", type="university", country="RW")
+    program = Program.objects.create(institution=institution, name="CS", duration=4, language="en")
+    user = get_user_model().objects.create_user(email="student@example.com", password="pass1234")
+    doc_types = [DocumentType.objects.create(name=f"Type {i}", description="") for i in range(3)]
+    docs = [
+        UserDocument.objects.create(user=user, document_type=doc_type,
+                                    issued_date=datetime.date(2024, 1, 1), expires_date=datetime.date(2030, 1, 1))
+        for doc_type in doc_types
+    ]
+    app = create_test_application(student_id=user.id, program_id=program.id)
+    return app, program, doc_types, docs
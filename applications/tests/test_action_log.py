@@ -0,0 +1,80 @@
+import json
+import logging
+import uuid
+from datetime import datetime
+
+import pytest
+
+from applications import action_log
+from applications.action_log import log_action
+
+
+def records(caplog):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "applications.actions"]
+
+
+@pytest.fixture(autouse=True)
+def info_level(caplog):
+    caplog.set_level(logging.INFO, logger="applications.actions")
+
+
+def test_record_fields(caplog, monkeypatch):
+    monkeypatch.setattr(action_log.time, "time", lambda: 12.5)
+    app_id = uuid.uuid4()
+
+    log_action("attach_document", "user-1", app_id=app_id, outcome="error",
+               extra={"error": "boom", "when": datetime(2024, 1, 1)}, start_time=12.0)
+
+    assert records(caplog) == [{
+        "action": "attach_document",
+        "user_id": "user-1",
+        "outcome": "error",
+        "app_id": str(app_id),
+        "error": "boom",
+        "when": "2024-01-01 00:00:00",
+        "elapsed_ms": 500,
+    }]
+
+
+def test_nothing_is_encoded_when_info_is_disabled(caplog, monkeypatch):
+    calls = []
+    monkeypatch.setattr(action_log, "_encoder", type("E", (), {"encode": lambda self, d: calls.append(d) or "{}"})())
+    caplog.set_level(logging.WARNING, logger="applications.actions")
+
+    log_action("create", "user-1")
+
+    assert calls == []
+    assert records(caplog) == []
+
+
+def test_start_events_are_sampled(caplog, settings, monkeypatch):
+    settings.APPLICATIONS_LOG_START_SAMPLE_RATE = 0.25
+    rolls = iter([0.1, 0.9])
+    monkeypatch.setattr(action_log.random, "random", lambda: next(rolls))
+
+    log_action("create", "user-1", outcome="start")
+    log_action("create", "user-1", outcome="start")
+    log_action("create", "user-1", outcome="success")
+
+    assert [r["outcome"] for r in records(caplog)] == ["start", "success"]
+
+
+def test_async_listener_forwards_to_root(settings):
+    settings.APPLICATIONS_LOG_ASYNC = True
+    received = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            received.append(json.loads(record.getMessage()))
+
+    root = logging.getLogger()
+    handler = Collect()
+    root.addHandler(handler)
+    try:
+        log_action("transition", "user-1", outcome="success")
+        action_log.stop_listener()
+    finally:
+        root.removeHandler(handler)
+
+    assert received == [{"action": "transition", "user_id": "user-1", "outcome": "success"}]
+    assert logging.getLogger("applications.actions").propagate is True
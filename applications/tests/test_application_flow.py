@@ -2,6 +2,7 @@ import pytest
 from rest_framework.test import APIClient
 from django.urls import reverse
 from applications.models import Application, Status
+from applications.services.requirements import required_documents_for_app
 import uuid
 
 @pytest.mark.django_db
@@ -70,7 +71,7 @@ class TestApplicationsFlow:
         assert app.status == Status.DRAFT
         
         # Verify required documents were created
-        assert app.required_docs.count() == len(program_reqs)
+        assert required_documents_for_app(app).count() == len(program_reqs)
         
     def test_application_create_unauthenticated(self):
         """Test application creation fails without authentication"""
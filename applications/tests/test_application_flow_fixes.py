@@ -112,10 +112,13 @@ class TestApplicationFlowIntegration:
         app.id = app_id
         app.student_id = student_id
         app.status = Status.DRAFT
+        app.requirement_set_id = None  # legacy per-application snapshot rows
         mock_get_obj.return_value = app
         
         # Create a mock required document
         required_doc = MagicMock()
+        required_doc.is_mandatory = True
+        required_doc.min_items = 1
         required_doc.max_items = 10
         
         # Add a patch for the required document lookup
@@ -141,15 +144,13 @@ class TestApplicationFlowIntegration:
             # This will use the correct attach_document method after our fix
             with patch('applications.models.ApplicationDocument.objects.filter',
                       return_value=MagicMock(count=lambda: 0)):
-                with patch('applications.models.ApplicationDocument.objects.create') as mock_create:
-                    # Print the response to debug
+                with patch('applications.models.ApplicationDocument.objects.create') as mock_create, \
+                     patch('applications.models.ApplicationsEvent.objects.create') as mock_event:
+                    mock_create.return_value.id = uuid.uuid4()
                     response = authenticated_api_client.post(url, data, format='json')
-                    print(f"Response status: {response.status_code}")
-                    print(f"Response data: {response.data}")
                     
-                    # We're still checking that the right methods were called,
-                    # but let's not fail on the create assertion since we're debugging
+                    assert response.status_code == status.HTTP_201_CREATED
                     mock_get_obj.assert_called_once()
                     mock_get_doc.assert_called_once_with(student_doc_id)
-                    # Just check if it was called at all for now
-                    print(f"Create call count: {mock_create.call_count}")
+                    mock_create.assert_called_once()
+                    mock_event.assert_called_once()
@@ -0,0 +1,164 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+
+from applications.models import ApplicationDocument, ApplicationRequiredDocument
+from applications.tests.conftest import create_test_application
+
+
+@pytest.mark.django_db
+class TestAttachSlots:
+    """Tests for race-free max_items enforcement on attach"""
+
+    @pytest.fixture
+    def setup(self, authenticated_api_client, mock_current_user_id):
+        student_id = uuid.uuid4()
+        mock_current_user_id.return_value = str(student_id)
+        app = create_test_application(student_id=student_id)
+        doc_type_id = uuid.uuid4()
+        return authenticated_api_client, app, student_id, doc_type_id
+
+    def post(self, client, app, doc_type_id, student_document_id):
+        return client.post(
+            reverse("applications-attach-document", args=[app.id]),
+            {"doc_type_id": str(doc_type_id), "student_document_id": str(student_document_id)},
+            format="json",
+        )
+
+    def clean_doc(self, student_id, doc_type_id):
+        return lambda doc_id: {"id": doc_id, "user_id": str(student_id), "doc_type_id": str(doc_type_id), "status": "clean"}
+
+    def test_duplicate_rejected_before_upstream_call(self, setup):
+        client, app, _, doc_type_id = setup
+        ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type_id, is_mandatory=True,
+                                                   min_items=1, max_items=3, source="program")
+        existing = ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                                      student_document_id=uuid.uuid4(), slot=1)
+
+        with patch("applications.views.get_student_document") as lookup:
+            response = self.post(client, app, doc_type_id, existing.student_document_id)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        lookup.assert_not_called()
+
+    def test_slot_taken_concurrently_moves_to_next_slot(self, setup):
+        client, app, student_id, doc_type_id = setup
+        ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type_id, is_mandatory=True,
+                                                   min_items=1, max_items=2, source="program")
+
+        def racing_lookup(doc_id):
+            # Another request attaches into slot 1 while this one waits on Documents.
+            ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                               student_document_id=uuid.uuid4(), slot=1)
+            return self.clean_doc(student_id, doc_type_id)(doc_id)
+
+        with patch("applications.views.get_student_document", side_effect=racing_lookup):
+            response = self.post(client, app, doc_type_id, uuid.uuid4())
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(ApplicationDocument.objects.filter(application=app).values_list("slot", flat=True)) == [1, 2]
+
+    def test_last_slot_taken_concurrently_is_rejected(self, setup):
+        client, app, student_id, doc_type_id = setup
+        ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type_id, is_mandatory=True,
+                                                   min_items=1, max_items=1, source="program")
+
+        def racing_lookup(doc_id):
+            ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                               student_document_id=uuid.uuid4(), slot=1)
+            return self.clean_doc(student_id, doc_type_id)(doc_id)
+
+        with patch("applications.views.get_student_document", side_effect=racing_lookup):
+            response = self.post(client, app, doc_type_id, uuid.uuid4())
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert ApplicationDocument.objects.filter(application=app).count() == 1
+
+    def test_constraints(self, setup):
+        _, app, _, doc_type_id = setup
+        document_id = uuid.uuid4()
+        ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id, student_document_id=document_id, slot=1)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                               student_document_id=uuid.uuid4(), slot=1)
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                               student_document_id=document_id, slot=2)
+
+    def test_batch_reports_already_attached(self, setup):
+        client, app, student_id, doc_type_id = setup
+        ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type_id, is_mandatory=True,
+                                                   min_items=1, max_items=3, source="program")
+        existing = ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                                      student_document_id=uuid.uuid4(), slot=1)
+        new_id = str(uuid.uuid4())
+        lookup = self.clean_doc(student_id, doc_type_id)
+
+        with patch("applications.services.attachments.get_student_documents",
+                   side_effect=lambda ids: {i: lookup(i) for i in ids}) as batch_lookup:
+            response = client.post(
+                reverse("applications-attach-documents-batch", kwargs={"pk": str(app.id)}),
+                {"documents": [
+                    {"doc_type_id": str(doc_type_id), "student_document_id": str(existing.student_document_id)},
+                    {"doc_type_id": str(doc_type_id), "student_document_id": new_id},
+                ]},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert batch_lookup.call_args.args[0] == [new_id]
+        assert [r["error"] for r in response.data["rejected"]] == ["already_attached"]
+        assert ApplicationDocument.objects.get(application=app, student_document_id=new_id).slot == 2
+
+
+@pytest.fixture
+def without_student_doc_constraint(transactional_db):
+    """The attachment table as it was before uq_app_doc_student_doc existed."""
+    meta = ApplicationDocument._meta
+    constraints = meta.constraints
+    constraint = next(c for c in constraints if c.name == "uq_app_doc_student_doc")
+    # SQLite rebuilds the table from the model state, so drop it there as well.
+    meta.constraints = [c for c in constraints if c is not constraint]
+    try:
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(ApplicationDocument, constraint)
+        yield
+    finally:
+        meta.constraints = constraints
+        with connection.schema_editor() as editor:
+            editor.add_constraint(ApplicationDocument, constraint)
+
+
+def test_dedupe_command_keeps_the_oldest_link(without_student_doc_constraint):
+    app, other = create_test_application(), create_test_application()
+    doc_type_id, repeated = uuid.uuid4(), uuid.uuid4()
+    now = timezone.now()
+    oldest = ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                                student_document_id=repeated, created_at=now - timedelta(days=1))
+    for _ in range(2):
+        ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                           student_document_id=repeated, created_at=now)
+    single = ApplicationDocument.objects.create(application=app, doc_type_id=doc_type_id,
+                                                student_document_id=uuid.uuid4())
+    shared = ApplicationDocument.objects.create(application=other, doc_type_id=doc_type_id,
+                                                student_document_id=repeated)
+
+    out = StringIO()
+    call_command("dedupe_application_documents", "--dry-run", stdout=out)
+    assert "Would delete 2 duplicate links on 1 applications." in out.getvalue()
+    assert ApplicationDocument.objects.count() == 5
+
+    out = StringIO()
+    call_command("dedupe_application_documents", "--batch-size", "1", stdout=out)
+    assert "Deleted 2 duplicate links on 1 applications." in out.getvalue()
+    assert str(app.pk) in out.getvalue()
+    assert set(ApplicationDocument.objects.values_list("pk", flat=True)) == {oldest.pk, single.pk, shared.pk}
@@ -0,0 +1,125 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from applications.integrations.documents import DocumentsError
+from applications.models import ApplicationDocument, ApplicationRequiredDocument, ApplicationsEvent
+from applications.tests.conftest import create_test_application
+
+
+def require(app, doc_type_id, max_items=1):
+    ApplicationRequiredDocument.objects.create(
+        application=app, doc_type_id=doc_type_id, is_mandatory=True,
+        min_items=1, max_items=max_items, source="program",
+    )
+
+
+def student_doc(doc_id, user_id, doc_type_id, doc_status="clean"):
+    return {"id": str(doc_id), "user_id": str(user_id), "doc_type_id": str(doc_type_id), "status": doc_status}
+
+
+@pytest.mark.django_db
+class TestBatchAttach:
+    """Tests for attaching several documents in one request"""
+
+    @pytest.fixture
+    def setup(self, authenticated_api_client, mock_current_user_id):
+        student_id = uuid.uuid4()
+        mock_current_user_id.return_value = str(student_id)
+        app = create_test_application(student_id=student_id)
+        url = reverse("applications-attach-documents-batch", kwargs={"pk": str(app.id)})
+        return authenticated_api_client, app, student_id, url
+
+    def test_batch_attach_partial_success(self, setup, django_assert_max_num_queries):
+        client, app, student_id, url = setup
+        transcript, essay, passport, unknown = (uuid.uuid4() for _ in range(4))
+        require(app, transcript, max_items=2)
+        require(app, essay)
+        require(app, passport)
+
+        docs = {
+            "t1": student_doc(uuid.uuid4(), student_id, transcript),
+            "t2": student_doc(uuid.uuid4(), student_id, transcript),
+            "t3": student_doc(uuid.uuid4(), student_id, transcript),
+            "essay": student_doc(uuid.uuid4(), student_id, essay, doc_status="pending"),
+            "passport": student_doc(uuid.uuid4(), uuid.uuid4(), passport),
+        }
+        items = [{"doc_type_id": d["doc_type_id"], "student_document_id": d["id"]} for d in docs.values()]
+        items.append({"doc_type_id": str(unknown), "student_document_id": str(uuid.uuid4())})
+        items.append(items[0])
+
+        with patch("applications.services.attachments.get_student_documents") as lookup:
+            lookup.side_effect = lambda ids: {i: next((d for d in docs.values() if d["id"] == i), None) for i in ids}
+            # Includes the outbox insert that queues the document sync
+            with django_assert_max_num_queries(11):
+                response = client.post(url, {"documents": items}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert lookup.call_count == 1
+        assert [a["student_document_id"] for a in response.data["attached"]] == [docs["t1"]["id"], docs["t2"]["id"]]
+        assert {r["index"]: r["error"] for r in response.data["rejected"]} == {
+            2: "max_items_reached",
+            3: "document_not_clean",
+            4: "document_not_owned",
+            5: "doc_type_not_required",
+            6: "duplicate_in_request",
+        }
+        assert ApplicationDocument.objects.filter(application=app).count() == 2
+        events = ApplicationsEvent.objects.filter(application=app)
+        assert list(events.values_list("event_type", flat=True)) == ["docs_attached"]
+
+    def test_batch_attach_nothing_valid(self, setup):
+        client, app, student_id, url = setup
+        doc_type_id = uuid.uuid4()
+        require(app, doc_type_id)
+        item = {"doc_type_id": str(doc_type_id), "student_document_id": str(uuid.uuid4())}
+
+        with patch("applications.services.attachments.get_student_documents", return_value={}):
+            response = client.post(url, {"documents": [item]}, format="json")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.data["error"]["data"]["rejected"][0]["error"] == "document_not_found"
+        assert not ApplicationsEvent.objects.filter(application=app).exists()
+
+    def test_batch_attach_upstream_error(self, setup):
+        client, app, _, url = setup
+        doc_type_id = uuid.uuid4()
+        require(app, doc_type_id)
+        item = {"doc_type_id": str(doc_type_id), "student_document_id": str(uuid.uuid4())}
+
+        with patch("applications.services.attachments.get_student_documents", side_effect=DocumentsError("down")):
+            response = client.post(url, {"documents": [item]}, format="json")
+
+        assert response.status_code == status.HTTP_502_BAD_GATEWAY
+        assert not ApplicationDocument.objects.filter(application=app).exists()
+
+    def test_batch_attach_validation_and_ownership(self, setup, mock_current_user_id):
+        client, app, _, url = setup
+        assert client.post(url, {"documents": []}, format="json").status_code == status.HTTP_400_BAD_REQUEST
+
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        item = {"doc_type_id": str(uuid.uuid4()), "student_document_id": str(uuid.uuid4())}
+        assert client.post(url, {"documents": [item]}, format="json").status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_local_backend_batch_lookup(settings):
+    import datetime
+    from accounts.models import User
+    from documents.models import DocumentType, UserDocument
+    from applications.integrations.documents import get_student_documents
+
+    settings.APPLICATIONS_INTEGRATION_BACKEND = "applications.integrations.backends.LocalBackend"
+    user = User.objects.create_user(email="batch@example.com", password="pass1234")
+    doc_type = DocumentType.objects.create(name="Transcript", description="Academic transcript")
+    doc = UserDocument.objects.create(user=user, document_type=doc_type, issued_date=datetime.date(2024, 1, 1),
+                                      expires_date=datetime.date(2030, 1, 1))
+    missing = str(uuid.uuid4())
+
+    result = get_student_documents([str(doc.id), missing])
+
+    assert result[missing] is None
+    assert result[str(doc.id)]["user_id"] == str(user.id)
@@ -0,0 +1,89 @@
+import uuid
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from applications.models import Application, ApplicationsEvent, Status
+from applications.tests.conftest import create_test_application
+
+
+@pytest.mark.django_db
+class TestBulkTransition:
+    """Tests for the staff bulk transition endpoint"""
+
+    def test_bulk_start_review(self, staff_api_client, mock_current_user_id):
+        submitted = [create_test_application(status=Status.SUBMITTED) for _ in range(3)]
+        draft = create_test_application(status=Status.DRAFT)
+        missing = uuid.uuid4()
+        ids = [str(a.id) for a in submitted] + [str(draft.id), str(missing)]
+
+        response = staff_api_client.post(
+            reverse('applications-bulk-transition'), {"application_ids": ids, "transition_type": "start_review"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["summary"] == {"transitioned": 3, "invalid_status": 1, "not_found": 1}
+        outcomes = {r["id"]: r for r in response.data["results"]}
+        assert [r["id"] for r in response.data["results"]] == ids
+        assert outcomes[str(draft.id)] == {"id": str(draft.id), "outcome": "invalid_status", "current_status": Status.DRAFT}
+        assert outcomes[str(missing)]["outcome"] == "not_found"
+
+        assert Application.objects.filter(status=Status.UNDER_REVIEW).count() == 3
+        events = ApplicationsEvent.objects.filter(event_type="status_changed")
+        assert events.count() == 3
+        assert set(events.values_list("from_status", "to_status")) == {(Status.SUBMITTED, Status.UNDER_REVIEW)}
+
+    def test_staff_user_without_student_profile(self, staff_user_client):
+        app = create_test_application(status=Status.SUBMITTED)
+
+        response = staff_user_client.post(
+            reverse('applications-bulk-transition'), {"application_ids": [str(app.id)], "transition_type": "start_review"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["summary"]["transitioned"] == 1
+        event = ApplicationsEvent.objects.get(application=app, event_type="status_changed")
+        assert event.actor_id == staff_user_client.user.pk
+
+    def test_bulk_transition_requires_staff(self, authenticated_api_client, mock_current_user_id):
+        app = create_test_application(status=Status.SUBMITTED)
+
+        # The X-Role header is not trusted: only the authenticated user's staff flag counts.
+        authenticated_api_client.credentials(HTTP_X_ROLE='staff')
+        response = authenticated_api_client.post(
+            reverse('applications-bulk-transition'), {"application_ids": [str(app.id)], "transition_type": "start_review"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        app.refresh_from_db()
+        assert app.status == Status.SUBMITTED
+
+    def test_bulk_transition_rejects_student_transitions(self, staff_api_client, mock_current_user_id):
+        app = create_test_application(status=Status.DRAFT)
+
+        response = staff_api_client.post(
+            reverse('applications-bulk-transition'), {"application_ids": [str(app.id)], "transition_type": "submit"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_transition_limit(self, staff_api_client, mock_current_user_id):
+        from applications.serializers import BulkTransitionSerializer
+        limit = BulkTransitionSerializer().fields["application_ids"].max_length
+        ids = [str(uuid.uuid4()) for _ in range(limit + 1)]
+
+        response = staff_api_client.post(
+            reverse('applications-bulk-transition'), {"application_ids": ids, "transition_type": "offer"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_transition_query_count(self, django_assert_max_num_queries):
+        from applications.services.transitions import apply_bulk_transition
+        apps = [create_test_application(status=Status.UNDER_REVIEW) for _ in range(20)]
+
+        with django_assert_max_num_queries(6):
+            results = apply_bulk_transition([a.id for a in apps], "reject", uuid.uuid4())
+
+        assert all(r["outcome"] == "transitioned" for r in results)
+        assert Application.objects.filter(status=Status.REJECTED).count() == 20
@@ -0,0 +1,98 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from applications.models import Application, ApplicationDocument
+from applications.services.completeness import compute_counters
+
+
+def counters(app):
+    app.refresh_from_db()
+    return app.mandatory_docs_satisfied, app.mandatory_docs_missing
+
+
+@pytest.mark.django_db
+class TestCompletenessCounters:
+    """Tests for the denormalized mandatory-document counters"""
+
+    @pytest.fixture
+    def created(self, authenticated_api_client, mock_current_user_id):
+        student_id = uuid.uuid4()
+        mock_current_user_id.return_value = str(student_id)
+        transcript, essay, optional = (str(uuid.uuid4()) for _ in range(3))
+        with patch("applications.views.get_program_required_documents") as program, \
+             patch("applications.views.resolve_student_required_documents") as student:
+            program.return_value = [
+                {"doc_type_id": transcript, "is_mandatory": True, "min_items": 2, "max_items": 2},
+                {"doc_type_id": essay, "is_mandatory": True, "min_items": 1, "max_items": 1},
+                {"doc_type_id": optional, "is_mandatory": False, "min_items": 0, "max_items": 1},
+            ]
+            student.return_value = []
+            response = authenticated_api_client.post(
+                reverse("applications-list"),
+                {"program_id": str(uuid.uuid4()), "intake_id": str(uuid.uuid4())},
+                format="json",
+            )
+        app = Application.objects.get(id=response.data["id"])
+        return authenticated_api_client, app, student_id, transcript, essay
+
+    def attach(self, client, app, student_id, doc_type_id):
+        document_id = str(uuid.uuid4())
+        with patch("applications.views.get_student_document", return_value={
+            "id": document_id, "user_id": str(student_id), "doc_type_id": doc_type_id, "status": "clean",
+        }):
+            response = client.post(reverse("applications-attach-document", args=[app.id]),
+                                   {"doc_type_id": doc_type_id, "student_document_id": document_id}, format="json")
+        assert response.status_code == 201
+        return document_id
+
+    def test_counters_follow_attach_and_detach(self, created):
+        client, app, student_id, transcript, essay = created
+        assert counters(app) == (0, 2)
+
+        self.attach(client, app, student_id, transcript)
+        assert counters(app) == (0, 2)  # transcript needs two
+        self.attach(client, app, student_id, transcript)
+        assert counters(app) == (1, 1)
+        essay_doc = self.attach(client, app, student_id, essay)
+        assert counters(app) == (2, 0)
+
+        ApplicationDocument.objects.get(application=app, student_document_id=essay_doc).delete()
+        assert counters(app) == (1, 1)
+
+    def test_batch_attach_updates_counters(self, created):
+        client, app, student_id, transcript, essay = created
+        items = [{"doc_type_id": t, "student_document_id": str(uuid.uuid4())} for t in (transcript, transcript, essay)]
+        documents = {
+            i["student_document_id"]: {"id": i["student_document_id"], "user_id": str(student_id),
+                                       "doc_type_id": i["doc_type_id"], "status": "clean"}
+            for i in items
+        }
+        with patch("applications.services.attachments.get_student_documents",
+                   side_effect=lambda ids: {i: documents[i] for i in ids}):
+            response = client.post(reverse("applications-attach-documents-batch", kwargs={"pk": str(app.id)}),
+                                   {"documents": items}, format="json")
+
+        assert response.status_code == 201
+        assert counters(app) == (2, 0)
+
+    def test_recompute_command_repairs_drift(self, created):
+        _, app, _, transcript, _ = created
+        ApplicationDocument.objects.create(application=app, doc_type_id=transcript, student_document_id=uuid.uuid4())
+        ApplicationDocument.objects.create(application=app, doc_type_id=transcript, student_document_id=uuid.uuid4())
+        Application.objects.filter(pk=app.pk).update(mandatory_docs_satisfied=0, mandatory_docs_missing=5)
+        other = Application.objects.create(student_id=uuid.uuid4(), program_id=uuid.uuid4(), intake_id=uuid.uuid4())
+
+        call_command("recompute_document_counters", "--batch-size", "1")
+
+        assert counters(app) == (1, 1)
+        assert counters(other) == (0, 0)
+
+    def test_compute_counters_single_query(self, created, django_assert_num_queries):
+        _, app, _, _, _ = created
+        with django_assert_num_queries(1):
+            result = compute_counters([app.id])
+        assert result[str(app.id)] == {"mandatory_docs_satisfied": 0, "mandatory_docs_missing": 2}
@@ -5,7 +5,8 @@ import httpx
 from django.urls import reverse
 from rest_framework import status
 
-from applications.models import Application, ApplicationRequiredDocument, ApplicationsEvent
+from applications.models import Application, ApplicationsEvent
+from applications.services.requirements import required_documents_for_app
 
 
 @pytest.mark.django_db
@@ -74,8 +75,8 @@ class TestCreateApplication:
         app_id = response.data["id"]
         app = Application.objects.get(id=app_id)
         
-        # Verify ApplicationRequiredDocument records were created with merged data
-        required_docs = ApplicationRequiredDocument.objects.filter(application=app)
+        # Verify the snapshot was created with merged data
+        required_docs = required_documents_for_app(app)
         assert required_docs.count() == 3  # Total unique doc types
         
         # Verify specific merged values for doc_type that appeared in both program and student responses
@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+from django.core.management import call_command
+
+from applications.integrations.catalog import get_program_required_documents
+from applications.models import ApplicationDocument, OutboxMessage
+from applications.services.attachments import insert_link, load_slot_states
+from applications.services.document_sync import (
+    DOCUMENT_SYNC_TOPIC, get_document_counts_by_type, get_document_counts_by_type_for_applications,
+    sync_application_document, sync_application_documents,
+)
+from applications.tests.conftest import create_test_application
+from applications.models import ApplicationRequiredDocument
+from documents.models import ApplicationDocument as DocsApplicationDocument
+from documents.models import ProgramDocument
+
+
+@pytest.mark.django_db
+class TestDocumentSync:
+    """Tests for the batched applications -> documents sync"""
+
+    def test_batch_sync_creates_missing_rows_once(self, world, django_assert_max_num_queries):
+        app, program, doc_types, docs = world
+        ProgramDocument.objects.create(program=program, document_type=doc_types[0], is_mandatory=False)
+        triples = [(app.id, doc_type.id, doc.id) for doc_type, doc in zip(doc_types, docs)]
+
+        with django_assert_max_num_queries(12):
+            result = sync_application_documents(triples + [(app.id, doc_types[0].id, uuid.uuid4())])
+
+        assert result == {"synced": 3, "created": 3, "skipped": 1}
+        assert ProgramDocument.objects.filter(program=program).count() == 3
+        # The existing ProgramDocument is reused, not overwritten
+        assert ProgramDocument.objects.get(program=program, document_type=doc_types[0]).is_mandatory is False
+        assert DocsApplicationDocument.objects.filter(is_verified=True).count() == 3
+
+        assert sync_application_documents(triples) == {"synced": 3, "created": 0, "skipped": 0}
+        assert DocsApplicationDocument.objects.count() == 3
+
+    def test_sync_invalidates_cached_program_policy(self, world, settings, django_capture_on_commit_callbacks):
+        settings.APPLICATIONS_INTEGRATION_BACKEND = "applications.integrations.backends.LocalBackend"
+        app, program, doc_types, docs = world
+        assert get_program_required_documents(str(program.id)) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sync_application_documents([(app.id, doc_types[0].id, docs[0].id)])
+
+        assert [item["doc_type_id"] for item in get_program_required_documents(str(program.id))] == [str(doc_types[0].id)]
+
+    def test_single_sync_wrapper(self, world):
+        app, _, doc_types, docs = world
+        assert sync_application_document(app.id, doc_types[0].id, docs[0].id) is True
+        assert sync_application_document(app.id, doc_types[0].id, uuid.uuid4()) is False
+
+    def test_attach_queues_sync_for_the_worker(self, world):
+        app, _, doc_types, docs = world
+        required = ApplicationRequiredDocument.objects.create(
+            application=app, doc_type_id=doc_types[0].id, is_mandatory=True, min_items=1, max_items=1, source="program",
+        )
+        state = load_slot_states(app, [str(doc_types[0].id)])[str(doc_types[0].id)]
+        insert_link(app, required, str(doc_types[0].id), str(docs[0].id), state, str(app.student_id))
+
+        message = OutboxMessage.objects.get(topic=DOCUMENT_SYNC_TOPIC)
+        assert message.payload == {"application_id": str(app.id), "links": [[str(doc_types[0].id), str(docs[0].id)]]}
+        assert not DocsApplicationDocument.objects.exists()
+
+        call_command("run_outbox_worker", "--once")
+
+        assert DocsApplicationDocument.objects.filter(user_document=docs[0]).exists()
+        assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db
+class TestDocumentCounts:
+    """Tests for the grouped per-type document counts"""
+
+    def test_counts_for_many_applications_in_one_query(self, django_assert_num_queries):
+        apps = [create_test_application() for _ in range(3)]
+        transcript, passport = uuid.uuid4(), uuid.uuid4()
+        for slot in (1, 2):
+            ApplicationDocument.objects.create(application=apps[0], doc_type_id=transcript,
+                                               student_document_id=uuid.uuid4(), slot=slot)
+        ApplicationDocument.objects.create(application=apps[0], doc_type_id=passport,
+                                           student_document_id=uuid.uuid4(), slot=1)
+        ApplicationDocument.objects.create(application=apps[1], doc_type_id=passport,
+                                           student_document_id=uuid.uuid4(), slot=1)
+
+        with django_assert_num_queries(1):
+            counts = get_document_counts_by_type_for_applications([a.id for a in apps])
+
+        assert counts == {
+            str(apps[0].id): {str(transcript): 2, str(passport): 1},
+            str(apps[1].id): {str(passport): 1},
+            str(apps[2].id): {},
+        }
+        assert get_document_counts_by_type(apps[0].id) == {str(transcript): 2, str(passport): 1}
+        assert get_document_counts_by_type_for_applications([]) == {}
@@ -0,0 +1,154 @@
+import datetime
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from django.conf import settings as django_settings
+from django.core.signals import request_finished, request_started
+from django.core.wsgi import get_wsgi_application
+from django.db import close_old_connections
+
+from applications.integrations.documents import DocumentsError, InvalidDocumentIdError, get_student_documents
+
+
+def batch_url():
+    return f"{django_settings.DOCUMENTS_BASE_URL}/student-documents/batch/"
+
+
+def echo_found(request):
+    ids = json.loads(request.content)["ids"]
+    return httpx.Response(200, json={"results": [
+        {"id": i, "user_id": "u", "doc_type_id": "t", "status": "clean"} for i in ids
+    ]})
+
+
+class TestStudentDocumentsClient:
+    """Tests for the batched student-document lookup client"""
+
+    @respx.mock
+    def test_single_round_trip_with_not_found_markers(self):
+        found, missing = str(uuid.uuid4()), str(uuid.uuid4())
+        route = respx.post(batch_url()).mock(return_value=httpx.Response(200, json={"results": [
+            {"id": found, "user_id": "u", "doc_type_id": "t", "status": "clean"},
+            {"id": missing, "not_found": True},
+        ]}))
+
+        result = get_student_documents([found, missing, found])
+
+        assert route.call_count == 1
+        assert json.loads(route.calls[0].request.content) == {"ids": [found, missing]}
+        assert result == {found: {"id": found, "user_id": "u", "doc_type_id": "t", "status": "clean"}, missing: None}
+
+    @respx.mock
+    def test_chunks_with_capped_concurrency(self, settings):
+        settings.DOCUMENTS_BATCH_MAX = 2
+        settings.DOCUMENTS_BATCH_CONCURRENCY = 2
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def handler(request):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return echo_found(request)
+
+        route = respx.post(batch_url()).mock(side_effect=handler)
+        ids = [str(uuid.uuid4()) for _ in range(7)]
+
+        result = get_student_documents(ids)
+
+        assert route.call_count == 4
+        assert all(len(json.loads(c.request.content)["ids"]) <= 2 for c in route.calls)
+        assert peak[0] <= 2
+        assert set(result) == set(ids) and all(result.values())
+
+    @respx.mock
+    def test_falls_back_to_single_lookups_without_a_batch_endpoint(self):
+        found, missing = str(uuid.uuid4()), str(uuid.uuid4())
+        respx.post(batch_url()).mock(return_value=httpx.Response(404, text="Not Found"))
+        base = f"{django_settings.DOCUMENTS_BASE_URL}/student-documents"
+        respx.get(f"{base}/{found}/").mock(return_value=httpx.Response(200, json={
+            "id": found, "user_id": "u", "doc_type_id": "t", "status": "clean",
+        }))
+        respx.get(f"{base}/{missing}/").mock(return_value=httpx.Response(404))
+
+        result = get_student_documents([found, missing])
+
+        assert result == {found: {"id": found, "user_id": "u", "doc_type_id": "t", "status": "clean"}, missing: None}
+
+    @respx.mock
+    def test_errors(self):
+        with pytest.raises(InvalidDocumentIdError):
+            get_student_documents(["not-a-uuid"])
+
+        respx.post(batch_url()).mock(return_value=httpx.Response(500, text="boom"))
+        with pytest.raises(DocumentsError):
+            get_student_documents([str(uuid.uuid4())])
+
+
+@pytest.fixture
+def live_documents_endpoint(settings):
+    """Route the Documents client into this project's own WSGI app (no mocked responses)."""
+    settings.APPLICATIONS_INTEGRATION_BACKEND = "applications.integrations.backends.HttpBackend"
+    settings.DOCUMENTS_BASE_URL = "http://localhost/api/applications/documents"
+    client = httpx.Client(transport=httpx.WSGITransport(app=get_wsgi_application()))
+
+    @contextmanager
+    def lease():
+        yield client
+
+    # As Django's test client does: keep the test's connection (and transaction)
+    # open across the in-process requests.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        with patch("applications.integrations.documents._client", side_effect=lease):
+            yield
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+        client.close()
+
+
+@pytest.mark.django_db
+class TestStudentDocumentsClientAgainstEndpoint:
+    """The HTTP backend client against the real batch endpoint"""
+
+    @pytest.fixture
+    def document(self):
+        from accounts.models import User
+        from documents.models import DocumentType, UserDocument
+
+        owner = User.objects.create_user(email="owner@example.com", password="pass1234")
+        doc_type = DocumentType.objects.create(name="Transcript", description="Academic transcript")
+        return UserDocument.objects.create(
+            user=owner, document_type=doc_type,
+            issued_date=datetime.date(2024, 1, 1), expires_date=datetime.date(2030, 1, 1),
+        )
+
+    def test_service_token_authenticates_the_lookup(self, settings, live_documents_endpoint, document):
+        settings.DOCUMENTS_SERVICE_TOKEN = "s3cret"
+        missing = str(uuid.uuid4())
+
+        result = get_student_documents([str(document.id), missing])
+
+        assert result == {
+            str(document.id): {"id": str(document.id), "user_id": str(document.user_id),
+                               "doc_type_id": str(document.document_type_id), "status": "clean"},
+            missing: None,
+        }
+
+    def test_without_service_token_the_endpoint_rejects_the_client(self, settings, live_documents_endpoint):
+        settings.DOCUMENTS_SERVICE_TOKEN = ""
+
+        with pytest.raises(DocumentsError, match="401"):
+            get_student_documents([str(uuid.uuid4())])
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db.models import Value
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import force_authenticate
+
+from applications.models import ApplicationsEvent
+from applications.services import event_stream
+from applications.services.event_stream import encode_position, latest_cursor, pending_messages, stream_events
+from applications.tests.conftest import create_test_application
+from applications.views import ApplicationViewSet
+
+STUDENT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def add_event(app, note, created_at=None, **fields):
+    return ApplicationsEvent.objects.create(
+        application=app, actor_id=STUDENT_ID, event_type="doc_attached",
+        note=note, created_at=created_at or timezone.now(), **fields,
+    )
+
+
+def position(event):
+    return encode_position(event.txid, event.created_at, event.id)
+
+
+def transactions_below(txid):
+    """Pretend every transaction from ``txid`` on may still be running."""
+    return patch.object(event_stream, "_watermark", lambda: Value(txid))
+
+
+def parse(body):
+    return [dict(line.split(": ", 1) for line in block.splitlines()) for block in body.split("\n\n") if block]
+
+
+def messages(body):
+    return [m for m in parse(body) if "data" in m]
+
+
+def notes(body):
+    return [json.loads(m["data"])["note"] for m in messages(body)]
+
+
+async def consume(stream, during=None):
+    """Collect a stream; ``during`` runs (in a thread) once the stream is waiting."""
+    parts = []
+    async for part in stream:
+        part = part.decode() if isinstance(part, bytes) else part
+        parts.append(part)
+        if during is not None and part.startswith("retry: "):
+            await asyncio.sleep(0.02)
+            await sync_to_async(during)()
+            during = None
+    return "".join(parts)
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    """Tests for the Server-Sent Events stream"""
+
+    @pytest.fixture(autouse=True)
+    def short_streams(self, settings):
+        settings.APPLICATIONS_STREAM_MAX_SECONDS = 0
+        settings.APPLICATIONS_STREAM_POLL_INTERVAL = 0.01
+
+    @pytest.fixture
+    def client(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = STUDENT_ID
+        authenticated_api_client.credentials(HTTP_X_ROLE="student")
+        return authenticated_api_client
+
+    @pytest.fixture
+    def app(self):
+        return create_test_application(student_id=STUDENT_ID)
+
+    def get(self, client, **headers):
+        response = client.get(reverse("applications-event-stream"), HTTP_ACCEPT="text/event-stream", **headers)
+        if response.status_code == status.HTTP_200_OK:
+            response.body = b"".join(response.streaming_content).decode()
+        return response
+
+    def test_wsgi_polls_from_the_position_it_sends(self, client, app):
+        old = add_event(app, "old", created_at=timezone.now() - timedelta(minutes=1))
+        response = self.get(client)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        # Nothing is pending yet, but the id-only message sets Last-Event-ID.
+        assert messages(response.body) == []
+        start = parse(response.body)[-1]["id"]
+        assert start == position(old)
+
+        event = add_event(app, "new")
+        add_event(create_test_application(student_id=uuid.uuid4()), "someone else's")
+
+        sent = messages(self.get(client, HTTP_LAST_EVENT_ID=start).body)
+        assert [json.loads(m["data"])["note"] for m in sent] == ["new"]
+        assert sent[0]["id"] == position(event)
+        assert sent[0]["event"] == "application_event"
+        assert json.loads(sent[0]["data"])["application_id"] == str(app.id)
+
+    def test_resume_with_last_event_id(self, client, app):
+        start = timezone.now() - timedelta(minutes=5)
+        events = [add_event(app, f"event {i}", created_at=start + timedelta(seconds=i)) for i in range(3)]
+
+        response = self.get(client, HTTP_LAST_EVENT_ID=position(events[0]))
+
+        assert notes(response.body) == ["event 1", "event 2"]
+
+    def test_event_committed_late_is_not_skipped(self, app):
+        now = timezone.now()
+        # A long transaction (5) stamped its event first but is still running
+        # when a later transaction's event (7) is already visible.
+        early = add_event(app, "early", created_at=now - timedelta(minutes=2), txid=3)
+        add_event(app, "late commit", created_at=now - timedelta(seconds=2), txid=5)
+        add_event(app, "quick", created_at=now, txid=7)
+
+        with transactions_below(5):
+            assert latest_cursor(STUDENT_ID) == position(early)
+            first = pending_messages(STUDENT_ID, position(early))
+        with transactions_below(8):
+            second = pending_messages(STUDENT_ID, parse("".join(first))[-1]["id"])
+
+        assert notes("".join(first)) == []
+        assert notes("".join(second)) == ["late commit", "quick"]
+
+    def test_hold_back_is_bounded(self, app, settings):
+        settings.APPLICATIONS_STREAM_MAX_HOLD_BACK = 30
+        now = timezone.now()
+        # An unrelated transaction (5) has been open for minutes.
+        add_event(app, "waited long enough", created_at=now - timedelta(minutes=1), txid=7)
+        add_event(app, "just written", created_at=now, txid=8)
+
+        with transactions_below(5):
+            body = "".join(pending_messages(STUDENT_ID, None))
+
+        assert notes(body) == ["waited long enough"]
+
+    def test_invalid_last_event_id(self, client, app):
+        response = self.get(client, HTTP_LAST_EVENT_ID="garbage")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, client, mock_current_user_id):
+        mock_current_user_id.return_value = None
+        assert self.get(client).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_asgi_request_gets_a_long_lived_stream(self, authenticated_api_client, mock_current_user_id, app, settings):
+        settings.APPLICATIONS_STREAM_MAX_SECONDS = 0.2
+        mock_current_user_id.return_value = STUDENT_ID
+        request = AsyncRequestFactory().get(reverse("applications-event-stream"), HTTP_ACCEPT="text/event-stream")
+        force_authenticate(request, user=type("User", (), {"pk": 1, "id": 1, "is_authenticated": True})())
+
+        response = ApplicationViewSet.as_view({"get": "event_stream"})(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        body = async_to_sync(consume)(response.streaming_content, during=lambda: add_event(app, "live"))
+        assert notes(body) == ["live"]
+
+    def test_stream_delivers_events_committed_while_waiting(self, app, settings):
+        settings.APPLICATIONS_STREAM_MAX_SECONDS = 0.2
+        add_event(app, "before", created_at=timezone.now() - timedelta(minutes=1))
+
+        body = async_to_sync(consume)(
+            stream_events(STUDENT_ID, latest_cursor(STUDENT_ID)), during=lambda: add_event(app, "during")
+        )
+
+        assert body.startswith("retry: ")
+        assert notes(body) == ["during"]
+
+    def test_stream_rereads_held_back_events(self, app, settings):
+        settings.APPLICATIONS_STREAM_MAX_SECONDS = 0.2
+        settings.APPLICATIONS_STREAM_HEARTBEAT = 10
+        add_event(app, "held back", txid=5)
+        # Transaction 5 ends between the first and the second read.
+        watermarks = iter([5])
+        waits = []
+
+        class NoNotify:
+            """Like the LISTEN waiter, but no NOTIFY ever comes."""
+
+            async def wait(self, timeout):
+                waits.append(timeout)
+                await asyncio.sleep(timeout)
+
+            def close(self):
+                pass
+
+        with patch.object(event_stream, "_watermark", lambda: Value(next(watermarks, 6))), \
+                patch.object(event_stream, "_waiter", lambda student_id: NoNotify()):
+            body = async_to_sync(consume)(stream_events(STUDENT_ID, None))
+
+        assert notes(body) == ["held back"]
+        assert waits[0] == settings.APPLICATIONS_STREAM_POLL_INTERVAL
+
+    def test_keep_alive_while_idle(self, app, settings):
+        settings.APPLICATIONS_STREAM_MAX_SECONDS = 0.05
+        settings.APPLICATIONS_STREAM_HEARTBEAT = 0
+        body = async_to_sync(consume)(stream_events(STUDENT_ID, None))
+        assert body.startswith("retry: ")
+        assert ": keep-alive\n\n" in body
+
+
+class TestSharedListener:
+    """Tests for the per-process LISTEN fan-out"""
+
+    def test_notify_wakes_only_the_students_streams(self):
+        async def no_connection(listener):
+            pass
+
+        async def scenario():
+            listener = event_stream._Listener()
+            with patch.object(event_stream._Listener, "_run", no_connection):
+                mine, also_mine, theirs = (listener.subscribe(s) for s in ("a", "a", "b"))
+                listener.dispatch("a")
+                woken = [mine.is_set(), also_mine.is_set(), theirs.is_set()]
+
+                listener.unsubscribe("a", mine)
+                listener.unsubscribe("a", also_mine)
+                listener.unsubscribe("b", theirs)
+                await listener.task
+            return woken, dict(listener.subscribers)
+
+        woken, left = asyncio.run(scenario())
+        assert woken == [True, True, False]
+        assert left == {}
+
+    def test_one_listener_per_event_loop(self):
+        async def same_loop():
+            return event_stream._listener() is event_stream._listener()
+
+        assert asyncio.run(same_loop())
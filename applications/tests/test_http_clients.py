@@ -0,0 +1,57 @@
+import httpx
+import respx
+
+from applications.integrations.http import ClientRegistry, registry
+from applications.integrations.catalog import get_program_required_documents
+
+
+class TestClientRegistry:
+    """Tests for the pooled upstream HTTP client registry"""
+
+    def test_client_is_shared_and_survives_lease(self):
+        """The same client is reused across leases and stays open afterwards"""
+        reg = ClientRegistry()
+        with reg.lease("catalog") as first:
+            pass
+        with reg.lease("catalog") as second:
+            pass
+
+        assert first is second
+        assert not first.is_closed
+        reg.close_all()
+        assert first.is_closed
+
+    def test_clients_are_rebuilt_after_fork(self):
+        """A registry inherited by a child process never reuses the parent's pool"""
+        reg = ClientRegistry()
+        parent_client = reg.get("documents")
+        reg._pid = -1  # simulate running in a forked child
+
+        assert reg.get("documents") is not parent_client
+        parent_client.close()
+        reg.close_all()
+
+    def test_stats_report_in_flight_requests(self):
+        """Pool stats expose in-flight and peak usage per upstream"""
+        reg = ClientRegistry()
+        with reg.lease("catalog"):
+            with reg.lease("catalog"):
+                in_use = reg.stats()["catalog"]
+
+        stats = reg.stats()["catalog"]
+        assert in_use["in_flight"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["peak_in_flight"] == 2
+        assert 0 < in_use["saturation"] <= 1
+        reg.close_all()
+
+    @respx.mock
+    def test_integration_calls_use_shared_client(self):
+        """Catalog calls go through the pooled client and do not close it"""
+        program_id = "11111111-1111-1111-1111-111111111111"
+        respx.get(f"http://127.0.0.1:8000/api/catalog/programs/{program_id}/required-documents").mock(
+            return_value=httpx.Response(200, json=[])
+        )
+
+        assert get_program_required_documents(program_id) == []
+        assert not registry.get("catalog").is_closed
@@ -0,0 +1,116 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from applications import idempotency
+from applications.integrations.catalog import CatalogError
+from applications.models import Application, IdempotencyRecord
+
+
+@pytest.mark.django_db
+class TestIdempotencyKey:
+    """Tests for Idempotency-Key handling on application create"""
+
+    @pytest.fixture
+    def client(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        return authenticated_api_client
+
+    @pytest.fixture
+    def catalog(self):
+        with patch("applications.views.get_program_required_documents") as program, \
+             patch("applications.views.resolve_student_required_documents") as student:
+            program.return_value = [
+                {"doc_type_id": str(uuid.uuid4()), "is_mandatory": True, "min_items": 1, "max_items": 1}
+            ]
+            student.return_value = []
+            yield program
+
+    @pytest.fixture
+    def body(self):
+        return {"program_id": str(uuid.uuid4()), "intake_id": str(uuid.uuid4())}
+
+    def create(self, client, body, key="key-1"):
+        return client.post(reverse("applications-list"), body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self, client, catalog, body):
+        first = self.create(client, body)
+        retry = self.create(client, body)
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.data["id"] == str(first.data["id"])
+        assert retry["Idempotent-Replayed"] == "true"
+        assert Application.objects.count() == 1
+        assert catalog.call_count == 1
+
+    def test_requests_without_key_are_not_deduplicated(self, client, catalog, body):
+        client.post(reverse("applications-list"), body, format="json")
+        client.post(reverse("applications-list"), body, format="json")
+
+        assert Application.objects.count() == 2
+        assert not IdempotencyRecord.objects.exists()
+
+    def test_key_reused_for_different_request(self, client, catalog, body):
+        self.create(client, body)
+        response = self.create(client, {**body, "intake_id": str(uuid.uuid4())})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert Application.objects.count() == 1
+
+    def test_server_error_releases_key(self, client, catalog, body):
+        catalog.side_effect = CatalogError("down")
+        assert self.create(client, body).status_code == status.HTTP_502_BAD_GATEWAY
+        assert not IdempotencyRecord.objects.exists()
+
+        catalog.side_effect = None
+        assert self.create(client, body).status_code == status.HTTP_201_CREATED
+
+    def test_in_flight_duplicate_waits_for_first(self, client, catalog, body, monkeypatch):
+        first = self.create(client, body)
+        record = IdempotencyRecord.objects.get()
+        stored = (record.status_code, record.response_body)
+        IdempotencyRecord.objects.update(state=IdempotencyRecord.IN_PROGRESS, status_code=None, response_body=None)
+
+        def first_request_finishes(seconds):
+            IdempotencyRecord.objects.update(state=IdempotencyRecord.COMPLETED,
+                                             status_code=stored[0], response_body=stored[1])
+        monkeypatch.setattr(idempotency.time, "sleep", first_request_finishes)
+
+        response = self.create(client, body)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["id"] == str(first.data["id"])
+        assert catalog.call_count == 1
+
+    def test_in_flight_duplicate_times_out(self, client, catalog, body, settings):
+        settings.IDEMPOTENCY_WAIT_TIMEOUT = 0
+        self.create(client, body)
+        IdempotencyRecord.objects.update(state=IdempotencyRecord.IN_PROGRESS)
+
+        assert self.create(client, body).status_code == status.HTTP_409_CONFLICT
+
+    def test_abandoned_and_expired_keys_are_reclaimed(self, client, catalog, body):
+        self.create(client, body)
+        IdempotencyRecord.objects.update(state=IdempotencyRecord.IN_PROGRESS,
+                                         locked_until=timezone.now() - timedelta(seconds=1))
+        assert self.create(client, body).status_code == status.HTTP_201_CREATED
+        assert Application.objects.count() == 2
+
+        IdempotencyRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        assert self.create(client, body).status_code == status.HTTP_201_CREATED
+        assert Application.objects.count() == 3
+
+    def test_purge_command(self, client, catalog, body):
+        self.create(client, body, key="old")
+        self.create(client, body, key="new")
+        IdempotencyRecord.objects.filter(key="old").update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command("purge_idempotency_records")
+
+        assert list(IdempotencyRecord.objects.values_list("key", flat=True)) == ["new"]
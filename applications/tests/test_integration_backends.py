@@ -0,0 +1,98 @@
+import uuid
+import datetime
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from applications.integrations.backends import LocalBackend, get_backend
+from applications.integrations.catalog import CatalogNotFound, get_program_required_documents
+from applications.integrations.documents import (
+    InvalidDocumentIdError, StudentDocumentNotFound, get_student_document,
+)
+from applications.models import Application
+from applications.services.requirements import required_documents_for_app
+
+LOCAL_BACKEND = "applications.integrations.backends.LocalBackend"
+
+
+@pytest.fixture
+def program_with_documents():
+    from catalog.models import Institution, Program
+    from documents.models import DocumentType, ProgramDocument
+
+    inst = Institution.objects.create(official_name="Test University", type="University", country="Testland")
+    program = Program.objects.create(institution=inst, name="Test Program", duration=12, language="English")
+    transcript = DocumentType.objects.create(name="Transcript", description="Academic transcript")
+    essay = DocumentType.objects.create(name="Essay", description="Motivation essay")
+    retired = DocumentType.objects.create(name="Retired", description="No longer used", is_active=False)
+    ProgramDocument.objects.create(program=program, document_type=transcript, is_mandatory=True)
+    ProgramDocument.objects.create(program=program, document_type=essay, is_mandatory=False)
+    ProgramDocument.objects.create(program=program, document_type=retired, is_mandatory=True)
+    return program, transcript, essay
+
+
+@pytest.mark.django_db
+class TestLocalBackend:
+    """Tests for the in-process (ORM) integration backend"""
+
+    @pytest.fixture(autouse=True)
+    def use_local_backend(self, settings):
+        settings.APPLICATIONS_INTEGRATION_BACKEND = LOCAL_BACKEND
+
+    def test_backend_is_selected_by_setting(self):
+        assert isinstance(get_backend(), LocalBackend)
+
+    def test_program_required_documents(self, program_with_documents):
+        program, transcript, essay = program_with_documents
+
+        docs = {d["doc_type_id"]: d for d in get_program_required_documents(str(program.id))}
+
+        assert set(docs) == {str(transcript.id), str(essay.id)}
+        assert docs[str(transcript.id)] == {
+            "doc_type_id": str(transcript.id), "is_mandatory": True, "min_items": 1, "max_items": 1,
+        }
+        assert docs[str(essay.id)]["is_mandatory"] is False
+
+    def test_unknown_program_raises_not_found(self):
+        with pytest.raises(CatalogNotFound):
+            get_program_required_documents(str(uuid.uuid4()))
+
+    def test_student_document(self, program_with_documents):
+        from accounts.models import User
+        from documents.models import UserDocument
+
+        _, transcript, _ = program_with_documents
+        user = User.objects.create_user(email="student@example.com", password="pass1234")
+        doc = UserDocument.objects.create(
+            user=user,
+            document_type=transcript,
+            issued_date=datetime.date(2024, 1, 1),
+            expires_date=datetime.date(2030, 1, 1),
+        )
+
+        assert get_student_document(str(doc.id)) == {
+            "id": str(doc.id),
+            "user_id": str(user.id),
+            "doc_type_id": str(transcript.id),
+            "status": "clean",
+        }
+
+    def test_student_document_errors(self):
+        with pytest.raises(InvalidDocumentIdError):
+            get_student_document("not-a-uuid")
+        with pytest.raises(StudentDocumentNotFound):
+            get_student_document(str(uuid.uuid4()))
+
+    def test_create_application_snapshots_from_orm(self, program_with_documents, authenticated_api_client,
+                                                   mock_current_user_id):
+        program, _, _ = program_with_documents
+
+        response = authenticated_api_client.post(
+            reverse("applications-list"),
+            {"program_id": str(program.id), "intake_id": str(uuid.uuid4())},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        app = Application.objects.get(id=response.data["id"])
+        assert required_documents_for_app(app).count() == 2
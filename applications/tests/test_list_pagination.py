@@ -0,0 +1,84 @@
+import uuid
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from applications.models import Application, Status
+
+
+def next_cursor(response):
+    link = response.get("Link")
+    if not link:
+        return None
+    url = link[link.index("<") + 1:link.index(">")]
+    return parse_qs(urlparse(url).query)["cursor"][0]
+
+
+@pytest.fixture
+def student(mock_current_user_id):
+    student_id = uuid.uuid4()
+    mock_current_user_id.return_value = str(student_id)
+    return student_id
+
+
+@pytest.mark.django_db
+class TestApplicationListPagination:
+    """Tests for keyset pagination and filters on the application list"""
+
+    def test_pages_cover_all_rows_once(self, authenticated_api_client, student):
+        now = timezone.now()
+        # Two rows share a timestamp so the id tie-breaker is exercised.
+        created = [now - timedelta(minutes=i // 2) for i in range(7)]
+        apps = [
+            Application.objects.create(student_id=student, program_id=uuid.uuid4(),
+                                       intake_id=uuid.uuid4(), created_at=ts)
+            for ts in created
+        ]
+
+        url = reverse("applications-list")
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = authenticated_api_client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data) <= 3
+            seen.extend(row["id"] for row in response.data)
+            cursor = next_cursor(response)
+            if cursor is None:
+                break
+
+        expected = sorted(apps, key=lambda a: (a.created_at, a.id), reverse=True)
+        assert seen == [str(a.id) for a in expected]
+
+    def test_filters(self, authenticated_api_client, student):
+        program_id, intake_id = uuid.uuid4(), uuid.uuid4()
+        match = Application.objects.create(student_id=student, program_id=program_id,
+                                           intake_id=intake_id, status=Status.SUBMITTED)
+        Application.objects.create(student_id=student, program_id=program_id,
+                                   intake_id=intake_id, status=Status.DRAFT)
+        Application.objects.create(student_id=student, program_id=uuid.uuid4(),
+                                   intake_id=intake_id, status=Status.SUBMITTED)
+
+        response = authenticated_api_client.get(reverse("applications-list"), {
+            "status": Status.SUBMITTED, "program_id": str(program_id), "intake_id": str(intake_id),
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{"id": str(match.id), "status": Status.SUBMITTED}]
+        assert "Link" not in response
+
+    @pytest.mark.parametrize("params", [
+        {"cursor": "garbage"},
+        {"status": "Nope"},
+        {"program_id": "not-a-uuid"},
+        {"limit": "abc"},
+    ])
+    def test_invalid_params(self, authenticated_api_client, student, params):
+        response = authenticated_api_client.get(reverse("applications-list"), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
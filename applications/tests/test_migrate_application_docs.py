@@ -0,0 +1,99 @@
+import json
+import pickle
+import uuid
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from applications.management.commands.migrate_application_docs import Command
+from applications.models import ApplicationDocument
+from documents.models import ApplicationDocument as DocsApplicationDocument
+
+
+@pytest.fixture
+def links(world):
+    app, _, doc_types, docs = world
+    rows = [
+        ApplicationDocument.objects.create(application=app, doc_type_id=doc_type.id, student_document_id=doc.id, slot=1)
+        for doc_type, doc in zip(doc_types, docs)
+    ]
+    # A link whose student document no longer exists
+    rows.append(ApplicationDocument.objects.create(
+        application=app, doc_type_id=doc_types[0].id, student_document_id=uuid.uuid4(), slot=2,
+    ))
+    return sorted(rows, key=lambda row: str(row.pk))
+
+
+@pytest.mark.django_db
+class TestMigrateApplicationDocs:
+    """Tests for the chunked, resumable application document migration"""
+
+    def test_migrates_in_chunks_and_checkpoints(self, links, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+
+        call_command("migrate_application_docs", "--chunk-size", "2", "--checkpoint", str(checkpoint))
+
+        assert DocsApplicationDocument.objects.count() == 3
+        assert json.loads(checkpoint.read_text()) == {
+            "last_pk": str(links[-1].pk), "synced": 3, "created": 3, "skipped": 1,
+        }
+
+    def test_resumes_after_checkpoint(self, links, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"last_pk": str(links[1].pk), "synced": 0, "created": 0, "skipped": 0}))
+
+        call_command("migrate_application_docs", "--checkpoint", str(checkpoint))
+
+        state = json.loads(checkpoint.read_text())
+        assert state["synced"] + state["skipped"] == 2
+        assert state["last_pk"] == str(links[-1].pk)
+
+        call_command("migrate_application_docs", "--checkpoint", str(checkpoint), "--restart")
+        assert DocsApplicationDocument.objects.count() == 3
+
+    def test_parallel_workers_checkpoint_in_chunk_order(self, links, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        pools = []
+
+        class InlinePool:
+            """Runs each group of max_workers chunks in this process, the later ones first."""
+
+            def __init__(self, max_workers, mp_context, initializer):
+                self.max_workers = max_workers
+                self.mp_context = mp_context
+                self.submitted = []
+                pools.append(self)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, triples):
+                # Arguments cross a process boundary in the real pool.
+                pickle.dumps((fn, triples))
+                future = Future()
+                self.submitted.append((future, fn, triples))
+                if len(self.submitted) == self.max_workers:
+                    # Finish the later chunk first.
+                    for pending, chunk_fn, chunk in reversed(self.submitted):
+                        pending.set_result(chunk_fn(chunk))
+                    self.submitted = []
+                return future
+
+        command = "applications.management.commands.migrate_application_docs"
+        with patch(f"{command}.ProcessPoolExecutor", InlinePool), \
+                patch(f"{command}.Command.advance", autospec=True, side_effect=Command.advance) as advance:
+            call_command("migrate_application_docs", "--chunk-size", "1", "--workers", "2",
+                         "--checkpoint", str(checkpoint))
+
+        assert pools[0].max_workers == 2
+        assert pools[0].mp_context.get_start_method() == "spawn"
+        assert [c.args[2] for c in advance.call_args_list] == [str(link.pk) for link in links]
+        assert DocsApplicationDocument.objects.count() == 3
+        assert json.loads(checkpoint.read_text()) == {
+            "last_pk": str(links[-1].pk), "synced": 3, "created": 3, "skipped": 1,
+        }
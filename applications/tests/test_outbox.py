@@ -0,0 +1,101 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from applications import outbox
+from applications.models import OutboxMessage, Status
+from applications.services.transitions import apply_bulk_transition, apply_transition
+from applications.tests.conftest import create_test_application
+
+delivered = []
+
+
+def record(message):
+    delivered.append(message.payload)
+
+
+def explode(message):
+    raise RuntimeError("downstream unavailable")
+
+
+@pytest.fixture
+def handlers(settings):
+    delivered.clear()
+    settings.OUTBOX_HANDLERS = {"application.status_changed": "applications.tests.test_outbox.record"}
+    return settings
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    """Tests for the transactional outbox and its worker"""
+
+    def test_topics_without_handler_are_not_written(self):
+        app = create_test_application(status=Status.DRAFT)
+        apply_transition(app, "submit", uuid.uuid4())
+        assert not OutboxMessage.objects.exists()
+
+    def test_transition_writes_message_in_same_transaction(self, handlers):
+        app = create_test_application(status=Status.DRAFT)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                apply_transition(app, "submit", uuid.uuid4())
+                raise RuntimeError("rolled back")
+        assert not OutboxMessage.objects.exists()
+
+        app.status = Status.DRAFT
+        apply_transition(app, "submit", uuid.uuid4())
+        message = OutboxMessage.objects.get()
+        assert message.topic == "application.status_changed"
+        assert message.payload["application_id"] == str(app.id)
+        assert message.payload["student_id"] == str(app.student_id)
+        assert message.payload["to_status"] == Status.SUBMITTED
+
+    def test_bulk_transition_writes_one_message_per_event(self, handlers):
+        apps = [create_test_application(status=Status.UNDER_REVIEW) for _ in range(3)]
+        apply_bulk_transition([a.id for a in apps], "reject", uuid.uuid4())
+        assert sorted(m.payload["application_id"] for m in OutboxMessage.objects.all()) == sorted(str(a.id) for a in apps)
+
+    def test_worker_delivers_and_deletes(self, handlers):
+        app = create_test_application(status=Status.DRAFT)
+        apply_transition(app, "submit", uuid.uuid4())
+
+        call_command("run_outbox_worker", "--once")
+
+        assert [p["application_id"] for p in delivered] == [str(app.id)]
+        assert not OutboxMessage.objects.exists()
+
+    def test_failure_backs_off_then_fails_permanently(self, handlers):
+        handlers.OUTBOX_HANDLERS = {"application.status_changed": "applications.tests.test_outbox.explode"}
+        handlers.OUTBOX_MAX_ATTEMPTS = 2
+        app = create_test_application(status=Status.DRAFT)
+        apply_transition(app, "submit", uuid.uuid4())
+
+        assert outbox.process_batch() == (0, 1)
+        message = OutboxMessage.objects.get()
+        assert message.state == OutboxMessage.PENDING and message.attempts == 1
+        assert message.available_at > timezone.now()
+        assert "downstream unavailable" in message.last_error
+        assert outbox.process_batch() == (0, 0)  # not due yet
+
+        OutboxMessage.objects.update(available_at=timezone.now())
+        assert outbox.process_batch() == (0, 1)
+        message.refresh_from_db()
+        assert message.state == OutboxMessage.FAILED and message.attempts == 2
+
+    def test_claimed_messages_are_leased(self, handlers):
+        outbox.enqueue("application.status_changed", {"n": 1})
+        claimed = outbox.claim_batch(10)
+        assert len(claimed) == 1
+        assert outbox.claim_batch(10) == []
+
+        # A lease that ran out is claimed again (the first worker crashed).
+        OutboxMessage.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+        again = outbox.claim_batch(10)
+        assert len(again) == 1
+        # The first worker can no longer settle the message.
+        assert outbox.deliver(claimed[0]) is True
+        assert OutboxMessage.objects.filter(pk=again[0].pk).exists()
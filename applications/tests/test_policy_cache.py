@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import patch
+
+from applications.integrations.cache import PolicyCache
+from applications.integrations.catalog import get_program_required_documents
+
+
+def run_inline(refresh):
+    refresh()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("applications.integrations.cache.time.monotonic", fake)
+    return fake
+
+
+class TestPolicyCache:
+    """Tests for the TTL / LRU / stale-while-revalidate policy cache"""
+
+    def test_fresh_entries_are_served_from_cache(self, clock):
+        cache = PolicyCache(max_size=10, ttl=60)
+        calls = []
+        loader = lambda: calls.append(1) or [{"doc_type_id": "a"}]
+
+        assert cache.get_or_load("p1", loader) == [{"doc_type_id": "a"}]
+        assert cache.get_or_load("p1", loader) == [{"doc_type_id": "a"}]
+        assert len(calls) == 1
+
+    def test_stale_entry_is_served_while_refreshing(self, clock):
+        cache = PolicyCache(max_size=10, ttl=60, stale_ttl=30, refresher=run_inline)
+        values = iter([[{"v": 1}], [{"v": 2}]])
+        loader = lambda: next(values)
+
+        cache.get_or_load("p1", loader)
+        clock.now += 70  # past ttl, inside the stale window
+        assert cache.get_or_load("p1", loader) == [{"v": 1}]
+        # The background refresh has stored the new value
+        assert cache.get_or_load("p1", loader) == [{"v": 2}]
+
+    def test_expired_entry_is_reloaded_synchronously(self, clock):
+        cache = PolicyCache(max_size=10, ttl=60, stale_ttl=30)
+        values = iter([[{"v": 1}], [{"v": 2}]])
+        loader = lambda: next(values)
+
+        cache.get_or_load("p1", loader)
+        clock.now += 100
+        assert cache.get_or_load("p1", loader) == [{"v": 2}]
+
+    def test_lru_eviction(self, clock):
+        cache = PolicyCache(max_size=2, ttl=60)
+        cache.get_or_load("a", lambda: [])
+        cache.get_or_load("b", lambda: [])
+        cache.get_or_load("a", lambda: [])  # "a" becomes most recently used
+        cache.get_or_load("c", lambda: [])
+
+        assert len(cache) == 2
+        calls = []
+        cache.get_or_load("b", lambda: calls.append(1) or [])
+        assert calls == [1]
+
+    def test_invalidation_discards_in_flight_load(self, clock):
+        cache = PolicyCache(max_size=10, ttl=60)
+
+        def loader():
+            cache.invalidate("p1")  # rows changed while the load was running
+            return [{"v": "old"}]
+
+        cache.get_or_load("p1", loader)
+        assert len(cache) == 0
+
+    def test_errors_are_not_cached(self, clock):
+        cache = PolicyCache(max_size=10, ttl=60)
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("p1", failing)
+        assert cache.get_or_load("p1", lambda: [{"v": 1}]) == [{"v": 1}]
+
+
+@pytest.mark.django_db
+def test_program_document_change_invalidates_cached_policy(django_capture_on_commit_callbacks):
+    from catalog.models import Institution, Program
+    from documents.models import DocumentType, ProgramDocument
+
+    inst = Institution.objects.create(official_name="Test University", type="University", country="Testland")
+    program = Program.objects.create(institution=inst, name="Test Program", duration=12, language="English")
+    doc_type = DocumentType.objects.create(name="Transcript", description="Academic transcript")
+
+    with patch("applications.integrations.catalog._fetch_program_required_documents", return_value=[]) as fetch:
+        get_program_required_documents(str(program.id))
+        get_program_required_documents(str(program.id))
+        assert fetch.call_count == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProgramDocument.objects.create(program=program, document_type=doc_type)
+
+        get_program_required_documents(str(program.id))
+        assert fetch.call_count == 2
@@ -0,0 +1,82 @@
+import uuid
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from applications.models import ApplicationDocument, ApplicationRequiredDocument, Status
+from applications.services.readiness import get_missing_documents
+from applications.tests.conftest import create_test_application
+
+
+def require(app, doc_type_id, min_items=1, is_mandatory=True):
+    return ApplicationRequiredDocument.objects.create(
+        application=app, doc_type_id=doc_type_id, is_mandatory=is_mandatory,
+        min_items=min_items, max_items=max(min_items, 1), source="program",
+    )
+
+
+def attach(app, doc_type_id):
+    return ApplicationDocument.objects.create(
+        application=app, doc_type_id=doc_type_id, student_document_id=uuid.uuid4()
+    )
+
+
+@pytest.mark.django_db
+class TestSubmissionReadiness:
+    """Tests for the aggregated missing-documents check"""
+
+    def test_missing_documents_single_query(self, django_assert_num_queries):
+        app = create_test_application()
+        complete, partial, empty, optional = (uuid.uuid4() for _ in range(4))
+        require(app, complete)
+        require(app, partial, min_items=2)
+        require(app, empty)
+        require(app, optional, is_mandatory=False)
+        attach(app, complete)
+        attach(app, partial)
+
+        with django_assert_num_queries(1):
+            missing = get_missing_documents(app.id)
+
+        assert sorted(missing, key=lambda m: m["doc_type_id"]) == sorted([
+            {"doc_type_id": str(partial), "required": 2, "attached": 1},
+            {"doc_type_id": str(empty), "required": 1, "attached": 0},
+        ], key=lambda m: m["doc_type_id"])
+
+    def test_other_applications_are_not_counted(self):
+        app = create_test_application()
+        other = create_test_application()
+        doc_type_id = uuid.uuid4()
+        require(app, doc_type_id)
+        attach(other, doc_type_id)
+
+        assert [m["doc_type_id"] for m in get_missing_documents(app.id)] == [str(doc_type_id)]
+
+    def test_readiness_endpoint(self, authenticated_api_client, mock_current_user_id):
+        student_id = str(uuid.uuid4())
+        mock_current_user_id.return_value = student_id
+        app = create_test_application(student_id=student_id, status=Status.DRAFT)
+        doc_type_id = uuid.uuid4()
+        require(app, doc_type_id)
+
+        url = reverse('applications-readiness', kwargs={'pk': str(app.id)})
+        authenticated_api_client.credentials(HTTP_X_ROLE='student')
+
+        response = authenticated_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["ready"] is False
+        assert response.data["missing_documents"][0]["doc_type_id"] == str(doc_type_id)
+
+        attach(app, doc_type_id)
+        response = authenticated_api_client.get(url)
+        assert response.data["ready"] is True
+        assert response.data["missing_documents"] == []
+
+    def test_readiness_endpoint_forbidden_for_other_student(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        app = create_test_application()
+
+        url = reverse('applications-readiness', kwargs={'pk': str(app.id)})
+        authenticated_api_client.credentials(HTTP_X_ROLE='student')
+        response = authenticated_api_client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
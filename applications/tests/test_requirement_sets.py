@@ -0,0 +1,111 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from applications.models import Application, ApplicationDocument, ApplicationRequiredDocument, RequirementSet
+from applications.services.completeness import compute_counters
+from applications.services.readiness import get_missing_documents
+from applications.services.requirements import (
+    get_or_create_requirement_set, get_or_create_requirement_sets, get_required_document, required_documents, required_documents_for_app,
+    requirement_digest,
+)
+from applications.tests.conftest import create_test_application
+
+
+def merged(*doc_type_ids, min_items=1):
+    return [
+        {"doc_type_id": str(doc_type_id), "is_mandatory": True, "min_items": min_items, "max_items": 2, "source": "program"}
+        for doc_type_id in doc_type_ids
+    ]
+
+
+@pytest.mark.django_db
+class TestRequirementSets:
+    """Tests for shared, content-addressed requirement snapshots"""
+
+    def test_equal_requirements_share_one_set(self, django_assert_num_queries):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        first = get_or_create_requirement_set(merged(a, b))
+        assert first.item_count == 2
+
+        with django_assert_num_queries(1):
+            again = get_or_create_requirement_set(list(reversed(merged(a, b))))
+        assert again.pk == first.pk
+        assert get_or_create_requirement_set(merged(a, b, min_items=2)).pk != first.pk
+        assert requirement_digest([]) != requirement_digest(merged(a))
+
+    def test_digest_is_unique(self):
+        digest = requirement_digest(merged(uuid.uuid4()))
+        RequirementSet.objects.create(digest=digest, item_count=1)
+
+        with pytest.raises(IntegrityError):
+            RequirementSet.objects.create(digest=digest, item_count=1)
+
+    def test_concurrent_insert_of_some_digests_creates_the_rest(self):
+        theirs, ours = merged(uuid.uuid4()), merged(uuid.uuid4(), uuid.uuid4())
+        bulk_create, lookup = RequirementSet.objects.bulk_create, RequirementSet.objects.filter
+        inserted = []
+
+        def racing_lookup(*args, **kwargs):
+            found = list(lookup(*args, **kwargs))
+            if not inserted:
+                # Another request commits one of our digests right after our lookup.
+                inserted.append(RequirementSet.objects.create(digest=requirement_digest(theirs), item_count=1))
+            return found
+
+        with patch.object(RequirementSet.objects, "filter", side_effect=racing_lookup), \
+                patch.object(RequirementSet.objects, "bulk_create", side_effect=bulk_create) as create:
+            sets = get_or_create_requirement_sets([theirs, ours])
+
+        assert [len(call.args[0]) for call in create.call_args_list] == [2, 1]
+        assert sets[requirement_digest(theirs)].pk == inserted[0].pk
+        assert sets[requirement_digest(ours)].items.count() == 2
+
+    def test_readers_serve_both_storage_kinds(self):
+        doc_type = uuid.uuid4()
+        shared = create_test_application()
+        shared.requirement_set = get_or_create_requirement_set(merged(doc_type))
+        shared.save(update_fields=["requirement_set"])
+        legacy = create_test_application()
+        ApplicationRequiredDocument.objects.create(application=legacy, doc_type_id=doc_type, is_mandatory=True,
+                                                   min_items=1, max_items=1, source="program")
+        ApplicationDocument.objects.create(application=legacy, doc_type_id=doc_type,
+                                           student_document_id=uuid.uuid4(), slot=1)
+
+        assert get_required_document(shared, doc_type).max_items == 2
+        assert get_required_document(legacy, doc_type).max_items == 1
+        assert [str(r.doc_type_id) for r in required_documents_for_app(shared)] == [str(doc_type)]
+
+        rows = required_documents([shared.id, legacy.id, uuid.uuid4()])
+        assert [r.max_items for r in rows[str(shared.id)]] == [2]
+        assert [r.max_items for r in rows[str(legacy.id)]] == [1]
+
+        assert [m["doc_type_id"] for m in get_missing_documents(shared.id)] == [str(doc_type)]
+        assert get_missing_documents(legacy.id) == []
+        counters = compute_counters([shared.id, legacy.id])
+        assert counters[str(shared.id)] == {"mandatory_docs_satisfied": 0, "mandatory_docs_missing": 1}
+        assert counters[str(legacy.id)] == {"mandatory_docs_satisfied": 1, "mandatory_docs_missing": 0}
+
+    def test_migrate_command_links_and_deletes_legacy_rows(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        apps = [create_test_application() for _ in range(3)]
+        for app in apps[:2]:
+            for doc_type in (a, b):
+                ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type, is_mandatory=True,
+                                                           min_items=1, max_items=2, source="program")
+        ApplicationRequiredDocument.objects.create(application=apps[2], doc_type_id=a, is_mandatory=False,
+                                                   min_items=1, max_items=1, source="student")
+        before = {app.pk: sorted((str(r.doc_type_id), r.max_items) for r in required_documents_for_app(app))
+                  for app in apps}
+
+        call_command("migrate_requirement_sets", "--batch-size", "2")
+
+        apps = list(Application.objects.filter(pk__in=[app.pk for app in apps]))
+        assert all(app.requirement_set_id for app in apps)
+        assert RequirementSet.objects.count() == 2
+        assert not ApplicationRequiredDocument.objects.exists()
+        assert {app.pk: sorted((str(r.doc_type_id), r.max_items) for r in required_documents_for_app(app))
+                for app in apps} == before
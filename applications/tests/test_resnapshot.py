@@ -0,0 +1,123 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from applications.integrations.catalog import CatalogError
+from applications.models import Application, ApplicationRequiredDocument, ApplicationsEvent, Status
+from applications.services import resnapshot
+from applications.services.requirements import get_or_create_requirement_set, required_documents_for_app
+from applications.tests.conftest import create_test_application
+
+
+def req(doc_type_id, **overrides):
+    return {"doc_type_id": str(doc_type_id), "is_mandatory": True, "min_items": 1, "max_items": 1,
+            "source": "program", **overrides}
+
+
+@pytest.fixture
+def program():
+    return {"id": uuid.uuid4(), "passport": uuid.uuid4(), "transcript": uuid.uuid4(), "essay": uuid.uuid4()}
+
+
+def run(program, program_reqs, student_rules, **kwargs):
+    with patch.object(resnapshot, "get_program_required_documents", return_value=program_reqs) as get_program, \
+            patch.object(resnapshot, "resolve_student_required_documents", side_effect=student_rules) as get_student, \
+            patch.object(resnapshot, "merge_required_docs", wraps=resnapshot.merge_required_docs) as merge:
+        counts = resnapshot.resnapshot_drafts(program["id"], **kwargs)
+    return counts, get_program, get_student, merge
+
+
+@pytest.mark.django_db
+class TestResnapshotDrafts:
+    """Tests for re-snapshotting Draft applications after a Catalog change"""
+
+    def test_changed_drafts_are_resnapshotted_in_bulk(self, program):
+        old = [req(program["passport"])]
+        new = [req(program["passport"], max_items=2), req(program["transcript"])]
+        legacy = create_test_application(program_id=program["id"])
+        ApplicationRequiredDocument.objects.create(application=legacy, **req(program["passport"]))
+        shared = [create_test_application(program_id=program["id"]) for _ in range(3)]
+        Application.objects.filter(pk__in=[app.pk for app in shared]).update(
+            requirement_set=get_or_create_requirement_set(old)
+        )
+        current = create_test_application(program_id=program["id"])
+        current.requirement_set = get_or_create_requirement_set(new)
+        current.save(update_fields=["requirement_set"])
+        submitted = create_test_application(program_id=program["id"], status=Status.SUBMITTED)
+        submitted.requirement_set = get_or_create_requirement_set(old)
+        submitted.save(update_fields=["requirement_set"])
+        create_test_application()
+
+        counts, get_program, get_student, merge = run(program, new, lambda student_id: [], chunk_size=2)
+
+        assert counts == {"checked": 5, "changed": 4, "skipped": 0}
+        get_program.assert_called_once_with(str(program["id"]))
+        assert get_student.call_count == 5
+        # Every student has the same (empty) rules, so the merge runs once.
+        assert merge.call_count == 1
+
+        new_set = get_or_create_requirement_set(new)
+        changed = [legacy, *shared]
+        assert set(Application.objects.filter(pk__in=[a.pk for a in changed]).values_list("requirement_set", flat=True)) \
+            == {new_set.pk}
+        assert not ApplicationRequiredDocument.objects.exists()
+        assert sorted(str(r.doc_type_id) for r in required_documents_for_app(Application.objects.get(pk=legacy.pk))) \
+            == sorted([str(program["passport"]), str(program["transcript"])])
+        submitted.refresh_from_db()
+        assert submitted.requirement_set_id == get_or_create_requirement_set(old).pk
+
+        events = ApplicationsEvent.objects.filter(event_type="requirements_updated")
+        assert sorted(e.application_id for e in events) == sorted(a.pk for a in changed)
+        assert events.first().note == (
+            f"Required documents re-snapshotted: added {program['transcript']}; changed {program['passport']}."
+        )
+        for app in Application.objects.filter(pk__in=[a.pk for a in changed]):
+            assert (app.mandatory_docs_satisfied, app.mandatory_docs_missing) == (0, 2)
+
+    def test_merges_once_per_distinct_student_rules(self, program):
+        essay = [req(program["essay"], source="student", is_mandatory=False)]
+        students = [uuid.uuid4() for _ in range(4)]
+        for student_id in students:
+            create_test_application(student_id=student_id, program_id=program["id"])
+        rules = {str(students[0]): essay, str(students[1]): essay}
+
+        counts, _, _, merge = run(program, [req(program["passport"])], lambda student_id: rules.get(student_id, []))
+
+        assert counts["changed"] == 4
+        assert merge.call_count == 2
+        with_essay = Application.objects.filter(student_id__in=students[:2]).values_list("requirement_set", flat=True)
+        without = Application.objects.filter(student_id__in=students[2:]).values_list("requirement_set", flat=True)
+        assert len(set(with_essay)) == 1 and len(set(without)) == 1 and set(with_essay) != set(without)
+
+    def test_dry_run_and_unavailable_student_rules_write_nothing(self, program):
+        failing = create_test_application(program_id=program["id"])
+        create_test_application(program_id=program["id"])
+
+        def student_rules(student_id):
+            if student_id == str(failing.student_id):
+                raise CatalogError("catalog down")
+            return []
+
+        counts, *_ = run(program, [req(program["passport"])], student_rules, dry_run=True)
+        assert counts == {"checked": 2, "changed": 1, "skipped": 1}
+        assert not Application.objects.filter(requirement_set__isnull=False).exists()
+        assert not ApplicationsEvent.objects.exists()
+
+        counts, *_ = run(program, [req(program["passport"])], student_rules)
+        assert counts["changed"] == 1
+        failing.refresh_from_db()
+        assert failing.requirement_set_id is None
+
+    def test_command_reports_counts_and_catalog_errors(self, program, capsys):
+        create_test_application(program_id=program["id"])
+        with patch.object(resnapshot, "get_program_required_documents", return_value=[req(program["passport"])]), \
+                patch.object(resnapshot, "resolve_student_required_documents", return_value=[]):
+            call_command("resnapshot_drafts", str(program["id"]), "--chunk-size", "10")
+        assert "checked 1 drafts, changed 1, skipped 0" in capsys.readouterr().out
+
+        with patch.object(resnapshot, "get_program_required_documents", side_effect=CatalogError("boom")):
+            with pytest.raises(CommandError, match="Could not fetch requirements"):
+                call_command("resnapshot_drafts", str(program["id"]))
@@ -0,0 +1,91 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from applications.models import Application, Status
+from core.utils.keyset import estimate_count
+
+
+def make(status_=Status.SUBMITTED, program_id=None, created_at=None, missing=0):
+    return Application.objects.create(
+        student_id=uuid.uuid4(), program_id=program_id or uuid.uuid4(), intake_id=uuid.uuid4(),
+        status=status_, created_at=created_at or timezone.now(), mandatory_docs_missing=missing,
+    )
+
+
+@pytest.mark.django_db
+class TestStaffQueue:
+    """Tests for the staff review queue"""
+
+    @pytest.fixture
+    def staff(self, staff_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        return staff_api_client
+
+    def test_default_statuses_oldest_first_with_paging(self, staff):
+        now = timezone.now()
+        queued = [make(status_=s, created_at=now - timedelta(hours=10 - i))
+                  for i, s in enumerate([Status.SUBMITTED, Status.UNDER_REVIEW, Status.SUBMITTED])]
+        make(status_=Status.DRAFT)
+        make(status_=Status.OFFER)
+
+        first = staff.get(reverse("applications-staff-queue"), {"limit": 2})
+        assert first.status_code == status.HTTP_200_OK
+        assert first.data["count"] == 3 and first.data["count_is_estimate"] is False
+        second = staff.get(reverse("applications-staff-queue"), {"limit": 2, "cursor": first.data["next_cursor"]})
+
+        ids = [r["id"] for r in first.data["results"] + second.data["results"]]
+        assert ids == [str(a.id) for a in queued]
+        assert second.data["next_cursor"] is None
+
+    def test_staff_user_without_student_profile(self, staff_user_client):
+        queued = make()
+
+        response = staff_user_client.get(reverse("applications-staff-queue"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [str(queued.id)]
+
+    def test_filters(self, staff):
+        program_id = uuid.uuid4()
+        now = timezone.now()
+        match = make(program_id=program_id, created_at=now - timedelta(days=1))
+        make(program_id=program_id, created_at=now - timedelta(days=1), missing=2)
+        make(program_id=program_id, created_at=now - timedelta(days=10))
+        make(created_at=now - timedelta(days=1))
+
+        response = staff.get(reverse("applications-staff-queue"), {
+            "program_id": str(program_id),
+            "created_after": (now - timedelta(days=2)).isoformat(),
+            "created_before": now.isoformat(),
+            "ready": "true",
+            "status": Status.SUBMITTED,
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [str(match.id)]
+        assert response.data["results"][0]["ready"] is True
+
+    def test_requires_staff(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        # The X-Role header is not trusted: only the authenticated user's staff flag counts.
+        authenticated_api_client.credentials(HTTP_X_ROLE="staff")
+        assert authenticated_api_client.get(reverse("applications-staff-queue")).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_invalid_filters(self, staff):
+        assert staff.get(reverse("applications-staff-queue"), {"program_id": "x"}).status_code == 400
+        assert staff.get(reverse("applications-staff-queue"), {"status": "Nope"}).status_code == 400
+
+    def test_count_is_capped_above_limit(self, staff, settings):
+        settings.APPLICATIONS_QUEUE_EXACT_COUNT_LIMIT = 2
+        for _ in range(4):
+            make()
+
+        response = staff.get(reverse("applications-staff-queue"))
+        assert response.data["count"] == 2
+        assert response.data["count_is_estimate"] is True
+        assert estimate_count(Application.objects.all(), exact_limit=10) == (4, False)
@@ -0,0 +1,126 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from applications.models import Application, ApplicationStatusStat, Status
+from applications.services import status_stats
+from applications.services.status_stats import (
+    apply_status_changes, compute_status_stats, record_created, status_key,
+)
+from applications.services.transitions import apply_bulk_transition, apply_transition
+
+
+def stats():
+    return {
+        status_key(s.program_id, s.intake_id, s.status): s.count
+        for s in ApplicationStatusStat.objects.exclude(count=0)
+    }
+
+
+def make(status_=Status.DRAFT, program_id=None, intake_id=None):
+    app = Application.objects.create(
+        student_id=uuid.uuid4(), program_id=program_id or uuid.uuid4(),
+        intake_id=intake_id or uuid.uuid4(), status=status_,
+    )
+    record_created(app)
+    return app
+
+
+@pytest.mark.django_db
+class TestStatusStats:
+    """Tests for the maintained per program/intake/status counts"""
+
+    def test_upsert_accumulates(self):
+        key = status_key(uuid.uuid4(), uuid.uuid4(), Status.DRAFT)
+        apply_status_changes({key: 2})
+        apply_status_changes({key: -1})
+        assert stats() == {key: 1}
+        assert ApplicationStatusStat.objects.count() == 1
+
+    def test_create_and_transitions_match_group_by(self):
+        program_id, intake_id = uuid.uuid4(), uuid.uuid4()
+        drafts = [make(program_id=program_id, intake_id=intake_id) for _ in range(3)]
+        reviewed = [make(Status.UNDER_REVIEW, program_id=program_id, intake_id=intake_id) for _ in range(2)]
+
+        apply_transition(drafts[0], "submit", uuid.uuid4())
+        apply_bulk_transition([a.id for a in reviewed], "offer", uuid.uuid4())
+
+        assert stats() == compute_status_stats()
+        assert stats() == {
+            status_key(program_id, intake_id, Status.DRAFT): 2,
+            status_key(program_id, intake_id, Status.SUBMITTED): 1,
+            status_key(program_id, intake_id, Status.OFFER): 2,
+        }
+
+    def test_rebuild_command_repairs_drift(self):
+        app = make()
+        Application.objects.create(student_id=uuid.uuid4(), program_id=app.program_id,
+                                   intake_id=app.intake_id, status=Status.SUBMITTED)
+        apply_status_changes({status_key(uuid.uuid4(), uuid.uuid4(), Status.OFFER): 5})
+
+        call_command("rebuild_status_stats")
+
+        assert stats() == compute_status_stats()
+        assert ApplicationStatusStat.objects.count() == 2
+
+    def test_rebuild_counts_after_taking_the_lock(self):
+        app = make()
+        lock_stats = status_stats._lock_stats
+
+        def transition_commits_first():
+            # A transition holding the stats rows finishes while the rebuild waits.
+            apply_transition(app, "submit", uuid.uuid4())
+            return lock_stats()
+
+        with patch.object(status_stats, "_lock_stats", transition_commits_first):
+            status_stats.rebuild_status_stats()
+
+        assert stats() == compute_status_stats() == {status_key(app.program_id, app.intake_id, Status.SUBMITTED): 1}
+
+
+@pytest.mark.django_db
+class TestStatusStatsEndpoint:
+    """Tests for the status statistics endpoint"""
+
+    @pytest.fixture
+    def staff(self, staff_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        return staff_api_client
+
+    def test_rows_and_totals(self, staff):
+        program_id = uuid.uuid4()
+        make(program_id=program_id)
+        make(Status.SUBMITTED, program_id=program_id)
+        make(Status.SUBMITTED)
+
+        response = staff.get(reverse("applications-status-stats"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["totals"] == {Status.DRAFT: 1, Status.SUBMITTED: 2}
+        assert len(response.data["results"]) == 3
+
+        filtered = staff.get(reverse("applications-status-stats"), {"program_id": str(program_id)})
+        assert filtered.data["totals"] == {Status.DRAFT: 1, Status.SUBMITTED: 1}
+        assert {r["program_id"] for r in filtered.data["results"]} == {str(program_id)}
+
+    def test_staff_user_without_student_profile(self, staff_user_client):
+        make(Status.SUBMITTED)
+
+        response = staff_user_client.get(reverse("applications-status-stats"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["totals"] == {Status.SUBMITTED: 1}
+
+    def test_requires_staff(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = str(uuid.uuid4())
+        # The X-Role header is not trusted: only the authenticated user's staff flag counts.
+        authenticated_api_client.credentials(HTTP_X_ROLE="staff")
+        response = authenticated_api_client.get(reverse("applications-status-stats"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_invalid_filter(self, staff):
+        response = staff.get(reverse("applications-status-stats"), {"program_id": "nope"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,86 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from applications.models import ApplicationsEvent
+from applications.tests.conftest import create_test_application
+
+STUDENT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def add_events(app, n, start=None):
+    start = start or timezone.now() - timedelta(hours=1)
+    return [
+        ApplicationsEvent.objects.create(
+            application=app, actor_id=STUDENT_ID, event_type="doc_attached",
+            note=f"event {i}", created_at=start + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.django_db
+class TestTimelinePagination:
+    """Tests for keyset pagination and conditional requests on the timeline"""
+
+    @pytest.fixture
+    def client(self, authenticated_api_client, mock_current_user_id):
+        mock_current_user_id.return_value = STUDENT_ID
+        authenticated_api_client.credentials(HTTP_X_ROLE="student")
+        return authenticated_api_client
+
+    @pytest.fixture
+    def app(self):
+        return create_test_application(student_id=STUDENT_ID)
+
+    def test_pages_follow_link_header(self, client, app):
+        add_events(app, 5)
+        url = reverse("applications-timeline", kwargs={"pk": str(app.id)})
+
+        notes, params = [], {"limit": 2}
+        while True:
+            response = client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            notes += [e["note"] for e in response.data]
+            if "Link" not in response:
+                break
+            params = {"limit": 2, "cursor": response["Link"].split("cursor=")[1].split(">")[0]}
+
+        assert notes == [f"event {i}" for i in range(5)]
+
+    def test_if_none_match_returns_304_until_new_event(self, client, app):
+        add_events(app, 2)
+        url = reverse("applications-timeline", kwargs={"pk": str(app.id)})
+
+        first = client.get(url)
+        etag = first["ETag"]
+        assert first["Cache-Control"] == "private, no-cache"
+
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached["ETag"] == etag
+
+        add_events(app, 1, start=timezone.now())
+        changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed["ETag"] != etag
+        assert len(changed.data) == 3
+
+    def test_etag_differs_per_page(self, client, app):
+        add_events(app, 3)
+        url = reverse("applications-timeline", kwargs={"pk": str(app.id)})
+        assert client.get(url, {"limit": 1})["ETag"] != client.get(url, {"limit": 2})["ETag"]
+
+    def test_invalid_cursor_and_limit(self, client, app):
+        url = reverse("applications-timeline", kwargs={"pk": str(app.id)})
+        assert client.get(url, {"cursor": "garbage"}).status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get(url, {"limit": "0"}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_other_students_application_is_forbidden(self, client):
+        other = create_test_application(student_id=uuid.uuid4())
+        response = client.get(reverse("applications-timeline", kwargs={"pk": str(other.id)}))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -291,3 +291,39 @@ class TestApplicationTransitions:
         assert response.data[2]['event_type'] == "status_changed"
         assert response.data[2]['from_status'] == Status.DRAFT
         assert response.data[2]['to_status'] == Status.SUBMITTED
+
+    def test_transition_conflict_when_status_changed_concurrently(self, authenticated_api_client, mock_current_user_id):
+        """A transition validated against a stale status is rejected with 409"""
+        from unittest.mock import patch
+        student_id = "00000000-0000-0000-0000-000000000001"
+        mock_current_user_id.return_value = student_id
+        app = create_test_application(student_id=student_id, status=Status.SUBMITTED)
+        stale = Application.objects.get(pk=app.pk)
+        # Another request withdraws the application after we read it
+        Application.objects.filter(pk=app.pk).update(status=Status.WITHDRAWN)
+
+        url = reverse('applications-transition', kwargs={'pk': str(app.id)})
+        authenticated_api_client.credentials(HTTP_X_ROLE='staff')
+        with patch('applications.views.get_object_or_404', return_value=stale):
+            response = authenticated_api_client.post(url, {"transition_type": "start_review"})
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        app.refresh_from_db()
+        assert app.status == Status.WITHDRAWN
+        assert not ApplicationsEvent.objects.filter(application=app, event_type="status_changed").exists()
+
+    def test_apply_transition_writes_only_status(self):
+        """The compare-and-swap update leaves other columns untouched"""
+        from applications.services.transitions import apply_transition
+        app = create_test_application(status=Status.SUBMITTED)
+        stale = Application.objects.get(pk=app.pk)
+        new_intake = uuid.uuid4()
+        Application.objects.filter(pk=app.pk).update(intake_id=new_intake)
+
+        event = apply_transition(stale, "start_review", uuid.uuid4())
+
+        app.refresh_from_db()
+        assert app.status == Status.UNDER_REVIEW
+        assert app.intake_id == new_intake
+        assert event.from_status == Status.SUBMITTED
+        assert event.to_status == Status.UNDER_REVIEW
@@ -3,6 +3,7 @@ import pytest
 from django.urls import reverse
 from rest_framework.test import APIClient
 from applications.models import Application, ApplicationRequiredDocument, Status
+from applications.services.requirements import required_documents_for_app
 from applications.integrations.catalog import CatalogError, CatalogNotFound
 from unittest.mock import patch
 import uuid
@@ -30,7 +31,7 @@ def test_application_create_success(authenticated_api_client, mock_current_user_
         assert response.status_code == 201
         app = Application.objects.get(id=response.data["id"])
         assert app.status == Status.DRAFT
-        assert ApplicationRequiredDocument.objects.filter(application=app).exists()
+        assert required_documents_for_app(app).exists()
 
 @pytest.mark.django_db
 def test_application_create_invalid_data(authenticated_api_client, mock_current_user_id):
@@ -180,3 +181,60 @@ def test_attach_document_doc_type_mismatch(authenticated_api_client, mock_curren
         )
         assert response.status_code == 422
         assert "mismatch" in response.data["error"]["message"]
+
+@pytest.mark.django_db
+def test_application_create_fetches_catalog_concurrently(authenticated_api_client, mock_current_user_id):
+    import threading
+    client = authenticated_api_client
+    mock_current_user_id.return_value = str(uuid.uuid4())
+    # Both lookups must be in flight at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def program_docs(program_id):
+        barrier.wait()
+        return [{"doc_type_id": str(uuid.uuid4()), "is_mandatory": True, "min_items": 1, "max_items": 1}]
+
+    def student_docs(student_id):
+        barrier.wait()
+        raise CatalogError("resolver down")
+
+    with patch("applications.views.get_program_required_documents", side_effect=program_docs), \
+         patch("applications.views.resolve_student_required_documents", side_effect=student_docs):
+        response = client.post(
+            reverse("applications-list"),
+            {"program_id": uuid.uuid4(), "intake_id": uuid.uuid4()},
+            format="json"
+        )
+    # A student-rules failure is only a warning
+    assert response.status_code == 201
+    app = Application.objects.get(id=response.data["id"])
+    assert required_documents_for_app(app).count() == 1
+
+@pytest.mark.django_db
+def test_attach_document_success(authenticated_api_client, mock_current_user_id):
+    from applications.models import ApplicationDocument, ApplicationsEvent
+    client = authenticated_api_client
+    student_id = uuid.uuid4()
+    mock_current_user_id.return_value = str(student_id)
+
+    app = Application.objects.create(student_id=student_id, program_id=uuid.uuid4(), intake_id=uuid.uuid4(), status=Status.DRAFT)
+    doc_type_id = uuid.uuid4()
+    student_document_id = uuid.uuid4()
+    ApplicationRequiredDocument.objects.create(application=app, doc_type_id=doc_type_id, is_mandatory=True, min_items=1, max_items=1, source="program")
+
+    with patch("applications.views.get_student_document") as mock_doc:
+        mock_doc.return_value = {
+            "id": str(student_document_id),
+            "user_id": str(student_id),
+            "doc_type_id": str(doc_type_id),
+            "status": "clean"
+        }
+        url = reverse("applications-attach-document", args=[app.id])
+        response = client.post(
+            url,
+            {"doc_type_id": doc_type_id, "student_document_id": student_document_id},
+            format="json"
+        )
+    assert response.status_code == 201
+    assert ApplicationDocument.objects.filter(application=app, student_document_id=student_document_id).exists()
+    assert ApplicationsEvent.objects.filter(application=app, event_type="doc_attached").count() == 1
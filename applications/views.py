@@ -1,18 +1,25 @@
 
+import hashlib
 import logging
-import json
 import time
 import uuid
 from datetime import datetime
 from typing import Optional
 from functools import wraps
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import viewsets, status, permissions
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
 from core.utils.uuid_helpers import parse_uuid, is_valid_uuid
+from core.utils.keyset import InvalidCursor, estimate_count, keyset_paginate
 from core.utils.view_decorators import validate_uuid_params
 from core.mixins.uuid_viewset import UUIDViewSetMixin
 from drf_spectacular.utils import extend_schema_view, extend_schema
@@ -20,48 +27,9 @@ from drf_spectacular.utils import extend_schema_view, extend_schema
 
 logger = logging.getLogger(__name__)
 from .models import (
-    Application, ApplicationsEvent, ApplicationRequiredDocument, ApplicationDocument, Status
+    Application, ApplicationsEvent, ApplicationStatusStat, Status
 )
 
-def log_action(action, user_id, app_id=None, outcome="success", extra=None, start_time=None):
-    """
-    Log an action in structured JSON format.
-    
-    Args:
-        action (str): The action being performed (create, attach, transition, etc.)
-        user_id (str): The ID of the user performing the action
-        app_id (str, optional): The ID of the application being acted upon
-        outcome (str): The outcome of the action (success, error, etc.)
-        extra (dict, optional): Additional information to include in the log
-        start_time (float, optional): The start time of the action in seconds
-    """
-    log_data = {
-        "action": action,
-        "user_id": str(user_id),
-        "outcome": outcome
-    }
-    
-    if app_id:
-        log_data["app_id"] = str(app_id)
-        
-    if extra:
-        # Filter out non-serializable objects from extra
-        filtered_extra = {}
-        for key, value in extra.items():
-            try:
-                json.dumps({key: value})  # Test if serializable
-                filtered_extra[key] = value
-            except (TypeError, OverflowError):
-                filtered_extra[key] = str(value)  # Convert to string if not serializable
-        
-        log_data.update(filtered_extra)
-        
-    if start_time:
-        log_data["elapsed_ms"] = int((time.time() - start_time) * 1000)
-    
-    logger.info(json.dumps(log_data))
-
-
 def error_response(message, code, data=None):
     """
     Generate a standardized error response
@@ -85,15 +53,86 @@ def error_response(message, code, data=None):
         response_data["error"]["data"] = data
         
     return Response(response_data, status=code)
-from .serializers import ApplicationCreateSerializer, ApplicationSerializer
-from .serializers_attach import AttachDocumentIn
+from .action_log import log_action
+from .idempotency import idempotent
+from .serializers import (
+    ApplicationCreateSerializer, ApplicationSerializer, BulkTransitionSerializer, StaffQueueQuerySerializer,
+    StatusStatsQuerySerializer,
+)
+from .serializers_attach import AttachDocumentIn, AttachDocumentBatchIn
 from .integrations.catalog import (
     get_program_required_documents,
     resolve_student_required_documents,
     CatalogNotFound, CatalogError,
 )
 from .integrations.documents import get_student_document, DocumentsError, StudentDocumentNotFound
+from .integrations.backends import submit as submit_upstream
 from .services.snapshot import merge_required_docs
+from .services.attachments import AttachmentConflict, attach_documents, insert_link, load_slot_states
+from .services.completeness import snapshot_counters
+from .services.event_stream import EventStreamRenderer, latest_cursor, pending_messages, stream_events
+from .services.requirements import get_or_create_requirement_set, get_required_document
+from .services.status_stats import record_created
+from .services.readiness import get_missing_documents, get_submission_readiness
+from .services.transitions import (
+    TRANSITION_RULES, TransitionConflict, apply_transition, apply_bulk_transition,
+)
+
+
+def fetch_required_documents(program_id: str, student_id: str):
+    """
+    Start the program and student Catalog lookups concurrently (inline when the
+    integration backend reads the ORM in-process).
+    
+    Returns:
+        tuple: (program_future, student_future). Each future re-raises the
+        lookup's own exception from result(), so callers keep handling
+        program and student failures separately.
+    """
+    return (
+        submit_upstream(get_program_required_documents, program_id),
+        submit_upstream(resolve_student_required_documents, student_id),
+    )
+
+LIST_PAGE_SIZE = 50
+LIST_MAX_PAGE_SIZE = 200
+
+
+def page_limit(request) -> int:
+    """
+    Page size from the ``limit`` query param, capped at LIST_MAX_PAGE_SIZE.
+    
+    Raises:
+        ValueError: If limit is not a positive integer
+    """
+    try:
+        limit = min(int(request.query_params.get("limit", LIST_PAGE_SIZE)), LIST_MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return limit
+
+def next_page_url(request, cursor: str) -> str:
+    """Return the current URL with its ``cursor`` query param replaced."""
+    params = request.query_params.copy()
+    params["cursor"] = cursor
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+def timeline_etag(application_id, latest, cursor: Optional[str], limit: int) -> str:
+    """
+    Strong ETag for one timeline page.
+    
+    Args:
+        application_id: UUID of the application
+        latest: (id, created_at) of its newest event, or None if it has none
+        cursor, limit: The page requested
+    """
+    digest = hashlib.sha256(
+        f"{application_id}|{latest[0] if latest else ''}|{latest[1].isoformat() if latest else ''}|"
+        f"{cursor or ''}|{limit}".encode()
+    ).hexdigest()
+    return quote_etag(digest[:32])
 
 def current_user_id(request) -> Optional[str]:
     """
@@ -141,39 +180,16 @@ def get_user_role(request) -> Optional[str]:
     return request.headers.get('X-Role')
 
 
-# Define transition rules
-TRANSITION_RULES = {
-    'submit': {
-        'allowed_from_statuses': [Status.DRAFT],
-        'to_status': Status.SUBMITTED,
-        'allowed_roles': ['student'],
-    },
-    'start_review': {
-        'allowed_from_statuses': [Status.SUBMITTED],
-        'to_status': Status.UNDER_REVIEW,
-        'allowed_roles': ['staff'],
-    },
-    'offer': {
-        'allowed_from_statuses': [Status.UNDER_REVIEW],
-        'to_status': Status.OFFER,
-        'allowed_roles': ['staff'],
-    },
-    'reject': {
-        'allowed_from_statuses': [Status.UNDER_REVIEW, Status.OFFER],
-        'to_status': Status.REJECTED,
-        'allowed_roles': ['staff'],
-    },
-    'withdraw': {
-        'allowed_from_statuses': [Status.DRAFT, Status.SUBMITTED, Status.UNDER_REVIEW, Status.OFFER],                                                                                          
-        'to_status': Status.WITHDRAWN,
-        'allowed_roles': ['student'],
-    },
-    'accept_offer': {
-        'allowed_from_statuses': [Status.OFFER],
-        'to_status': Status.ACCEPTED,
-        'allowed_roles': ['student'],
-    },
-}
+def is_staff_user(request) -> bool:
+    """
+    Whether the authenticated user is staff (or a superuser).
+    
+    Staff-only endpoints use this rather than the client-supplied X-Role header.
+    """
+    user = request.user
+    return bool(user and user.is_authenticated and (user.is_staff or user.is_superuser))
+
+
 
 
 @extend_schema(
@@ -190,19 +206,64 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
         return Application.objects.filter(student_id=student_id)
 
     def list(self, request):
-        qs = self.get_queryset().order_by("-created_at")[:50]
-        return Response([{"id": str(a.id), "status": a.status} for a in qs])
+        """
+        List the caller's applications, newest first.
+        
+        Query params:
+            status: Filter by status (repeatable)
+            program_id, intake_id: Filter by catalog reference
+            limit: Page size (default 50, max 200)
+            cursor: Opaque cursor from the previous page's ``Link: rel="next"`` header
+        
+        The body stays a plain list; the next page is advertised in the Link header.
+        """
+        qs = self.get_queryset()
+        
+        statuses = request.query_params.getlist("status")
+        if statuses:
+            invalid = [s for s in statuses if s not in Status.values]
+            if invalid:
+                return error_response(f"Invalid status: {', '.join(invalid)}", status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(status__in=statuses)
+        
+        for field in ("program_id", "intake_id"):
+            value = request.query_params.get(field)
+            if value is not None:
+                if not is_valid_uuid(value):
+                    return error_response(f"Invalid {field}", status.HTTP_400_BAD_REQUEST)
+                qs = qs.filter(**{field: value})
+        
+        try:
+            limit = page_limit(request)
+        except ValueError as e:
+            return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            rows, next_cursor = keyset_paginate(
+                qs.values("id", "status", "created_at"),
+                cursor=request.query_params.get("cursor"),
+                page_size=limit,
+            )
+        except InvalidCursor:
+            return error_response("Invalid cursor", status.HTTP_400_BAD_REQUEST)
+        
+        response = Response([{"id": str(r["id"]), "status": r["status"]} for r in rows])
+        if next_cursor:
+            response["Link"] = f'<{next_page_url(request, next_cursor)}>; rel="next"'
+        return response
     
     def retrieve(self, request, pk=None):
         instance = get_object_or_404(self.get_queryset(), pk=pk)
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
-    @transaction.atomic
+    @idempotent
     def create(self, request):
         """
         Create a Draft application AND snapshot required documents from Catalog.
-        If any step fails (e.g., unknown program), we roll the DB back to clean state.
+        Catalog is consulted before anything is written; the inserts then run in one
+        short transaction, so a failure (e.g., unknown program) leaves no rows behind
+        and no DB connection is held while waiting on upstream calls.
         """
         start_time = time.time()
         student_id = current_user_id(request)
@@ -223,69 +284,63 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
         # Get validated UUIDs from the serializer
         program_id = str(ser.validated_data["program_id"])
         intake_id = str(ser.validated_data["intake_id"])
-        
-        # 1) Create Draft application row
-        app = Application.objects.create(
-            student_id=student_id,
-            program_id=program_id,
-            intake_id=intake_id,
-            status=Status.DRAFT,
-        )
 
-        # 2) Ask Catalog for policy
+        # 1) Ask Catalog for program and student policy in parallel
+        program_future, student_future = fetch_required_documents(program_id, student_id)
         try:
-            program_reqs = get_program_required_documents(program_id)
+            program_reqs = program_future.result()
         except CatalogNotFound:
-            transaction.set_rollback(True)
-            log_action("create", student_id, app_id=app.id, outcome="error", 
-                      extra={"error": "program_not_found"}, start_time=start_time)
+            student_future.cancel()
+            log_action("create", student_id, outcome="error", 
+                      extra={"error": "program_not_found", "program_id": program_id}, start_time=start_time)
             return Response({"detail": "Program not found in Catalog."}, status=status.HTTP_404_NOT_FOUND)
         except CatalogError as e:
-            transaction.set_rollback(True)
-            log_action("create", student_id, app_id=app.id, outcome="error", 
+            student_future.cancel()
+            log_action("create", student_id, outcome="error", 
                       extra={"error": "catalog_error", "message": str(e)}, start_time=start_time)
             return Response({"detail": f"Upstream Catalog error: {e}"}, status=status.HTTP_502_BAD_GATEWAY)
 
         try:
-            student_reqs = resolve_student_required_documents(student_id)
+            student_reqs = student_future.result()
         except CatalogError as e:
             student_reqs = []
-            log_action("create", student_id, app_id=app.id, outcome="warning", 
+            log_action("create", student_id, outcome="warning", 
                       extra={"warning": "student_docs_error", "message": str(e)})
 
         merged = merge_required_docs(program_reqs, student_reqs)
-        rows = [
-            ApplicationRequiredDocument(
+
+        # 2) Write the Draft application, its snapshot and the event in one short transaction
+        with transaction.atomic():
+            # Applications with the same merged requirements share one snapshot
+            requirement_set = get_or_create_requirement_set(merged)
+            app = Application.objects.create(
+                student_id=student_id,
+                program_id=program_id,
+                intake_id=intake_id,
+                status=Status.DRAFT,
+                requirement_set=requirement_set,
+                **snapshot_counters(merged),
+            )
+
+            ApplicationsEvent.objects.create(
                 application=app,
-                doc_type_id=item["doc_type_id"],
-                is_mandatory=item["is_mandatory"],
-                min_items=item["min_items"],
-                max_items=item["max_items"],
-                source=item["source"],
+                actor_id=student_id,
+                event_type="created",
+                from_status=None,  # No previous status as this is a new application
+                note=f"Snapshot {len(merged)} required document(s).",
             )
-            for item in merged
-        ]
-        if rows:
-            ApplicationRequiredDocument.objects.bulk_create(rows, ignore_conflicts=True)
-
-        ApplicationsEvent.objects.create(
-            application=app,
-            actor_id=student_id,
-            event_type="created",
-            from_status=None,  # No previous status as this is a new application
-            note=f"Snapshot {len(rows)} required document(s).",
-        )
+            record_created(app)
         
         log_action("create", student_id, app_id=app.id, outcome="success", 
-                 extra={"doc_count": len(rows)}, start_time=start_time)
+                 extra={"doc_count": len(merged)}, start_time=start_time)
 
         return Response(ApplicationSerializer(app).data, status=status.HTTP_201_CREATED)
 
 
 
     @action(detail=True, methods=["post"], url_path="submit")
-    @transaction.atomic
     @validate_uuid_params('pk')
+    @idempotent
     def submit_application(self, request, pk=None):
         """
         Submit an application, changing its status from Draft to Submitted.
@@ -307,8 +362,8 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
         return self.transition(request, pk=pk, transition_data=modified_data)
         
     @action(detail=True, methods=["post"], url_path="documents")
-    @transaction.atomic
     @validate_uuid_params('pk')
+    @idempotent
     def attach_document(self, request, pk=None):
         """
         Attach a student's uploaded document to this application under a specific doc_type_id.
@@ -318,6 +373,9 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
         - max_items not exceeded
         - student_document belongs to same student and is status="clean"
         - doc_type match between payload and student_document
+        
+        All reads and the Documents call happen before any write; the link and its
+        event are then inserted in a short transaction.
         """
         start_time = time.time()
         student_id = current_user_id(request)
@@ -344,8 +402,8 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
             raise
 
         try:
-            req = ApplicationRequiredDocument.objects.get(application=app, doc_type_id=doc_type_id)
-        except ApplicationRequiredDocument.DoesNotExist:
+            req = get_required_document(app, doc_type_id)
+        except ObjectDoesNotExist:
             log_action("attach_document", student_id, app_id=app.id, outcome="error", 
                       extra={"error": "doc_type_not_required", "doc_type_id": doc_type_id}, start_time=start_time)
             return error_response(
@@ -354,19 +412,15 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
                 {"doc_type_id": doc_type_id}
             )
 
-        attached_count = ApplicationDocument.objects.filter(application=app, doc_type_id=doc_type_id).count()
-        if attached_count >= req.max_items:
-            log_action("attach_document", student_id, app_id=app.id, outcome="error", 
-                      extra={"error": "max_items_reached", "max_items": req.max_items, "current_count": attached_count}, 
-                      start_time=start_time)
-            return error_response(
-                "max_items reached for this document type.", 
-                status.HTTP_422_UNPROCESSABLE_ENTITY,
-                {
-                    "max_items": req.max_items,
-                    "current_count": attached_count,
-                    "doc_type_id": doc_type_id
-                }
+        # Reject duplicates and full doc types before paying for the Documents call.
+        slots = load_slot_states(app, [doc_type_id])[doc_type_id]
+        if student_document_id in slots.document_ids:
+            return self._attach_conflict(AttachmentConflict("already_attached"), student_id, app,
+                                         doc_type_id, student_document_id, start_time)
+        if slots.next_slot(req.max_items) is None:
+            return self._attach_conflict(
+                AttachmentConflict("max_items_reached", max_items=req.max_items, current_count=slots.count),
+                student_id, app, doc_type_id, student_document_id, start_time,
             )
 
         try:
@@ -411,49 +465,120 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
             log_action("attach_document", student_id, app_id=app.id, outcome="error", 
                       extra={"error": "doc_type_mismatch", "payload_type": doc_type_id, "document_type": str(sd.get("doc_type_id"))}, 
                       start_time=start_time)
+            return error_response(
+                "doc_type_id mismatch between payload and student_document.",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                {"payload_type": doc_type_id, "document_type": str(sd.get("doc_type_id"))}
+            )
 
+        try:
+            link = insert_link(app, req, doc_type_id, student_document_id, slots, student_id)
+        except AttachmentConflict as conflict:
+            # Lost a race with a concurrent attach of the same document or the last slot.
+            return self._attach_conflict(conflict, student_id, app, doc_type_id, student_document_id, start_time)
+        except Exception as e:
+            log_action("attach_document", student_id, app_id=app.id, outcome="error", 
+                     extra={"error": "creation_error", "message": str(e)}, 
+                     start_time=start_time)
+            raise
+
+        log_action("attach_document", student_id, app_id=app.id, outcome="success", 
+                 extra={"doc_type_id": doc_type_id, "student_document_id": student_document_id}, 
+                 start_time=start_time)
+
+        return Response(
+            {
+                "id": str(link.id),
+                "application_id": str(app.id),
+                "doc_type_id": doc_type_id,
+                "student_document_id": student_document_id,
+            },
+            status=201,
+        )
+
+    def _attach_conflict(self, conflict, student_id, app, doc_type_id, student_document_id, start_time):
+        """Error response for an attach rejected by the existing attachments."""
+        log_action("attach_document", student_id, app_id=app.id, outcome="error", 
+                  extra={"error": conflict.error, **conflict.data}, start_time=start_time)
+        if conflict.error == "max_items_reached":
+            return error_response(
+                "max_items reached for this document type.", 
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                {**conflict.data, "doc_type_id": doc_type_id}
+            )
         return error_response(
-            "doc_type_id mismatch between payload and student_document.",
-            status.HTTP_422_UNPROCESSABLE_ENTITY,
-            {"payload_type": doc_type_id, "document_type": str(sd.get("doc_type_id"))}
+            "student_document is already attached to this application.",
+            status.HTTP_409_CONFLICT,
+            {"document_id": student_document_id}
         )
+        
+    @action(detail=True, methods=["post"], url_path="documents/batch")
+    @validate_uuid_params('pk')
+    @idempotent
+    def attach_documents_batch(self, request, pk=None):
+        """
+        Attach several student documents in one request.
+        
+        Body: {"documents": [{"doc_type_id": ..., "student_document_id": ...}, ...]}
+        
+        Every item is validated like a single attach; valid items are attached
+        together with one summary event and invalid ones are returned under
+        "rejected" with an error code. Returns 201 when at least one document was
+        attached and 422 when none were.
+        """
+        start_time = time.time()
+        student_id = current_user_id(request)
+        if not student_id:
+            log_action("attach_documents_batch", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+            
+        app = get_object_or_404(Application, pk=pk)
+        log_action("attach_documents_batch", student_id, app_id=app.id, outcome="start", start_time=start_time)
+
+        if str(app.student_id) != str(student_id):
+            log_action("attach_documents_batch", student_id, app_id=app.id, outcome="error", 
+                      extra={"error": "forbidden"}, start_time=start_time)
+            return error_response("Forbidden: not your application.", status.HTTP_403_FORBIDDEN)
+
+        ser = AttachDocumentBatchIn(data=request.data)
+        if not ser.is_valid():
+            log_action("attach_documents_batch", student_id, app_id=app.id, outcome="error", 
+                      extra={"error": "validation_error"}, start_time=start_time)
+            return error_response("Invalid batch attach request", status.HTTP_400_BAD_REQUEST, ser.errors)
 
         try:
-            link = ApplicationDocument.objects.create(
-                application=app,
-                doc_type_id=doc_type_id,
-                student_document_id=student_document_id,
+            attached, rejected = attach_documents(app, student_id, ser.validated_data["documents"])
+        except AttachmentConflict:
+            log_action("attach_documents_batch", student_id, app_id=app.id, outcome="error", 
+                      extra={"error": "concurrent_attach"}, start_time=start_time)
+            return error_response(
+                "Another attach changed this application's documents; retry the batch.",
+                status.HTTP_409_CONFLICT
             )
+        except DocumentsError as e:
+            log_action("attach_documents_batch", student_id, app_id=app.id, outcome="error", 
+                      extra={"error": "upstream_error", "message": str(e)}, start_time=start_time)
+            return error_response(f"Upstream Documents error: {e}", status.HTTP_502_BAD_GATEWAY)
 
-            ApplicationsEvent.objects.create(
-                application=app,
-                actor_id=student_id,
-                event_type="doc_attached",
-                note=f"Attached {student_document_id} to type {doc_type_id}.",
+        if not attached:
+            log_action("attach_documents_batch", student_id, app_id=app.id, outcome="error", 
+                      extra={"error": "nothing_attached", "rejected": len(rejected)}, start_time=start_time)
+            return error_response(
+                "No documents could be attached.",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                {"rejected": rejected}
             )
-            
-            log_action("attach_document", student_id, app_id=app.id, outcome="success", 
-                     extra={"doc_type_id": doc_type_id, "student_document_id": student_document_id}, 
-                     start_time=start_time)
 
-            return Response(
-                {
-                    "id": str(link.id),
-                    "application_id": str(app.id),
-                    "doc_type_id": doc_type_id,
-                    "student_document_id": student_document_id,
-                },
-                status=201,
-            )
-        except Exception as e:
-            log_action("attach_document", student_id, app_id=app.id, outcome="error", 
-                     extra={"error": "creation_error", "message": str(e)}, 
-                     start_time=start_time)
-            raise
+        log_action("attach_documents_batch", student_id, app_id=app.id, outcome="success", 
+                  extra={"attached": len(attached), "rejected": len(rejected)}, start_time=start_time)
+        return Response(
+            {"application_id": str(app.id), "attached": attached, "rejected": rejected},
+            status=status.HTTP_201_CREATED,
+        )
         
     @action(detail=True, methods=["post"], url_path="transition")
-    @transaction.atomic
     @validate_uuid_params('pk')
+    @idempotent
     def transition(self, request, pk=None, transition_data=None):
         """
         Transition an application from one status to another based on defined rules.
@@ -554,27 +679,8 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
             
         # For submit transition, we need to validate mandatory documents
         if transition_type == 'submit':
-            # Get all required documents for this application
-            required_docs = ApplicationRequiredDocument.objects.filter(
-                application=app, 
-                is_mandatory=True
-            )
-            
-            # Check for missing mandatory documents
-            missing_docs = []
-            for req_doc in required_docs:
-                doc_count = ApplicationDocument.objects.filter(
-                    application=app,
-                    doc_type_id=req_doc.doc_type_id
-                ).count()
-                
-                if doc_count < req_doc.min_items:
-                    missing_docs.append({
-                        "doc_type_id": str(req_doc.doc_type_id),
-                        "required": req_doc.min_items,
-                        "attached": doc_count
-                    })
-                    
+            # Check for missing mandatory documents in one aggregated query
+            missing_docs = get_missing_documents(app.id)
             if missing_docs:
                 log_action("transition", student_id, app_id=app.id, outcome="error", 
                          extra={"error": "missing_documents", "missing_count": len(missing_docs)}, 
@@ -585,22 +691,20 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
                     {"missing_documents": missing_docs}
                 )
                 
-        # All validations passed, perform the transition
+        # All validations passed, perform the transition as a compare-and-swap on status
         try:
             old_status = app.status
-            app.status = rule['to_status']
-            app.save()
-            
-            # Create event
-            note = data.get("note", f"Status changed from {old_status} to {rule['to_status']} via {transition_type}")
-            ApplicationsEvent.objects.create(
-                application=app,
-                actor_id=student_id,
-                event_type="status_changed",
-                from_status=old_status,
-                to_status=rule['to_status'],
-                note=note
-            )
+            try:
+                apply_transition(app, transition_type, student_id, note=data.get("note"))
+            except TransitionConflict:
+                log_action("transition", student_id, app_id=app.id, outcome="error", 
+                         extra={"error": "concurrent_transition", "expected_status": old_status}, 
+                         start_time=start_time)
+                return error_response(
+                    "Application status changed concurrently. Reload and retry.",
+                    status.HTTP_409_CONFLICT,
+                    {"expected_status": old_status}
+                )
             
             log_action("transition", student_id, app_id=app.id, outcome="success", 
                      extra={
@@ -617,11 +721,292 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
                      start_time=start_time)
             raise
         
+    @action(detail=False, methods=["get"], url_path="stream",
+            renderer_classes=[JSONRenderer, EventStreamRenderer])
+    def event_stream(self, request):
+        """
+        Server-Sent Events stream of the caller's application events.
+        
+        Pushes every new ApplicationsEvent on the caller's applications as an
+        ``application_event`` message whose data has the timeline fields plus
+        application_id. Reconnecting clients send ``Last-Event-ID`` (or
+        ``?last_event_id=``) to resume after the last message they received; without
+        it the stream starts with the next new event. The connection is closed after
+        APPLICATIONS_STREAM_MAX_SECONDS and EventSource reconnects by itself.
+        
+        Served as a long-lived stream under ASGI only. Under WSGI the response holds
+        the pending events and ends at once, and EventSource polls by reconnecting.
+        """
+        start_time = time.time()
+        student_id = current_user_id(request)
+        if not student_id:
+            log_action("event_stream", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+        
+        cursor = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        # A sync worker must not be pinned for minutes, so only ASGI holds the stream open.
+        streaming = isinstance(request._request, ASGIRequest)
+        try:
+            start = cursor or latest_cursor(student_id)
+            messages = stream_events(student_id, start) if streaming else pending_messages(student_id, start)
+        except InvalidCursor:
+            log_action("event_stream", student_id, outcome="error", 
+                     extra={"error": "invalid_last_event_id"}, start_time=start_time)
+            return error_response("Invalid Last-Event-ID", status.HTTP_400_BAD_REQUEST)
+        
+        log_action("event_stream", student_id, outcome="success", 
+                 extra={"resumed": bool(cursor), "streaming": streaming}, start_time=start_time)
+        response = StreamingHttpResponse(messages, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @action(detail=False, methods=["get"], url_path="queue")
+    def staff_queue(self, request):
+        """
+        Staff review queue, oldest first.
+        
+        Query params:
+        - status: repeatable; defaults to Submitted and UnderReview
+        - program_id, intake_id: catalog filters
+        - created_after, created_before: ISO-8601 bounds on created_at
+        - ready: true/false to keep only complete/incomplete applications
+        - limit (default 50, max 200) and cursor (from next_cursor)
+        
+        The total is exact up to APPLICATIONS_QUEUE_EXACT_COUNT_LIMIT and an estimate
+        above it ("count_is_estimate": true). Requires a staff user.
+        """
+        start_time = time.time()
+        # Staff accounts have no Student row, so the actor is the user itself.
+        if not request.user.is_authenticated:
+            log_action("staff_queue", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+        actor_id = str(request.user.pk)
+            
+        if not is_staff_user(request):
+            log_action("staff_queue", actor_id, outcome="error", 
+                     extra={"error": "not_staff"}, start_time=start_time)
+            return error_response("Forbidden: the review queue requires a staff account", status.HTTP_403_FORBIDDEN)
+            
+        ser = StaffQueueQuerySerializer(data=request.query_params)
+        if not ser.is_valid():
+            return error_response("Invalid queue filters", status.HTTP_400_BAD_REQUEST, ser.errors)
+        params = ser.validated_data
+        
+        qs = Application.objects.filter(
+            status__in=params.get("status") or [Status.SUBMITTED, Status.UNDER_REVIEW]
+        )
+        if "program_id" in params:
+            qs = qs.filter(program_id=params["program_id"])
+        if "intake_id" in params:
+            qs = qs.filter(intake_id=params["intake_id"])
+        if "created_after" in params:
+            qs = qs.filter(created_at__gte=params["created_after"])
+        if "created_before" in params:
+            qs = qs.filter(created_at__lt=params["created_before"])
+        if params["ready"] is not None:
+            qs = qs.filter(mandatory_docs_missing=0) if params["ready"] else qs.filter(mandatory_docs_missing__gt=0)
+        
+        try:
+            rows, next_cursor = keyset_paginate(
+                qs.values(
+                    "id", "student_id", "program_id", "intake_id", "status",
+                    "created_at", "mandatory_docs_missing",
+                ),
+                cursor=params.get("cursor"),
+                page_size=params["limit"],
+                descending=False,
+            )
+        except InvalidCursor:
+            return error_response("Invalid cursor", status.HTTP_400_BAD_REQUEST)
+        count, is_estimate = estimate_count(qs, settings.APPLICATIONS_QUEUE_EXACT_COUNT_LIMIT)
+        
+        log_action("staff_queue", actor_id, outcome="success", 
+                 extra={"returned": len(rows)}, start_time=start_time)
+        response = Response({
+            "count": count,
+            "count_is_estimate": is_estimate,
+            "next_cursor": next_cursor,
+            "results": [
+                {
+                    "id": str(r["id"]),
+                    "student_id": str(r["student_id"]),
+                    "program_id": str(r["program_id"]),
+                    "intake_id": str(r["intake_id"]),
+                    "status": r["status"],
+                    "created_at": r["created_at"],
+                    "ready": r["mandatory_docs_missing"] == 0,
+                }
+                for r in rows
+            ],
+        })
+        if next_cursor:
+            response["Link"] = f'<{next_page_url(request, next_cursor)}>; rel="next"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def status_stats(self, request):
+        """
+        Application counts per program, intake and status.
+        
+        Query params:
+        - program_id, intake_id: optional catalog filters
+        
+        Reads the maintained ApplicationStatusStat rollup, so the cost does not grow
+        with the number of applications. Returns the per-key rows and totals per
+        status. Requires a staff user.
+        """
+        start_time = time.time()
+        # Staff accounts have no Student row, so the actor is the user itself.
+        if not request.user.is_authenticated:
+            log_action("status_stats", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+        actor_id = str(request.user.pk)
+            
+        if not is_staff_user(request):
+            log_action("status_stats", actor_id, outcome="error", 
+                     extra={"error": "not_staff"}, start_time=start_time)
+            return error_response("Forbidden: status statistics require a staff account", status.HTTP_403_FORBIDDEN)
+            
+        ser = StatusStatsQuerySerializer(data=request.query_params)
+        if not ser.is_valid():
+            return error_response("Invalid statistics filters", status.HTTP_400_BAD_REQUEST, ser.errors)
+        params = ser.validated_data
+        
+        qs = ApplicationStatusStat.objects.exclude(count=0)
+        if "program_id" in params:
+            qs = qs.filter(program_id=params["program_id"])
+        if "intake_id" in params:
+            qs = qs.filter(intake_id=params["intake_id"])
+        rows = list(qs.order_by("program_id", "intake_id", "status").values(
+            "program_id", "intake_id", "status", "count"
+        ))
+        
+        totals = {}
+        for r in rows:
+            totals[r["status"]] = totals.get(r["status"], 0) + r["count"]
+        
+        log_action("status_stats", actor_id, outcome="success", 
+                 extra={"rows": len(rows)}, start_time=start_time)
+        return Response({
+            "results": [
+                {
+                    "program_id": str(r["program_id"]),
+                    "intake_id": str(r["intake_id"]),
+                    "status": r["status"],
+                    "count": r["count"],
+                }
+                for r in rows
+            ],
+            "totals": totals,
+        })
+
+    @action(detail=False, methods=["post"], url_path="bulk-transition")
+    def bulk_transition(self, request):
+        """
+        Apply one staff transition to many applications at once.
+        
+        Request body:
+        - application_ids: list of application UUIDs (up to APPLICATIONS_BULK_TRANSITION_MAX)
+        - transition_type: a staff transition (start_review, offer, reject)
+        - note: optional note recorded on every event
+        
+        Returns per-ID outcomes (transitioned, invalid_status, not_found) and a summary.
+        Requires a staff user, whose id is recorded as the events' actor_id.
+        """
+        start_time = time.time()
+        # Staff accounts have no Student row: the events record the user itself.
+        if not request.user.is_authenticated:
+            log_action("bulk_transition", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+        actor_id = str(request.user.pk)
+            
+        if not is_staff_user(request):
+            log_action("bulk_transition", actor_id, outcome="error", 
+                     extra={"error": "not_staff"}, start_time=start_time)
+            return error_response(
+                "Forbidden: bulk transitions require a staff account", 
+                status.HTTP_403_FORBIDDEN
+            )
+            
+        ser = BulkTransitionSerializer(data=request.data)
+        if not ser.is_valid():
+            log_action("bulk_transition", actor_id, outcome="error", 
+                     extra={"error": "validation_error"}, start_time=start_time)
+            return error_response("Invalid bulk transition request", status.HTTP_400_BAD_REQUEST, ser.errors)
+            
+        transition_type = ser.validated_data["transition_type"]
+        rule = TRANSITION_RULES.get(transition_type)
+        if rule is None or 'staff' not in rule['allowed_roles']:
+            log_action("bulk_transition", actor_id, outcome="error", 
+                     extra={"error": "invalid_transition_type", "provided": transition_type}, 
+                     start_time=start_time)
+            staff_types = [name for name, r in TRANSITION_RULES.items() if 'staff' in r['allowed_roles']]
+            return error_response(
+                f"Invalid transition_type. Must be one of: {', '.join(staff_types)}", 
+                status.HTTP_400_BAD_REQUEST
+            )
+            
+        results = apply_bulk_transition(
+            ser.validated_data["application_ids"],
+            transition_type,
+            actor_id,
+            note=ser.validated_data.get("note"),
+        )
+        summary = {"transitioned": 0, "invalid_status": 0, "not_found": 0}
+        for result in results:
+            summary[result["outcome"]] += 1
+            
+        log_action("bulk_transition", actor_id, outcome="success", 
+                 extra={"transition_type": transition_type, **summary}, start_time=start_time)
+        return Response({"transition_type": transition_type, "results": results, "summary": summary})
+        
+    @action(detail=True, methods=["get"], url_path="readiness")
+    @validate_uuid_params('pk')
+    def readiness(self, request, pk=None):
+        """
+        Report whether an application has every mandatory document attached.
+        
+        Returns:
+        - ready: true when nothing is missing
+        - missing_documents: list of {doc_type_id, required, attached}
+        
+        Read-only; uses the same check as the submit transition.
+        """
+        start_time = time.time()
+        student_id = current_user_id(request)
+        if not student_id:
+            log_action("readiness", "anonymous", outcome="error", extra={"error": "unauthorized"})
+            return error_response("Authentication required", status.HTTP_401_UNAUTHORIZED)
+            
+        app = get_object_or_404(Application, pk=pk)
+        
+        # Students can only view their own applications
+        role = get_user_role(request)
+        if role == 'student' and str(app.student_id) != str(student_id):
+            log_action("readiness", student_id, app_id=app.id, outcome="error", 
+                     extra={"error": "forbidden", "role": role}, start_time=start_time)
+            return error_response(
+                "Forbidden: not your application", 
+                status.HTTP_403_FORBIDDEN,
+                {"role": role}
+            )
+            
+        result = get_submission_readiness(app.id)
+        log_action("readiness", student_id, app_id=app.id, outcome="success", 
+                 extra={"missing_count": len(result["missing_documents"])}, start_time=start_time)
+        return Response({"application_id": str(app.id), "status": app.status, **result})
+        
     @action(detail=True, methods=["get"], url_path="timeline")
     @validate_uuid_params('pk')
     def timeline(self, request, pk=None):
         """
-        Get the timeline of events for an application.
+        Get the timeline of events for an application, oldest first.
+        
+        Query params:
+            limit: Page size (default 50, max 200)
+            cursor: Opaque cursor from the previous page's ``Link: rel="next"`` header
         
         Returns a list of events with:
         - event_type
@@ -630,6 +1015,10 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
         - note
         - created_at
         - actor_id
+        
+        Events are append-only, so the latest one identifies the timeline's state.
+        The response carries it as an ETag; a request whose If-None-Match still
+        matches gets 304 Not Modified without the page being read.
         """
         start_time = time.time()
         student_id = current_user_id(request)
@@ -653,25 +1042,53 @@ class ApplicationViewSet(UUIDViewSetMixin, viewsets.ViewSet):
             )
             
         try:
-            # Get all events for this application
-            events = ApplicationsEvent.objects.filter(application=app).order_by('created_at')
+            limit = page_limit(request)
+        except ValueError as e:
+            return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+        cursor = request.query_params.get("cursor")
+            
+        try:
+            events = ApplicationsEvent.objects.filter(application_id=app.id)
+            latest = events.order_by("-created_at", "-id").values_list("id", "created_at").first()
+            etag = timeline_etag(app.id, latest, cursor, limit)
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                log_action("timeline", student_id, app_id=app.id, outcome="not_modified", start_time=start_time)
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                response["ETag"] = etag
+                return response
             
-            # Format the response
-            result = []
-            for event in events:
-                result.append({
-                    "event_type": event.event_type,
-                    "from_status": event.from_status,
-                    "to_status": getattr(event, 'to_status', None),
-                    "note": event.note,
-                    "created_at": event.created_at.isoformat(),
-                    "actor_id": str(event.actor_id)
-                })
+            try:
+                rows, next_cursor = keyset_paginate(
+                    events.values("id", "event_type", "from_status", "to_status", "note", "created_at", "actor_id"),
+                    cursor=cursor,
+                    page_size=limit,
+                    descending=False,
+                )
+            except InvalidCursor:
+                return error_response("Invalid cursor", status.HTTP_400_BAD_REQUEST)
+            
+            result = [
+                {
+                    "event_type": r["event_type"],
+                    "from_status": r["from_status"],
+                    "to_status": r["to_status"],
+                    "note": r["note"],
+                    "created_at": r["created_at"].isoformat(),
+                    "actor_id": str(r["actor_id"]),
+                }
+                for r in rows
+            ]
             
             log_action("timeline", student_id, app_id=app.id, outcome="success", 
                      extra={"event_count": len(result)}, start_time=start_time)
-                     
-            return Response(result)
+            
+            response = Response(result)
+            response["ETag"] = etag
+            # Let clients and shared caches keep the body but revalidate every time.
+            response["Cache-Control"] = "private, no-cache"
+            if next_cursor:
+                response["Link"] = f'<{next_page_url(request, next_cursor)}>; rel="next"'
+            return response
         except Exception as e:
             log_action("timeline", student_id, app_id=app.id, outcome="error", 
                      extra={"error": "retrieval_error", "message": str(e)}, start_time=start_time)
@@ -37,3 +37,10 @@ def django_db_setup(django_db_blocker):
         # Explicitly run migrations for specific apps
         call_command('migrate', 'catalog', '--no-input')
         call_command('migrate', 'applications', '--no-input')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache, so request throttle history does not carry over."""
+    from django.core.cache import cache
+    cache.clear()
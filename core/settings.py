@@ -124,7 +124,10 @@ else:
     DATABASES = {
     "default": dj_database_url.parse(
         os.getenv("DB_URL"),
-        conn_max_age=600,  # optional: persistent connections
+        # Persistent connections belong to a thread. Served through core.asgi, sync
+        # views run on whichever thread is free, so they would leak: keep 0 there and
+        # only raise it for a WSGI deployment.
+        conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "0")),
         ssl_require=True
     )
     }
@@ -266,9 +269,68 @@ EMAIL_HOST_PASSWORD = os.getenv("DJANGO_EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DJANGO_DEFAULT_FROM_EMAIL", "")
 
 CATALOG_BASE_URL = os.getenv("CATALOG_BASE_URL", "http://127.0.0.1:8000/api/catalog")
-DOCUMENTS_BASE_URL = os.getenv("DOCUMENTS_BASE_URL", "http://127.0.0.1:8000/documents")
+DOCUMENTS_BASE_URL = os.getenv("DOCUMENTS_BASE_URL", "http://127.0.0.1:8000/api/applications/documents")
+# Shared secret the Documents client presents as "Authorization: Service <token>";
+# the batch lookup endpoint accepts it in place of a user's JWT. Empty disables it.
+DOCUMENTS_SERVICE_TOKEN = os.getenv("DOCUMENTS_SERVICE_TOKEN", "")
+# Student-document batch lookups: ids per request (server cap and client chunk size)
+# and how many chunks the client fetches concurrently.
+DOCUMENTS_BATCH_MAX = int(os.getenv("DOCUMENTS_BATCH_MAX", "100"))
+DOCUMENTS_BATCH_CONCURRENCY = int(os.getenv("DOCUMENTS_BATCH_CONCURRENCY", "4"))
+# How applications talks to Catalog/Documents: over HTTP (split deployments) or
+# straight from the ORM when they run in this process ("...backends.LocalBackend").
+APPLICATIONS_INTEGRATION_BACKEND = os.getenv(
+    "APPLICATIONS_INTEGRATION_BACKEND", "applications.integrations.backends.HttpBackend"
+)
+# Most applications a staff member may move in one bulk transition request.
+APPLICATIONS_BULK_TRANSITION_MAX = int(os.getenv("APPLICATIONS_BULK_TRANSITION_MAX", "500"))
+# Most documents a student may attach in one batch attach request.
+APPLICATIONS_BATCH_ATTACH_MAX = int(os.getenv("APPLICATIONS_BATCH_ATTACH_MAX", "20"))
+# Staff queue totals are exact up to this many rows and estimated above it.
+APPLICATIONS_QUEUE_EXACT_COUNT_LIMIT = int(os.getenv("APPLICATIONS_QUEUE_EXACT_COUNT_LIMIT", "1000"))
+# Application event stream (SSE): how long one connection stays open, how often
+# non-PostgreSQL databases are polled, and the keep-alive interval (seconds).
+APPLICATIONS_STREAM_MAX_SECONDS = int(os.getenv("APPLICATIONS_STREAM_MAX_SECONDS", "300"))
+APPLICATIONS_STREAM_POLL_INTERVAL = float(os.getenv("APPLICATIONS_STREAM_POLL_INTERVAL", "2"))
+APPLICATIONS_STREAM_HEARTBEAT = int(os.getenv("APPLICATIONS_STREAM_HEARTBEAT", "15"))
+# Longest an event is held back while older transactions are still running. An
+# event whose own transaction runs longer than this may be missed by open streams.
+APPLICATIONS_STREAM_MAX_HOLD_BACK = int(os.getenv("APPLICATIONS_STREAM_MAX_HOLD_BACK", "30"))
+# Transactional outbox (applications.outbox): topic -> dotted path of the handler.
+# Only topics listed here are written to the outbox.
+OUTBOX_HANDLERS = {
+    "documents.sync": "applications.services.document_sync.handle_document_sync",
+}
+# Messages claimed per worker batch, how long a claim lasts, and the retry policy
+# (exponential backoff from OUTBOX_BACKOFF_BASE seconds, capped at OUTBOX_BACKOFF_MAX).
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_BACKOFF_BASE = int(os.getenv("OUTBOX_BACKOFF_BASE", "5"))
+OUTBOX_BACKOFF_MAX = int(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+# Idempotency-Key handling (seconds): how long responses are replayed, how long an
+# in-flight request holds its key, and how long a concurrent retry waits for it.
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "60"))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "10"))
 # Defensive timeout for HTTP calls so our request doesn't hang forever.
 HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "6.0"))
+# Shared keep-alive pools for upstream clients (one pool per upstream per process).
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30.0"))
+# HTTP/2 is only negotiated when the optional `h2` package is installed.
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "True").lower() in ("true", "1", "yes")
+# Threads available for fanning out independent upstream calls (e.g. the two Catalog lookups on create).
+HTTP_UPSTREAM_MAX_WORKERS = int(os.getenv("HTTP_UPSTREAM_MAX_WORKERS", "8"))
+# Per-process cache of Catalog program required-documents (TTL in seconds; 0 disables).
+CATALOG_POLICY_CACHE_SIZE = int(os.getenv("CATALOG_POLICY_CACHE_SIZE", "1024"))
+CATALOG_POLICY_CACHE_TTL = float(os.getenv("CATALOG_POLICY_CACHE_TTL", "300"))
+CATALOG_POLICY_CACHE_STALE_TTL = float(os.getenv("CATALOG_POLICY_CACHE_STALE_TTL", "60"))
+# Action logs are encoded and written on a background thread (off by default under tests).
+APPLICATIONS_LOG_ASYNC = os.getenv("APPLICATIONS_LOG_ASYNC", str(not TESTING)).lower() in ("true", "1", "yes")
+# Fraction of outcome="start" action logs to keep (0.0-1.0); other outcomes are never sampled.
+APPLICATIONS_LOG_START_SAMPLE_RATE = float(os.getenv("APPLICATIONS_LOG_START_SAMPLE_RATE", "1.0"))
 
 
 CORS_ALLOW_ALL_ORIGINS=True
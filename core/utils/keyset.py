@@ -0,0 +1,125 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+def encode_cursor(created_at: datetime, pk) -> str:
+    """
+    Encode a (created_at, id) position as an opaque, URL-safe cursor.
+
+    Args:
+        created_at: Timestamp of the last row on the page
+        pk: UUID of the last row on the page
+
+    Returns:
+        str: Base64 cursor without padding
+    """
+    raw = json.dumps([created_at.isoformat(), str(pk)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _value(row: Any, field: str):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+    descending: bool = True,
+    time_field: str = "created_at",
+    pk_field: str = "id",
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (time_field, pk_field) using a keyset cursor.
+
+    Unlike OFFSET pagination, every page is a bounded range scan, so deep pages
+    cost the same as the first one. The queryset may be a values() projection as
+    long as it includes both key fields.
+
+    Args:
+        queryset: Filtered queryset to paginate
+        cursor: Cursor from the previous page, or None for the first page
+        page_size: Maximum rows to return
+        descending: Newest first when True, oldest first otherwise
+        time_field: Timestamp field of the key
+        pk_field: Unique tie-breaker field of the key
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        op = "lt" if descending else "gt"
+        queryset = queryset.filter(
+            Q(**{f"{time_field}__{op}": created_at})
+            | Q(**{time_field: created_at, f"{pk_field}__{op}": pk})
+        )
+
+    prefix = "-" if descending else ""
+    rows = list(queryset.order_by(f"{prefix}{time_field}", f"{prefix}{pk_field}")[:page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(_value(last, time_field), _value(last, pk_field))
+    return rows, next_cursor
+
+
+def estimate_count(queryset: QuerySet, exact_limit: int = 1000) -> Tuple[int, bool]:
+    """
+    Count rows cheaply enough to call on every page request of a large table.
+
+    Small results are counted exactly. On PostgreSQL a large result uses the
+    planner's row estimate (EXPLAIN, no scan). Other databases stop counting at
+    ``exact_limit + 1`` rows.
+
+    Returns:
+        Tuple of (count, is_estimate)
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate > exact_limit:
+            return estimate, True
+
+    count = queryset[:exact_limit + 1].count()
+    if count > exact_limit:
+        return exact_limit, True
+    return count, False
@@ -0,0 +1,46 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+
+class ServicePrincipal:
+    """
+    The caller behind a valid service token: another service of this platform
+    (e.g. the applications integration client), trusted like staff.
+    """
+    pk = id = None
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = True
+    is_superuser = False
+
+    def __str__(self):
+        return 'service'
+
+
+class ServiceTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates service-to-service calls carrying
+    "Authorization: Service <DOCUMENTS_SERVICE_TOKEN>".
+
+    Other schemes (e.g. Bearer JWTs) are left to the next authentication class.
+    """
+    keyword = b'service'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword:
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid service token header.')
+
+        expected = settings.DOCUMENTS_SERVICE_TOKEN
+        if not expected or not hmac.compare_digest(auth[1], expected.encode()):
+            raise AuthenticationFailed('Invalid service token.')
+        return ServicePrincipal(), None
+
+    def authenticate_header(self, request):
+        return 'Service'
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import DocumentType, UserDocument, ProgramDocument,ApplicationDocument
 
@@ -50,4 +51,12 @@ class ApplicationDocumentSerializer(BaseActiveSerializer):
         model = ApplicationDocument
         fields = ['id', 'user_document', 'user_email', 'program_document', 'document_type_name',
                  'uploaded_at', 'is_verified', 'is_active']
-        read_only_fields = ['id']
\ No newline at end of file
+        read_only_fields = ['id']
+
+
+class StudentDocumentBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.DOCUMENTS_BATCH_MAX,
+    )
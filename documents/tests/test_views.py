@@ -0,0 +1,70 @@
+import datetime
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from documents.models import DocumentType, UserDocument
+
+
+def make_document(user, doc_type):
+    return UserDocument.objects.create(
+        user=user, document_type=doc_type,
+        issued_date=datetime.date(2024, 1, 1), expires_date=datetime.date(2030, 1, 1),
+    )
+
+
+@pytest.mark.django_db
+class TestStudentDocumentBatch:
+    """Tests for the student-document batch lookup endpoint"""
+
+    @pytest.fixture
+    def data(self):
+        owner = User.objects.create_user(email="owner@example.com", password="pass1234")
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        doc_type = DocumentType.objects.create(name="Transcript", description="Academic transcript")
+        return owner, make_document(owner, doc_type), make_document(other, doc_type)
+
+    def test_results_in_request_order(self, data):
+        owner, own_doc, other_doc = data
+        missing = str(uuid.uuid4())
+        client = APIClient()
+        client.force_authenticate(owner)
+
+        response = client.post(reverse("student-documents-batch"),
+                               {"ids": [missing, str(own_doc.id), str(other_doc.id)]}, format="json")
+
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {"id": missing, "not_found": True},
+            {"id": str(own_doc.id), "user_id": str(owner.id),
+             "doc_type_id": str(own_doc.document_type_id), "status": "clean"},
+            {"id": str(other_doc.id), "not_found": True},
+        ]
+
+    def test_validation(self, data):
+        owner, _, _ = data
+        client = APIClient()
+        client.force_authenticate(owner)
+        url = reverse("student-documents-batch")
+
+        assert client.post(url, {"ids": ["nope"]}, format="json").status_code == 400
+        assert client.post(url, {"ids": []}, format="json").status_code == 400
+        assert APIClient().post(url, {"ids": [str(uuid.uuid4())]}, format="json").status_code in (401, 403)
+
+    def test_service_token(self, data, settings):
+        _, own_doc, other_doc = data
+        url = reverse("student-documents-batch")
+        ids = {"ids": [str(own_doc.id), str(other_doc.id)]}
+        settings.DOCUMENTS_SERVICE_TOKEN = "s3cret"
+
+        response = APIClient().post(url, ids, format="json", HTTP_AUTHORIZATION="Service s3cret")
+        assert response.status_code == 200
+        # A service sees every student's documents, like staff.
+        assert [item.get("not_found", False) for item in response.data["results"]] == [False, False]
+
+        assert APIClient().post(url, ids, format="json", HTTP_AUTHORIZATION="Service wrong").status_code == 401
+        settings.DOCUMENTS_SERVICE_TOKEN = ""
+        assert APIClient().post(url, ids, format="json", HTTP_AUTHORIZATION="Service s3cret").status_code == 401
